@@ -0,0 +1,290 @@
+"""
+Streaming Volume Anomaly Detector
+Per-symbol robust baselines (streaming median/MAD plus EWMA mean/variance)
+updated in O(1) per bar, after removing weekday/month seasonality. Each bar
+is scored against the baseline *before* it is learned, so a spike cannot
+hide itself. Used in batch over history and live by `run.py --watch`;
+detector state is persisted in data/processed/anomaly/<commodity>.json.
+"""
+
+import json
+import math
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .data_fetch import DATA_PROCESSED
+from .open_interest import change_over_days
+
+ANOMALY_DIR = DATA_PROCESSED / "anomaly"
+
+MAD_SCALE = 1.4826            # MAD -> standard deviation for normal data
+ANOMALY_Z = 3.0
+NOTABLE_Z = 2.0
+
+SEASON_SIZES = {"weekday": 7, "month": 12}
+RECENT_EVENTS = 20            # learned bars kept per series for reports
+
+
+class StreamingDetector:
+    """
+    Robust location/scale tracker for one series.
+
+    The median and MAD follow stochastic (frugal) quantile updates whose step
+    is proportional to the current MAD; the EWMA is fed winsorized values.
+    Seasonal offsets are slow EWMAs of the residual per weekday/month.
+    """
+
+    def __init__(
+        self,
+        log: bool = True,
+        seasons: tuple = ("weekday", "month"),
+        alpha: float = 0.05,
+        eta: float = 0.05,
+        season_alpha: float = 0.02,
+        warmup: int = 40,
+    ):
+        self.log = log
+        self.seasons = list(seasons)
+        self.alpha = alpha
+        self.eta = eta
+        self.season_alpha = season_alpha
+        self.warmup = warmup
+
+        self.count = 0
+        self.median = 0.0
+        self.mad = 0.0
+        self.ewm_mean = 0.0
+        self.ewm_var = 0.0
+        self.seasonal = {name: [0.0] * SEASON_SIZES[name] for name in self.seasons}
+        self.buffer: List[float] = []
+        self.last_date: Optional[str] = None
+
+    # ---------- internals ----------
+
+    def _transform(self, value: float) -> Optional[float]:
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        if self.log:
+            return math.log(value) if value > 0 else None
+        return float(value)
+
+    def _season_index(self, when: str) -> Dict[str, int]:
+        day = date.fromisoformat(str(when)[:10])
+        return {
+            name: day.weekday() if name == "weekday" else day.month - 1
+            for name in self.seasons
+        }
+
+    def _seasonal_offset(self, index: Dict[str, int]) -> float:
+        return sum(self.seasonal[name][i] for name, i in index.items())
+
+    def _initialize(self):
+        values = np.array(self.buffer)
+        self.median = float(np.median(values))
+        self.mad = float(np.median(np.abs(values - self.median))) or 1e-6
+        self.ewm_mean = float(values.mean())
+        self.ewm_var = float(values.var()) or 1e-12
+        self.buffer = []
+
+    def _scores(self, adjusted: float) -> Dict:
+        robust_z = (adjusted - self.median) / (MAD_SCALE * self.mad)
+        ewma_z = (adjusted - self.ewm_mean) / math.sqrt(self.ewm_var)
+        return {"robust_z": robust_z, "ewma_z": ewma_z}
+
+    # ---------- public ----------
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.warmup
+
+    def score(self, when: str, value: float) -> Optional[Dict]:
+        """Score an observation without learning it (e.g. an incomplete bar)"""
+        x = self._transform(value)
+        if x is None or not self.ready:
+            return None
+        adjusted = x - self._seasonal_offset(self._season_index(when))
+        return self._scores(adjusted)
+
+    def update(self, when: str, value: float) -> Optional[Dict]:
+        """Score an observation against the baseline, then learn it (O(1))"""
+        x = self._transform(value)
+        if x is None:
+            return None
+        index = self._season_index(when)
+        adjusted = x - self._seasonal_offset(index)
+        self.last_date = str(when)[:10]
+
+        if not self.ready:
+            self.buffer.append(adjusted)
+            self.count += 1
+            if self.ready:
+                self._initialize()
+            return None
+
+        scores = self._scores(adjusted)
+
+        # Median/MAD: sign steps scaled by current MAD (bounded influence)
+        deviation = adjusted - self.median
+        self.median += self.eta * self.mad * float(np.sign(deviation))
+        self.mad = max(self.mad + self.eta * self.mad * float(np.sign(abs(deviation) - self.mad)), 1e-6)
+
+        # EWMA of winsorized values
+        std = math.sqrt(self.ewm_var)
+        clipped = min(max(adjusted, self.ewm_mean - ANOMALY_Z * std), self.ewm_mean + ANOMALY_Z * std)
+        diff = clipped - self.ewm_mean
+        self.ewm_mean += self.alpha * diff
+        self.ewm_var = max((1 - self.alpha) * (self.ewm_var + self.alpha * diff ** 2), 1e-12)
+
+        # Seasonal offsets: each learns the residual left by the others
+        for name, i in index.items():
+            others = sum(self.seasonal[n][j] for n, j in index.items() if n != name)
+            residual = min(max(x - self.median - others, -3 * MAD_SCALE * self.mad), 3 * MAD_SCALE * self.mad)
+            self.seasonal[name][i] += self.season_alpha * (residual - self.seasonal[name][i])
+
+        self.count += 1
+        return scores
+
+    def to_dict(self) -> Dict:
+        return {
+            "log": self.log, "seasons": self.seasons, "alpha": self.alpha, "eta": self.eta,
+            "season_alpha": self.season_alpha, "warmup": self.warmup, "count": self.count,
+            "median": self.median, "mad": self.mad, "ewm_mean": self.ewm_mean,
+            "ewm_var": self.ewm_var, "seasonal": self.seasonal, "buffer": self.buffer,
+            "last_date": self.last_date,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "StreamingDetector":
+        detector = cls(
+            log=state["log"], seasons=tuple(state["seasons"]), alpha=state["alpha"],
+            eta=state["eta"], season_alpha=state["season_alpha"], warmup=state["warmup"],
+        )
+        for key in ("count", "median", "mad", "ewm_mean", "ewm_var", "seasonal", "buffer", "last_date"):
+            setattr(detector, key, state[key])
+        return detector
+
+
+def classify(robust_z: Optional[float]) -> str:
+    if robust_z is None:
+        return "n/a"
+    if abs(robust_z) >= ANOMALY_Z:
+        return "anomaly"
+    if abs(robust_z) >= NOTABLE_Z:
+        return "notable"
+    return "normal"
+
+
+def scan(dates: List[str], values: List[float], detector: StreamingDetector = None) -> Dict:
+    """
+    Batch pass over a history. Returns per-bar robust/EWMA z-scores (NaN
+    during warm-up) and the detector, ready to continue live.
+    """
+    detector = detector or StreamingDetector()
+    robust = np.full(len(values), np.nan)
+    ewma = np.full(len(values), np.nan)
+    for i, (when, value) in enumerate(zip(dates, values)):
+        scores = detector.update(when, value)
+        if scores:
+            robust[i], ewma[i] = scores["robust_z"], scores["ewma_z"]
+    return {"robust_z": robust, "ewma_z": ewma, "detector": detector}
+
+
+def volume_detector() -> StreamingDetector:
+    """Log volume, weekday and month seasonality"""
+    return StreamingDetector(log=True, seasons=("weekday", "month"))
+
+
+def oi_change_detector() -> StreamingDetector:
+    """Weekly OI % change (COT), month seasonality only"""
+    return StreamingDetector(log=False, seasons=("month",), warmup=26)
+
+
+def oi_change_series(cot_history: Dict) -> Dict[str, List]:
+    """5-day (weekly) aggregate OI % change from a COT history payload"""
+    records = [r for r in cot_history.get("records", []) if r.get("open_interest")]
+    if not records:
+        return {"dates": [], "values": []}
+    dates = np.array([r["date"] for r in records], dtype="datetime64[D]")
+    oi = np.array([r["open_interest"] for r in records], dtype=float)
+    changes = change_over_days(dates, oi)
+    return {"dates": [str(d) for d in dates], "values": [None if np.isnan(c) else float(c) for c in changes]}
+
+
+class AnomalyMonitor:
+    """
+    Persistent volume / OI-change detectors for one commodity.
+    Feeds only bars newer than the last one learned.
+    """
+
+    def __init__(self, commodity: str, state_dir: Path = None):
+        self.commodity = commodity
+        self.state_path = (state_dir or ANOMALY_DIR) / f"{commodity}.json"
+        self.detectors = {"volume": volume_detector(), "oi_change": oi_change_detector()}
+        # Scores of the latest learned bars, so later readers see the z each bar got when it arrived
+        self.recent: Dict[str, List[Dict]] = {name: [] for name in self.detectors}
+        if self.state_path.exists():
+            try:
+                with open(self.state_path, 'r') as f:
+                    saved = json.load(f)
+                self.recent.update(saved.pop("recent", {}))
+                self.detectors.update({k: StreamingDetector.from_dict(v) for k, v in saved.items()})
+            except (json.JSONDecodeError, KeyError, OSError) as e:
+                print(f"[Anomaly] Resetting unreadable state for {commodity}: {e}")
+
+    def _feed(self, name: str, dates: List[str], values: List[float], live_date: str = None) -> List[Dict]:
+        detector = self.detectors[name]
+        events = []
+        for when, value in zip(dates, values):
+            when = str(when)[:10]
+            if detector.last_date and when <= detector.last_date:
+                continue
+            # Today's bar is still forming: score it but do not learn it
+            scores = detector.score(when, value) if when == live_date else detector.update(when, value)
+            if scores:
+                events.append({
+                    "series": name,
+                    "date": when,
+                    "value": value,
+                    "robust_z": round(float(scores["robust_z"]), 2),
+                    "ewma_z": round(float(scores["ewma_z"]), 2),
+                    "status": classify(scores["robust_z"]),
+                    "live": when == live_date,
+                })
+        learned = [e for e in events if not e["live"]]
+        self.recent[name] = (self.recent.get(name, []) + learned)[-RECENT_EVENTS:]
+        return events
+
+    def needs_history(self, prices: List[Dict]) -> bool:
+        """True if the recent feed cannot continue the baseline (unseeded, or a gap before it)"""
+        last_date = self.detectors["volume"].last_date
+        if last_date is None:
+            return True
+        dates = [str(p.get("date"))[:10] for p in prices if p.get("date")]
+        return bool(dates) and dates[0] > last_date
+
+    def update(self, prices: List[Dict], cot_history: Dict = None, live: bool = False) -> List[Dict]:
+        """Process new bars; returns a scored event per bar processed"""
+        live_date = datetime.now().strftime("%Y-%m-%d") if live else None
+        events = self._feed(
+            "volume",
+            [p.get("date") for p in prices],
+            [p.get("volume") for p in prices],
+            live_date,
+        )
+        if cot_history:
+            series = oi_change_series(cot_history)
+            events += self._feed("oi_change", series["dates"], series["values"])
+        return events
+
+    def save(self):
+        # TM-STRUCT and --watch share this file: replace it atomically
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        state = {k: d.to_dict() for k, d in self.detectors.items()}
+        state["recent"] = self.recent
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        tmp_path.replace(self.state_path)
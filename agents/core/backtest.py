@@ -0,0 +1,343 @@
+"""
+Vectorized Backtest Engine
+Replays the TM-TECH and TM-POS scoring rules over full price/COT history as
+array operations and measures whether each rule has an edge:
+hit rate, forward-return distribution and turnover per rule.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .crowding import universe_crowding
+from .cta import POSITION_BANDS, POSITION_SCORE, replicate
+from .data_fetch import DATA_PROCESSED
+from .history import COT_RELEASE_LAG_DAYS, align_to_dates, load_universe
+from .indicators import (
+    forward_returns, rolling_max, rolling_mean, rolling_min, rolling_percentile, rsi,
+)
+from .params import POS_PARAMS, TECH_PARAMS
+
+DEFAULT_PARAMS = {**TECH_PARAMS, **POS_PARAMS}
+
+DEFAULT_HORIZONS = [5, 20, 60]
+QUANTILES = [5, 25, 50, 75, 95]
+TRADING_DAYS = 252
+
+
+# =========================================
+# Rule replays (score arrays, NaN = rule not computable)
+# =========================================
+
+def trend_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """TechnicalManager._analyze_trend: +/-1 vs trend MA, +/-0.5 for trend MA vs long MA"""
+    close = prices["close"]
+    ma_trend = _ma(close, params["ma_trend"], cache)
+    ma_long = _ma(close, params["ma_long"], cache)
+
+    score = np.where(close > ma_trend, 1.0, np.where(close < ma_trend, -1.0, 0.0))
+    score += np.where(np.isnan(ma_long), 0.0, np.where(ma_trend > ma_long, 0.5, -0.5))
+    score[np.isnan(ma_trend)] = np.nan
+    return score
+
+
+def momentum_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """TechnicalManager._analyze_momentum: RSI bands"""
+    values = rsi(prices["close"], params["rsi_period"])
+    score = np.select(
+        [values >= params["rsi_overbought"], values <= params["rsi_oversold"], values >= 50],
+        [-1.0, 1.0, 0.5],
+        default=-0.5,
+    )
+    score[np.isnan(values)] = np.nan
+    return score
+
+
+def key_level_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """TechnicalManager._identify_key_levels: fade 52w extremes"""
+    close = prices["close"]
+    window = params["level_window"]
+    high = rolling_max(close, window)
+    low = rolling_min(close, window)
+    pct_from_high = (close - high) / high * 100
+    pct_from_low = (close - low) / low * 100
+
+    proximity = params["level_proximity_pct"]
+    score = np.select(
+        [np.abs(pct_from_high) < proximity, np.abs(pct_from_low) < proximity],
+        [-0.5, 0.5],
+        default=0.0,
+    )
+    score[np.isnan(high)] = np.nan
+    return score
+
+
+def tech_composite_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """TechnicalManager.analyze: weighted trend/momentum/levels score"""
+    parts = [trend_score(prices, cot, params, cache), momentum_score(prices, cot, params, cache),
+             key_level_score(prices, cot, params, cache)]
+    score = sum(np.nan_to_num(p) * w for p, w in zip(parts, params["tech_weights"]))
+    score[np.isnan(parts[0])] = np.nan
+    return score
+
+
+def cta_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """PositioningManager._estimate_cta_positioning: replicated CTA position bands"""
+    position = replicate(prices["close"], params["cta_windows"])["position_pct"][0]
+    band = POSITION_BANDS["medium"]
+    score = np.select([position >= band, position <= -band], [POSITION_SCORE, -POSITION_SCORE], default=0.0)
+    score[np.isnan(position)] = np.nan
+    return score
+
+
+def cot_percentile_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """PositioningManager._analyze_spec_positioning: managed-money percentile bands"""
+    pct = _cot_percentile(prices, cot, params, cache)
+    very_short, short, long, very_long = params["cot_cutoffs"]
+    score = np.select(
+        [pct >= very_long, pct >= long, pct <= very_short, pct <= short],
+        [-0.8, -0.3, 0.8, 0.3],
+        default=0.0,
+    )
+    score[np.isnan(pct)] = np.nan
+    return score
+
+
+def cot_crowding_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """PositioningManager._analyze_crowding: extreme/elevated composite crowding fades"""
+    index = _crowding_index(prices, cot, params, cache)
+    extreme_low, elevated_low, elevated_high, extreme_high = params["crowding_cutoffs"]
+    score = np.select(
+        [index >= extreme_high, index <= extreme_low, index >= elevated_high, index <= elevated_low],
+        [-0.5, 0.5, -0.2, 0.2],
+        default=0.0,
+    )
+    score[np.isnan(index)] = np.nan
+    return score
+
+
+def cot_contrarian_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """PositioningManager._calculate_contrarian_signals: extreme percentile fades"""
+    pct = _cot_percentile(prices, cot, params, cache)
+    strong_low, low, high, strong_high = params["contrarian_cutoffs"]
+    score = np.select(
+        [pct >= strong_high, pct >= high, pct <= strong_low, pct <= low],
+        [-1.0, -0.5, 1.0, 0.5],
+        default=0.0,
+    )
+    score[np.isnan(pct)] = np.nan
+    return score
+
+
+def pos_composite_score(prices: Dict, cot: Optional[Dict], params: Dict, cache: Dict = None) -> np.ndarray:
+    """PositioningManager.analyze: weighted spec/CTA/crowding/contrarian score"""
+    parts = [cot_percentile_score(prices, cot, params, cache), cta_score(prices, cot, params, cache),
+             cot_crowding_score(prices, cot, params, cache), cot_contrarian_score(prices, cot, params, cache)]
+    score = sum(np.nan_to_num(p) * w for p, w in zip(parts, params["pos_weights"]))
+    score[np.isnan(parts[1])] = np.nan
+    return score
+
+
+RULES: Dict[str, Callable] = {
+    "tech_trend": trend_score,
+    "tech_momentum": momentum_score,
+    "tech_key_levels": key_level_score,
+    "tech_composite": tech_composite_score,
+    "pos_cta": cta_score,
+    "pos_cot_percentile": cot_percentile_score,
+    "pos_crowding": cot_crowding_score,
+    "pos_contrarian": cot_contrarian_score,
+    "pos_composite": pos_composite_score,
+}
+
+COT_RULES = {"pos_cot_percentile", "pos_crowding", "pos_contrarian"}
+
+
+def _ma(close: np.ndarray, window: int, cache: Optional[Dict]) -> np.ndarray:
+    """Moving average, memoized per window within one commodity's run"""
+    if cache is None:
+        return rolling_mean(close, window)
+    key = ("ma", window)
+    if key not in cache:
+        cache[key] = rolling_mean(close, window)
+    return cache[key]
+
+
+def _cot_percentile(prices: Dict, cot: Optional[Dict], params: Dict, cache: Optional[Dict]) -> np.ndarray:
+    """Weekly managed-money percentile, forward-filled onto price dates"""
+    if cot is None:
+        return np.full(len(prices["close"]), np.nan)
+    key = ("cot_pct", params["cot_window"])
+    if cache is not None and key in cache:
+        return cache[key]
+    weekly = rolling_percentile(cot["managed_money_net"], params["cot_window"])
+    daily = align_to_dates(cot["dates"], weekly, prices["dates"], COT_RELEASE_LAG_DAYS)
+    if cache is not None:
+        cache[key] = daily
+    return daily
+
+
+def _crowding_index(prices: Dict, cot: Optional[Dict], params: Dict, cache: Optional[Dict]) -> np.ndarray:
+    """Composite crowding index on price dates (COT components as of release)"""
+    if cot is None:
+        return np.full(len(prices["close"]), np.nan)
+    key = ("crowding", tuple(params["cta_windows"]), params["cot_window"])
+    if cache is not None and key in cache:
+        return cache[key]
+    index = universe_crowding(
+        {"series": {"prices": prices, "cot": cot}}, params["cta_windows"], params["cot_window"],
+    )["series"]["crowding_index"]
+    if cache is not None:
+        cache[key] = index
+    return index
+
+
+# =========================================
+# Evaluation
+# =========================================
+
+def evaluate_signal(score: np.ndarray, closes: np.ndarray, horizons: List[int]) -> Dict:
+    """
+    Evaluate one rule's score series against forward returns.
+    The position is the sign of the score; zero/NaN scores are flat.
+    """
+    position = np.sign(np.nan_to_num(score))
+    active = position != 0
+    valid = ~np.isnan(score)
+
+    changes = np.abs(np.diff(position[valid])) if valid.sum() > 1 else np.array([])
+    stats = {
+        "observations": int(valid.sum()),
+        "active_pct": round(float(active.sum() / valid.sum() * 100), 1) if valid.any() else 0.0,
+        "long_signals": int((position > 0).sum()),
+        "short_signals": int((position < 0).sum()),
+        "turnover_annual": round(float(changes.mean() * TRADING_DAYS), 2) if len(changes) else 0.0,
+        "horizons": {},
+    }
+
+    for h in horizons:
+        fwd = forward_returns(closes, h)
+        mask = active & ~np.isnan(fwd)
+        directional = position[mask] * fwd[mask]
+        stats["horizons"][str(h)] = _distribution(directional, fwd[valid & ~np.isnan(fwd)])
+
+    return stats
+
+
+def _distribution(directional: np.ndarray, baseline: np.ndarray) -> Dict:
+    """Hit rate and forward-return distribution for one horizon"""
+    if len(directional) == 0:
+        return {"count": 0, "hits": 0, "hit_rate": None}
+
+    quantiles = np.percentile(directional, QUANTILES) * 100
+    return {
+        "count": int(len(directional)),
+        "hits": int((directional > 0).sum()),
+        "hit_rate": round(float((directional > 0).mean()), 4),
+        "base_up_rate": round(float((baseline > 0).mean()), 4) if len(baseline) else None,
+        "mean_return_pct": round(float(directional.mean() * 100), 4),
+        "std_return_pct": round(float(directional.std() * 100), 4),
+        "quantiles_pct": {f"p{q}": round(float(v), 4) for q, v in zip(QUANTILES, quantiles)},
+    }
+
+
+def backtest_commodity(
+    data: Dict,
+    params: Dict = None,
+    horizons: List[int] = None,
+    rules: List[str] = None,
+) -> Dict:
+    """Run every rule over one commodity's history"""
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    horizons = horizons or DEFAULT_HORIZONS
+    rules = rules or list(RULES)
+
+    prices, cot = data["prices"], data.get("cot")
+    cache = {}
+
+    results = {}
+    for name in rules:
+        if name in COT_RULES and cot is None:
+            continue
+        score = RULES[name](prices, cot, params, cache)
+        results[name] = evaluate_signal(score, prices["close"], horizons)
+    return results
+
+
+def run_backtest(
+    universe: Dict[str, Dict],
+    params: Dict = None,
+    horizons: List[int] = None,
+    rules: List[str] = None,
+) -> Dict:
+    """
+    Backtest all rules across a universe loaded by history.load_universe().
+
+    Returns:
+        {"by_commodity": {commodity: {rule: stats}},
+         "universe": {rule: {horizon: pooled stats}}}
+    """
+    horizons = horizons or DEFAULT_HORIZONS
+    by_commodity = {
+        commodity: backtest_commodity(data, params, horizons, rules)
+        for commodity, data in universe.items()
+    }
+
+    pooled = {}
+    for commodity_results in by_commodity.values():
+        for rule, stats in commodity_results.items():
+            for h, dist in stats["horizons"].items():
+                agg = pooled.setdefault(rule, {}).setdefault(h, {"count": 0, "hits": 0, "sum_return": 0.0})
+                agg["count"] += dist["count"]
+                agg["hits"] += dist["hits"]
+                agg["sum_return"] += (dist.get("mean_return_pct") or 0.0) * dist["count"]
+
+    for rule_stats in pooled.values():
+        for agg in rule_stats.values():
+            count = agg["count"]
+            agg["hit_rate"] = round(agg["hits"] / count, 4) if count else None
+            agg["mean_return_pct"] = round(agg.pop("sum_return") / count, 4) if count else None
+
+    return {
+        "run_at": datetime.now().isoformat(),
+        "horizons": horizons,
+        "params": {**DEFAULT_PARAMS, **(params or {})},
+        "by_commodity": by_commodity,
+        "universe": pooled,
+    }
+
+
+def save_backtest(results: Dict, output_dir: Path = None) -> Path:
+    """Save backtest results to data/processed/backtest/"""
+    output_dir = output_dir or DATA_PROCESSED / "backtest"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"backtest_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def format_backtest_table(results: Dict, horizon: int = None) -> List[str]:
+    """Render the pooled per-rule results as text lines"""
+    horizon = str(horizon or results["horizons"][1 if len(results["horizons"]) > 1 else 0])
+    lines = [
+        f"  Horizon: {horizon} days | Commodities: {len(results['by_commodity'])}",
+        f"  {'Rule':<22}{'Signals':>10}{'Hit rate':>10}{'Mean ret %':>12}",
+    ]
+    for rule, stats in results["universe"].items():
+        agg = stats.get(horizon, {})
+        hit = f"{agg['hit_rate']:.1%}" if agg.get("hit_rate") is not None else "N/A"
+        ret = f"{agg['mean_return_pct']:+.3f}" if agg.get("mean_return_pct") is not None else "N/A"
+        lines.append(f"  {rule:<22}{agg.get('count', 0):>10}{hit:>10}{ret:>12}")
+    return lines
+
+
+if __name__ == "__main__":
+    import sys
+    commodities = sys.argv[1:] or None
+    results = run_backtest(load_universe(commodities))
+    print("\n".join(format_backtest_table(results)))
+    print(f"Saved: {save_backtest(results)}")
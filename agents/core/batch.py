@@ -0,0 +1,119 @@
+"""
+Batch Debate Executor
+Runs many (module, commodity, analysis) debates together. Debates advance
+in lockstep rounds: each round, the supervisors of every active debate
+that shares a compiled checker (one per TM class) are evaluated in one
+rule-major pass, then each TM responds. Checker groups are sharded over a
+worker pool and the results come back in job order; a failing debate is
+isolated to its own job.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+
+from .debate import Challenge, CompiledChecker, DebateEngine, DebateResult
+
+MAX_WORKERS = 6
+MIN_SHARD = 8                 # debates per shard before a group is split across workers
+
+
+@dataclass
+class DebateJob:
+    """One debate to run: the TM's analysis with its supervisors and response handler"""
+    module: str
+    commodity: str
+    analysis: Dict
+    sup_a: Callable[[Dict], List[Challenge]]
+    sup_b: Callable[[Dict], List[Challenge]]
+    respond: Callable
+    output_dir: Path
+
+
+def _evaluate(checker: Callable, analyses: List[Dict], memos: List[Dict]) -> List[Union[List[Challenge], Exception]]:
+    """Challenges per analysis; if the batched pass fails, each analysis is retried alone"""
+    if isinstance(checker, CompiledChecker):
+        try:
+            return checker.evaluate_many(analyses, memos)
+        except Exception:
+            pass
+
+    results = []
+    for analysis, memo in zip(analyses, memos):
+        try:
+            results.append(checker.evaluate(analysis, memo) if isinstance(checker, CompiledChecker)
+                           else checker(analysis))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def run_group(jobs: List[DebateJob]) -> List[Union[DebateResult, Dict]]:
+    """
+    Debates sharing SUP-A/SUP-B checkers, run in lockstep rounds. A debate
+    that raises is dropped from the group and returned as {"error": ...}.
+    """
+    engines, errors = [], {}
+    for i, job in enumerate(jobs):
+        engine = DebateEngine(job.module, job.output_dir)
+        try:
+            engine.begin(job.analysis)
+        except Exception as e:
+            errors[i] = e
+        engines.append(engine)
+
+    sup_a, sup_b = jobs[0].sup_a, jobs[0].sup_b
+    active = [i for i in range(len(jobs)) if i not in errors]
+    while active:
+        analyses = [engines[i].current_analysis for i in active]
+        memos = [engines[i].rule_memo for i in active]
+        logic = _evaluate(sup_a, analyses, memos)
+        data = _evaluate(sup_b, analyses, memos)
+        for i, logic_challenges, data_challenges in zip(active, logic, data):
+            failure = next((c for c in (logic_challenges, data_challenges) if isinstance(c, Exception)), None)
+            if failure is not None:
+                errors[i] = failure
+                continue
+            try:
+                engines[i].advance(logic_challenges + data_challenges, jobs[i].respond)
+            except Exception as e:
+                errors[i] = e
+        active = [i for i in active if i not in errors and not engines[i].done]
+
+    results = []
+    for i, (engine, job) in enumerate(zip(engines, jobs)):
+        if i not in errors:
+            try:
+                results.append(engine.finish())
+                continue
+            except Exception as e:
+                errors[i] = e
+        print(f"[Batch] Debate {job.module}/{job.commodity} failed: {errors[i]}")
+        results.append({"error": str(errors[i])})
+    return results
+
+
+def run_debates(jobs: List[DebateJob], max_workers: int = MAX_WORKERS) -> List[Union[DebateResult, Dict]]:
+    """
+    DebateResults for many jobs (same order), or {"error": ...} for a debate
+    that failed. Jobs are grouped by their supervisor pair; large groups are
+    split so every worker has a shard.
+    """
+    groups: Dict[tuple, List[int]] = {}
+    for i, job in enumerate(jobs):
+        groups.setdefault((id(job.sup_a), id(job.sup_b)), []).append(i)
+
+    shard_size = max(MIN_SHARD, -(-len(jobs) // max_workers)) if jobs else 1
+    shards = [
+        members[start:start + shard_size]
+        for members in groups.values()
+        for start in range(0, len(members), shard_size)
+    ]
+
+    results: List[Union[DebateResult, Dict]] = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for shard, shard_results in zip(shards, executor.map(lambda s: run_group([jobs[i] for i in s]), shards)):
+            for i, result in zip(shard, shard_results):
+                results[i] = result
+    return results
@@ -0,0 +1,303 @@
+"""
+Trigger Cascade Detector
+Collects every technical level (moving averages, pivots, 52-week extremes,
+round numbers, COT-implied stop zones), sorts them and links neighbours
+whose gap is within an ATR multiple. A chain of linked levels next to the
+current price is a cascade path: breaking the first can run through the rest.
+Chains for the whole universe are found in one sorted sweep.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .history import align_to_dates
+from .indicators import nan_rolling_mean, rolling_max, rolling_mean, rolling_min, true_range
+
+DEFAULT_ATR_MULT = 1.0
+ATR_PERIOD = 14
+LEVEL_WINDOW = 252
+SWING_ORDER = 10          # bars either side for a swing high/low
+SWING_LOOKBACK = 126      # only recent swings matter
+MAX_SWINGS = 3            # most recent swing highs/lows kept per side
+ROUND_NUMBER_PCT = 5      # round-number spacing ~5% of price
+COT_LOOKBACK_WEEKS = 26
+
+
+# =========================================
+# Level collection
+# =========================================
+
+def _level(price: float, source: str, description: str) -> Dict:
+    return {"level": round(float(price), 4), "source": source, "description": description}
+
+
+def round_number_step(price: float) -> float:
+    """Smallest 1/2/5 x 10^k step at least ROUND_NUMBER_PCT of price"""
+    target = price * ROUND_NUMBER_PCT / 100
+    magnitude = 10 ** np.floor(np.log10(target))
+    for mult in (1, 2, 5, 10):
+        if mult * magnitude >= target:
+            return float(mult * magnitude)
+    return float(10 * magnitude)
+
+
+def moving_average_levels(close: np.ndarray, windows: List[int]) -> List[Dict]:
+    levels = []
+    for window in windows:
+        ma = rolling_mean(close, window)
+        if len(ma) and not np.isnan(ma[-1]):
+            levels.append(_level(ma[-1], "ma", f"{window}-day MA"))
+    return levels
+
+
+def pivot_levels(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> List[Dict]:
+    """Classic floor pivots from the last daily bar and the last 20 bars"""
+    levels = []
+    for label, bars in (("Daily", 1), ("Monthly", 20)):
+        if len(close) < bars:
+            continue
+        h, l, c = np.nanmax(high[-bars:]), np.nanmin(low[-bars:]), close[-1]
+        pivot = (h + l + c) / 3
+        levels += [
+            _level(pivot, "pivot", f"{label} pivot"),
+            _level(2 * pivot - l, "pivot", f"{label} R1"),
+            _level(2 * pivot - h, "pivot", f"{label} S1"),
+            _level(pivot + (h - l), "pivot", f"{label} R2"),
+            _level(pivot - (h - l), "pivot", f"{label} S2"),
+        ]
+    return levels
+
+
+def swing_levels(high: np.ndarray, low: np.ndarray, order: int = SWING_ORDER,
+                 lookback: int = SWING_LOOKBACK, keep: int = MAX_SWINGS) -> List[Dict]:
+    """Most recent swing highs/lows (bar is the extreme of the bars around it)"""
+    span = 2 * order + 1
+    high, low = high[-lookback:], low[-lookback:]
+    if len(high) < span:
+        return []
+
+    # Centered max/min = trailing max/min shifted back by `order` bars
+    centered_max = rolling_max(high, span)[span - 1:]
+    centered_min = rolling_min(low, span)[span - 1:]
+    middle_high = high[order:len(high) - order]
+    middle_low = low[order:len(low) - order]
+
+    levels = [_level(v, "swing", "Swing high") for v in middle_high[middle_high == centered_max][-keep:]]
+    levels += [_level(v, "swing", "Swing low") for v in middle_low[middle_low == centered_min][-keep:]]
+    return levels
+
+
+def extreme_levels(high: np.ndarray, low: np.ndarray, window: int = LEVEL_WINDOW) -> List[Dict]:
+    return [
+        _level(np.nanmax(high[-window:]), "extreme", "52-week high"),
+        _level(np.nanmin(low[-window:]), "extreme", "52-week low"),
+    ]
+
+
+def round_number_levels(price: float, count: int = 2) -> List[Dict]:
+    """Nearest `count` round numbers above and below the price"""
+    step = round_number_step(price)
+    base = np.floor(price / step) * step
+    levels = []
+    for k in range(-count + 1, count + 1):
+        value = base + k * step
+        if value > 0:
+            levels.append(_level(value, "round", f"Round number {value:g}"))
+    return levels
+
+
+def cot_stop_levels(
+    price_dates: np.ndarray,
+    close: np.ndarray,
+    cot: Dict[str, np.ndarray],
+    lookback_weeks: int = COT_LOOKBACK_WEEKS,
+) -> List[Dict]:
+    """
+    Average entry price of managed money's recent position build, where its
+    stops cluster: longs added below it get stopped on a break lower, shorts
+    added above it on a break higher.
+    """
+    if cot is None or len(cot["dates"]) < 2:
+        return []
+
+    cot_dates = cot["dates"][-(lookback_weeks + 1):]
+    net = cot["managed_money_net"][-(lookback_weeks + 1):]
+    # Price on each report date (as-of Tuesday, no release lag needed here)
+    entry = align_to_dates(price_dates, close, cot_dates)
+    change = np.diff(net)
+    entry = entry[1:]
+    valid = ~np.isnan(entry)
+
+    levels = []
+    for side, mask in (("long", change > 0), ("short", change < 0)):
+        weights = np.abs(change[mask & valid])
+        if weights.sum() == 0:
+            continue
+        average = float(np.dot(entry[mask & valid], weights) / weights.sum())
+        levels.append(_level(
+            average, "cot",
+            f"Managed-money {side} entry zone ({int(weights.sum()):,} contracts added)",
+        ))
+    return levels
+
+
+def _filled_ohlc(prices: Dict[str, np.ndarray]) -> tuple:
+    """(high, low, close) with missing highs/lows filled from the close"""
+    close, high, low = prices["close"], prices["high"], prices["low"]
+    return np.where(np.isnan(high), close, high), np.where(np.isnan(low), close, low), close
+
+
+def current_atr(prices: Dict[str, np.ndarray], period: int = ATR_PERIOD) -> Optional[float]:
+    """
+    Latest simple-average true range, or None. Uses the filled high/low and a
+    NaN-aware mean, so one bad bar only affects the windows that contain it.
+    """
+    high, low, close = _filled_ohlc(prices)
+    values = nan_rolling_mean(true_range(high, low, close), period)
+    if not len(values) or np.isnan(values[-1]):
+        return None
+    return float(values[-1])
+
+
+def collect_levels(
+    prices: Dict[str, np.ndarray],
+    cot: Optional[Dict[str, np.ndarray]] = None,
+    ma_windows: List[int] = None,
+) -> List[Dict]:
+    """Every level for one market from its price (and COT) arrays"""
+    high, low, close = _filled_ohlc(prices)
+
+    levels = moving_average_levels(close, ma_windows or [20, 60, 200])
+    levels += pivot_levels(high, low, close)
+    levels += swing_levels(high, low)
+    levels += extreme_levels(high, low)
+    levels += round_number_levels(close[-1])
+    levels += cot_stop_levels(prices["dates"], close, cot)
+    return levels
+
+
+# =========================================
+# Chain detection
+# =========================================
+
+def link_levels(symbol_ids: np.ndarray, values: np.ndarray, max_gap: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Sort levels of many markets at once and label chains.
+
+    Args:
+        symbol_ids: market index per level
+        values: level prices
+        max_gap: allowed gap per market (ATR x multiple), indexed by symbol id
+
+    Returns:
+        {"order", "symbol", "value", "chain"} for the levels in sorted order
+    """
+    order = np.lexsort((values, symbol_ids))
+    symbol, value = symbol_ids[order], values[order]
+    linked = (symbol[1:] == symbol[:-1]) & (np.diff(value) <= max_gap[symbol[1:]])
+    chain = np.concatenate([[0], np.cumsum(~linked)])
+    return {"order": order, "symbol": symbol, "value": value, "chain": chain}
+
+
+def _cascade_path(levels: List[Dict], positions: np.ndarray, value: np.ndarray,
+                  chain: np.ndarray, price: float, max_gap: float, direction: str) -> Dict:
+    """Chain of levels reachable from the price in one direction"""
+    if direction == "up":
+        ahead = np.where(value > price)[0]
+    else:
+        ahead = np.where(value < price)[0][::-1]
+    if not len(ahead) or abs(value[ahead[0]] - price) > max_gap:
+        return {"levels": [], "count": 0}
+
+    first = ahead[0]
+    path = [i for i in ahead if chain[i] == chain[first]]
+    nodes = [levels[positions[i]] for i in path]
+    end = value[path[-1]]
+    return {
+        "levels": nodes,
+        "count": len(nodes),
+        "from": round(float(value[first]), 4),
+        "to": round(float(end), 4),
+        "span_pct": round(float((end - price) / price * 100), 2),
+    }
+
+
+def detect_cascades(
+    markets: Dict[str, Dict],
+    atr_mult: float = DEFAULT_ATR_MULT,
+) -> Dict[str, Dict]:
+    """
+    Cascade paths up and down from the current price for many markets.
+
+    Args:
+        markets: {name: {"levels": [...], "price": float, "atr": float}}
+
+    Returns:
+        {name: {"atr", "max_gap", "up", "down", "chains"}}
+    """
+    names = [n for n in markets if markets[n]["levels"] and markets[n]["atr"]]
+    if not names:
+        return {}
+
+    counts = [len(markets[n]["levels"]) for n in names]
+    symbol_ids = np.repeat(np.arange(len(names)), counts)
+    values = np.array([lvl["level"] for n in names for lvl in markets[n]["levels"]], dtype=float)
+    max_gap = np.array([markets[n]["atr"] * atr_mult for n in names])
+
+    linked = link_levels(symbol_ids, values, max_gap)
+    bounds = np.searchsorted(linked["symbol"], np.arange(len(names) + 1))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    results = {}
+    for i, name in enumerate(names):
+        lo, hi = bounds[i], bounds[i + 1]
+        positions = linked["order"][lo:hi] - offsets[i]
+        value, chain = linked["value"][lo:hi], linked["chain"][lo:hi]
+        price, levels = markets[name]["price"], markets[name]["levels"]
+        _, sizes = np.unique(chain, return_counts=True)
+
+        results[name] = {
+            "atr": round(float(markets[name]["atr"]), 4),
+            "max_gap": round(float(max_gap[i]), 4),
+            "levels_total": int(hi - lo),
+            "chains": int((sizes > 1).sum()),
+            "up": _cascade_path(levels, positions, value, chain, price, max_gap[i], "up"),
+            "down": _cascade_path(levels, positions, value, chain, price, max_gap[i], "down"),
+        }
+    return results
+
+
+def market_cascades(
+    prices: Dict[str, np.ndarray],
+    cot: Optional[Dict[str, np.ndarray]] = None,
+    ma_windows: List[int] = None,
+    atr_mult: float = DEFAULT_ATR_MULT,
+) -> Dict:
+    """Cascade paths for one market"""
+    market_atr = current_atr(prices)
+    if market_atr is None:
+        return {"error": "Insufficient data for ATR"}
+
+    market = {
+        "levels": collect_levels(prices, cot, ma_windows),
+        "price": float(prices["close"][-1]),
+        "atr": market_atr,
+    }
+    return detect_cascades({"market": market}, atr_mult).get("market", {"error": "No levels"})
+
+
+def universe_cascades(universe: Dict[str, Dict], atr_mult: float = DEFAULT_ATR_MULT) -> Dict[str, Dict]:
+    """Cascade paths for every market of a loaded universe in one sweep"""
+    markets = {}
+    for commodity, data in universe.items():
+        prices = data["prices"]
+        market_atr = current_atr(prices)
+        if market_atr is None:
+            continue
+        markets[commodity] = {
+            "levels": collect_levels(prices, data.get("cot")),
+            "price": float(prices["close"][-1]),
+            "atr": market_atr,
+        }
+    return detect_cascades(markets, atr_mult)
@@ -0,0 +1,234 @@
+"""
+Cross-Commodity Correlation Service
+Rolling return correlation/covariance matrices across every stored price
+series, computed with windowed cumulative sums (one pass for all pairs).
+Results are cached in data/processed/correlation/ and extended
+incrementally when new dates arrive. Also flags module signals that are
+really the same bet expressed in two correlated markets.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .data_fetch import DATA_PROCESSED
+
+CORRELATION_DIR = DATA_PROCESSED / "correlation"
+
+DEFAULT_WINDOW = 60
+MIN_OVERLAP = 0.8  # fraction of the window both series must have data for
+DUPLICATE_CORRELATION = 0.7
+
+SIGNAL_MODULES = ["tm_fund", "tm_news", "tm_views", "tm_tech", "tm_struct", "tm_pos"]
+
+
+def build_return_matrix(universe: Dict[str, Dict]) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    Align daily log returns of every commodity on the union of dates.
+
+    Returns:
+        (dates, commodities, returns) with returns shaped (T, N), NaN where a
+        market has no bar (or no prior bar) on that date.
+    """
+    commodities = sorted(universe)
+    all_dates = np.unique(np.concatenate([universe[c]["prices"]["dates"] for c in commodities]))
+    returns = np.full((len(all_dates), len(commodities)), np.nan)
+
+    for j, commodity in enumerate(commodities):
+        prices = universe[commodity]["prices"]
+        log_close = np.log(prices["close"])
+        idx = np.searchsorted(all_dates, prices["dates"])
+        returns[idx[1:], j] = np.diff(log_close)
+
+    return all_dates, commodities, returns
+
+
+def rolling_corr_cov(returns: np.ndarray, window: int = DEFAULT_WINDOW) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairwise rolling covariance and correlation over a trailing window.
+    Each pair uses only dates where both series have data.
+
+    Returns:
+        (cov, corr), each shaped (T, N, N); NaN until the window has enough
+        overlapping observations.
+    """
+    mask = ~np.isnan(returns)
+    x = np.where(mask, returns, 0.0)
+    both = mask[:, :, None] & mask[:, None, :]
+
+    def windowed(values: np.ndarray) -> np.ndarray:
+        csum = np.cumsum(values, axis=0)
+        out = csum.copy()
+        out[window:] -= csum[:-window]
+        return out
+
+    n = windowed(both.astype(float))
+    sum_x = windowed(x[:, :, None] * both)            # sum of x_i where j also present
+    sum_y = np.swapaxes(sum_x, 1, 2)                   # sum of x_j where i also present
+    sum_xx = windowed((x ** 2)[:, :, None] * both)
+    sum_yy = np.swapaxes(sum_xx, 1, 2)
+    sum_xy = windowed(x[:, :, None] * x[:, None, :])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (sum_xy - sum_x * sum_y / n) / (n - 1)
+        var_x = (sum_xx - sum_x ** 2 / n) / (n - 1)
+        var_y = (sum_yy - sum_y ** 2 / n) / (n - 1)
+        corr = cov / np.sqrt(var_x * var_y)
+
+    insufficient = n < max(int(window * MIN_OVERLAP), 3)
+    insufficient[:window - 1] = True
+    cov[insufficient] = np.nan
+    corr[insufficient] = np.nan
+    return cov, np.clip(corr, -1, 1)
+
+
+class CorrelationService:
+    """
+    Cached rolling correlation/covariance matrices for the commodity universe.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW, cache_dir: Path = None):
+        self.window = window
+        self.cache_dir = cache_dir or CORRELATION_DIR
+        self.cache_path = self.cache_dir / f"rolling_{window}d.npz"
+
+    def _load(self) -> Optional[Dict]:
+        if not self.cache_path.exists():
+            return None
+        with np.load(self.cache_path) as data:
+            return {key: data[key] for key in data.files}
+
+    def _save(self, dates: np.ndarray, commodities: List[str], returns: np.ndarray,
+              cov: np.ndarray, corr: np.ndarray):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            self.cache_path,
+            dates=dates, commodities=np.array(commodities), returns=returns,
+            cov=cov.astype(np.float32), corr=corr.astype(np.float32),
+        )
+
+    def update(self, universe: Dict[str, Dict]) -> Dict:
+        """
+        Bring the cache up to date with the universe's price history.
+        Only dates after the cached tail are computed, unless the set of
+        commodities changed or history was revised (then full rebuild).
+        """
+        dates, commodities, returns = build_return_matrix(universe)
+        cached = self._load()
+
+        start = 0
+        if cached is not None and list(cached["commodities"]) == commodities:
+            cached_dates = cached["dates"]
+            overlap = np.searchsorted(dates, cached_dates[-1], side="right")
+            same_history = (
+                overlap == len(cached_dates)
+                and np.array_equal(dates[:overlap], cached_dates)
+                and np.allclose(returns[:overlap][-self.window:], cached["returns"][-self.window:], equal_nan=True)
+            )
+            if same_history:
+                start = overlap
+
+        if start == len(dates):
+            return {"status": "up_to_date", "dates": len(dates), "new_dates": 0}
+
+        if start == 0:
+            cov, corr = rolling_corr_cov(returns, self.window)
+        else:
+            # Recompute only the tail, seeded with one window of history
+            seed = max(start - self.window + 1, 0)
+            tail_cov, tail_corr = rolling_corr_cov(returns[seed:], self.window)
+            offset = start - seed
+            if offset < self.window - 1:
+                # Seed shorter than a window (very short history): rebuild
+                cov, corr = rolling_corr_cov(returns, self.window)
+            else:
+                cov = np.concatenate([cached["cov"], tail_cov[offset:]])
+                corr = np.concatenate([cached["corr"], tail_corr[offset:]])
+
+        self._save(dates, commodities, returns, cov, corr)
+        return {
+            "status": "rebuilt" if start == 0 else "extended",
+            "dates": len(dates),
+            "new_dates": int(len(dates) - start),
+        }
+
+    def latest(self) -> Optional[Dict]:
+        """Most recent complete correlation/covariance matrices from the cache"""
+        cached = self._load()
+        if cached is None:
+            return None
+
+        corr = cached["corr"]
+        valid_rows = np.where(~np.all(np.isnan(corr), axis=(1, 2)))[0]
+        if not len(valid_rows):
+            return None
+        t = valid_rows[-1]
+        return {
+            "as_of": str(cached["dates"][t]),
+            "window": self.window,
+            "commodities": [str(c) for c in cached["commodities"]],
+            "corr": corr[t],
+            "cov": cached["cov"][t],
+        }
+
+    def history(self, a: str, b: str) -> Optional[Dict]:
+        """Rolling correlation time series for one pair"""
+        cached = self._load()
+        if cached is None:
+            return None
+        commodities = [str(c) for c in cached["commodities"]]
+        if a not in commodities or b not in commodities:
+            return None
+        i, j = commodities.index(a), commodities.index(b)
+        return {"dates": cached["dates"], "corr": cached["corr"][:, i, j]}
+
+
+def find_duplicate_signals(
+    latest: Dict,
+    modules_dir: Path,
+    threshold: float = DUPLICATE_CORRELATION,
+) -> List[Dict]:
+    """
+    Pairs of highly correlated markets whose module outputs point the same
+    way: the same bet counted twice across the book.
+    """
+    commodities = latest["commodities"]
+    corr = latest["corr"]
+
+    scores = {}
+    for commodity in commodities:
+        scores[commodity] = {}
+        for module in SIGNAL_MODULES:
+            path = modules_dir / commodity / f"{module.replace('tm_', '')}_output.json"
+            if path.exists():
+                try:
+                    with open(path, 'r') as f:
+                        scores[commodity][module] = json.load(f).get("score")
+                except (json.JSONDecodeError, OSError):
+                    pass
+
+    duplicates = []
+    for i, a in enumerate(commodities):
+        for j in range(i + 1, len(commodities)):
+            b = commodities[j]
+            rho = corr[i, j]
+            if np.isnan(rho) or abs(rho) < threshold:
+                continue
+            # Same direction in positively correlated markets (or opposite
+            # direction in negatively correlated ones) is the same exposure
+            shared = [
+                module for module in SIGNAL_MODULES
+                if scores[a].get(module) and scores[b].get(module)
+                and np.sign(scores[a][module]) * np.sign(scores[b][module]) == np.sign(rho)
+            ]
+            if shared:
+                duplicates.append({
+                    "pair": [a, b],
+                    "correlation": round(float(rho), 2),
+                    "modules": shared,
+                })
+
+    duplicates.sort(key=lambda d: -abs(d["correlation"]))
+    return duplicates
@@ -0,0 +1,305 @@
+"""
+Composite Crowding Index
+One daily crowding series per commodity combining the aggregate OI
+percentile, the managed-money net percentile, the replicated CTA position
+and volume attention. On a 0-100 scale: 50 is neutral, 100 a maximally
+crowded long, 0 a maximally crowded short. Computed over full history as a
+batched (commodities x dates) pipeline and cached per COT release in
+data/processed/crowding/<commodity>.json, so past values can be queried.
+"""
+
+import json
+import warnings
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .cta import DEFAULT_LOOKBACKS, replicate, stack_closes
+from .data_fetch import DATA_PROCESSED, DataFetcher
+from .history import COT_RELEASE_LAG_DAYS, align_to_dates, cot_arrays, price_arrays
+from .indicators import nan_rolling_mean
+from .positioning import rolling_stats
+from .volatility import rolling_percentile_rank
+
+CROWDING_DIR = DATA_PROCESSED / "crowding"
+
+COT_WINDOW = 52               # weeks, OI and managed-money percentiles
+ATTENTION_WINDOW = 5          # days of volume averaged for attention
+ATTENTION_LOOKBACK = 252
+CONTEXT_LOOKBACK = 756        # ~3 years of daily index values for context
+
+# Who is on the trade (sets the side) vs how full the market is (amplifies it)
+DIRECTION_WEIGHTS = {"managed_money": 0.6, "cta": 0.4}
+
+# Same scale and bands as the TM-POS crowding cutoffs
+CROWDING_CUTOFFS = [15, 30, 70, 85]
+
+COMPONENTS = ["oi_percentile", "mm_percentile", "cta_position_pct", "attention_percentile"]
+
+
+# =========================================
+# Pipeline
+# =========================================
+
+def composite(
+    oi_pct: np.ndarray,
+    mm_pct: np.ndarray,
+    cta_pct: np.ndarray,
+    attention_pct: np.ndarray,
+) -> np.ndarray:
+    """
+    Crowding index (0-100) from component arrays of any matching shape.
+
+    Direction is the weighted mean of the managed-money tilt and the CTA
+    position (each in [-1, 1], NaN components dropped); participation (OI
+    and attention percentiles) scales it between half and full strength.
+    """
+    tilts = np.stack([(mm_pct - 50) / 50, np.clip(cta_pct / 100, -1, 1)])
+    weights = np.array([DIRECTION_WEIGHTS["managed_money"], DIRECTION_WEIGHTS["cta"]])
+    weights = weights.reshape((-1,) + (1,) * (tilts.ndim - 1))
+    present = ~np.isnan(tilts)
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # dates without any component
+        direction = (np.where(present, tilts, 0) * weights).sum(0) / (present * weights).sum(0)
+        participation = np.nanmean(np.stack([oi_pct, attention_pct]), axis=0) / 100
+
+    participation = np.where(np.isnan(participation), 0.5, participation)
+    return 50 + 50 * direction * (0.5 + 0.5 * participation)
+
+
+def classify(index: Optional[float], cutoffs: List[float] = None) -> str:
+    """Crowding level label for an index value"""
+    if index is None or np.isnan(index):
+        return "Unknown"
+    extreme_low, elevated_low, elevated_high, extreme_high = cutoffs or CROWDING_CUTOFFS
+    if index >= extreme_high:
+        return "Extreme long"
+    if index <= extreme_low:
+        return "Extreme short"
+    if index >= elevated_high:
+        return "Crowded long"
+    if index <= elevated_low:
+        return "Crowded short"
+    return "Normal"
+
+
+def _cot_percentiles(cots: List[Optional[Dict]], window: int) -> List[Optional[Dict[str, np.ndarray]]]:
+    """Weekly OI and managed-money percentiles for every COT history in one pass"""
+    present = [c for c in cots if c is not None]
+    if not present:
+        return [None] * len(cots)
+
+    length = max(len(c["dates"]) for c in present)
+    stacked = np.full((len(present), 2, length), np.nan)
+    for i, c in enumerate(present):
+        t = len(c["dates"])
+        stacked[i, 0, length - t:] = c["open_interest"]
+        stacked[i, 1, length - t:] = c["managed_money_net"]
+    pct = rolling_stats(stacked, window)["percentile"]
+
+    results, i = [], 0
+    for c in cots:
+        if c is None:
+            results.append(None)
+            continue
+        t = len(c["dates"])
+        results.append({"dates": c["dates"], "oi": pct[i, 0, -t:], "mm": pct[i, 1, -t:]})
+        i += 1
+    return results
+
+
+def universe_crowding(
+    universe: Dict[str, Dict],
+    lookbacks: List[int] = None,
+    cot_window: int = COT_WINDOW,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Crowding index, its components and its own historical percentile for
+    every commodity and price date in one pass.
+
+    Args:
+        universe: {commodity: {"prices": price arrays, "cot": cot arrays or None}}
+    """
+    commodities = list(universe)
+    if not commodities:
+        return {}
+    lookbacks = lookbacks or DEFAULT_LOOKBACKS
+    prices = [universe[c]["prices"] for c in commodities]
+    close = stack_closes([p["close"] for p in prices])
+    volume = stack_closes([p["volume"] for p in prices])
+    n, length = close.shape
+
+    # Weekly COT components, visible from their release date
+    oi_pct = np.full((n, length), np.nan)
+    mm_pct = np.full((n, length), np.nan)
+    weekly = _cot_percentiles([universe[c].get("cot") for c in commodities], cot_window)
+    for i, (p, w) in enumerate(zip(prices, weekly)):
+        if w is None:
+            continue
+        t = len(p["dates"])
+        oi_pct[i, length - t:] = align_to_dates(w["dates"], w["oi"], p["dates"], COT_RELEASE_LAG_DAYS)
+        mm_pct[i, length - t:] = align_to_dates(w["dates"], w["mm"], p["dates"], COT_RELEASE_LAG_DAYS)
+
+    cta_pct = replicate(close, lookbacks)["position_pct"]
+    recent_volume = nan_rolling_mean(np.where(volume > 0, volume, np.nan), ATTENTION_WINDOW)
+    attention_pct = rolling_percentile_rank(recent_volume, min(ATTENTION_LOOKBACK, length))
+
+    index = composite(oi_pct, mm_pct, cta_pct, attention_pct)
+    # How unusual today's crowding (either side) is against the index's own past
+    extremity_pct = rolling_percentile_rank(np.abs(index - 50), min(CONTEXT_LOOKBACK, length))
+
+    panels = {
+        "crowding_index": index,
+        "extremity_percentile": extremity_pct,
+        "oi_percentile": oi_pct,
+        "mm_percentile": mm_pct,
+        "cta_position_pct": cta_pct,
+        "attention_percentile": attention_pct,
+    }
+    results = {}
+    for i, (commodity, p) in enumerate(zip(commodities, prices)):
+        t = len(p["dates"])
+        results[commodity] = {"dates": p["dates"], **{k: v[i, -t:] for k, v in panels.items()}}
+    return results
+
+
+# =========================================
+# Cache & queries
+# =========================================
+
+class CrowdingCache:
+    """Full crowding history per commodity, recomputed once per COT release / price bar"""
+
+    def __init__(self, cache_dir: Path = None):
+        self.cache_dir = cache_dir or CROWDING_DIR
+
+    def _path(self, commodity: str) -> Path:
+        return self.cache_dir / f"{commodity}.json"
+
+    def stored(self, commodity: str) -> Optional[Dict]:
+        """Last saved series, whatever it was built from"""
+        path = self._path(commodity)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[Crowding] Ignoring unreadable {path.name}: {e}")
+            return None
+
+    def load(self, commodity: str, key: Dict) -> Optional[Dict]:
+        """Cached series if it was built from the same release, price date and params"""
+        cached = self.stored(commodity)
+        return cached if cached is not None and cached.get("key") == key else None
+
+    def save(self, commodity: str, key: Dict, series: Dict[str, np.ndarray]) -> Dict:
+        payload = {
+            "key": key,
+            "dates": [str(d) for d in series["dates"]],
+            **{
+                name: [None if np.isnan(v) else round(float(v), 2) for v in values]
+                for name, values in series.items() if name != "dates"
+            },
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._path(commodity), 'w') as f:
+            json.dump(payload, f)
+        return payload
+
+
+def load_crowding(commodity: str, lookbacks: List[int] = None,
+                  force_refresh: bool = False, cache: CrowdingCache = None,
+                  cot_window: int = COT_WINDOW) -> Dict:
+    """
+    Crowding history for one commodity (JSON-ready lists), from the cache
+    when neither a new COT release nor a new price bar has arrived.
+    """
+    lookbacks = lookbacks or DEFAULT_LOOKBACKS
+    fetcher = DataFetcher(commodity, force_refresh=force_refresh)
+    prices = price_arrays(fetcher.fetch_price_history())
+    if prices is None:
+        return {"error": "No price history for crowding index"}
+    # Same 5-year archive TM-POS uses for its positioning percentiles
+    cot = cot_arrays(fetcher.fetch_cot_history(years=5))
+
+    cache = cache or CrowdingCache()
+    key = {
+        "release": str(cot["dates"][-1]) if cot is not None else None,
+        "as_of": str(prices["dates"][-1]),
+        "lookbacks": list(lookbacks),
+        "cot_window": cot_window,
+    }
+    cached = None if force_refresh else cache.load(fetcher.commodity, key)
+    if cached is not None:
+        return cached
+
+    series = universe_crowding(
+        {fetcher.commodity: {"prices": prices, "cot": cot}}, lookbacks, cot_window,
+    )[fetcher.commodity]
+    return cache.save(fetcher.commodity, key, series)
+
+
+def query(history: Dict, start: str = None, end: str = None) -> Dict[str, List]:
+    """Slice of a cached crowding history between two ISO dates (inclusive)"""
+    dates = history.get("dates", [])
+    keep = [i for i, d in enumerate(dates) if (start is None or d >= start) and (end is None or d <= end)]
+    return {
+        name: [values[i] for i in keep]
+        for name, values in history.items() if isinstance(values, list)
+    }
+
+
+def crowding_on(history: Dict, when: str) -> Optional[Dict]:
+    """Index and components as of a date (last value on or before it)"""
+    dates = history.get("dates", [])
+    i = int(np.searchsorted(np.array(dates, dtype="datetime64[D]"), np.datetime64(when[:10]), side="right")) - 1
+    if i < 0:
+        return None
+    return {
+        "date": dates[i],
+        "crowding_index": history["crowding_index"][i],
+        "level": classify(history["crowding_index"][i]),
+        **{name: history[name][i] for name in COMPONENTS},
+    }
+
+
+def latest_crowding(history: Dict, cutoffs: List[float] = None) -> Dict:
+    """Current crowding with historical context for a Task Manager"""
+    if "error" in history:
+        return history
+    index = np.array([np.nan if v is None else v for v in history.get("crowding_index", [])], dtype=float)
+    valid = np.flatnonzero(~np.isnan(index))
+    if not len(valid):
+        return {"error": "Not enough history for the crowding index"}
+
+    last = valid[-1]
+    current = float(index[last])
+    level = classify(current, cutoffs)
+    extremity = abs(current - 50)
+
+    # Last earlier date at least this crowded on the same side
+    side = np.sign(current - 50)
+    as_crowded = np.flatnonzero((np.sign(index[:last] - 50) == side) & (np.abs(index[:last] - 50) >= extremity))
+    year = index[max(0, last - 251):last + 1]
+
+    def change(days):
+        prior = last - days
+        return round(current - float(index[prior]), 1) if prior >= 0 and not np.isnan(index[prior]) else None
+
+    return {
+        "as_of": history["dates"][last],
+        "crowding_index": round(current, 1),
+        "level": level,
+        "side": "long" if side > 0 else "short" if side < 0 else "neutral",
+        "components": {name: history[name][last] for name in COMPONENTS},
+        "extremity_percentile": history["extremity_percentile"][last],
+        "change_1w": change(5),
+        "change_1m": change(21),
+        "year_high": round(float(np.nanmax(year)), 1),
+        "year_low": round(float(np.nanmin(year)), 1),
+        "last_as_crowded": history["dates"][as_crowded[-1]] if len(as_crowded) else None,
+        "history_days": len(valid),
+    }
@@ -0,0 +1,218 @@
+"""
+CTA Replication Model
+Trend-follower position estimate from price alone: moving-average and
+channel-breakout signals over several lookbacks, averaged and sized to a
+volatility target. Produces the position history, its recent change and
+the next-close prices that would flip it. Computed for a (commodities x
+dates) panel and all lookbacks at once.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .volatility import close_to_close
+
+DEFAULT_LOOKBACKS = [20, 50, 200]
+VOL_WINDOW = 60
+TARGET_VOL = 0.25          # annualized vol at which a full signal is a 1x position
+MAX_LEVERAGE = 1.5         # position cap (calm markets), in multiples of 1x
+CHUNK = 1024               # dates per block when building channel windows
+
+# Position (% of max) bands for the TM-POS sub-score
+POSITION_BANDS = {"high": 60, "medium": 25}
+POSITION_SCORE = 0.3
+
+
+def stack_closes(series: List[np.ndarray]) -> np.ndarray:
+    """Right-align close arrays into an (N, T) panel, NaN-padded at the front"""
+    length = max(len(s) for s in series)
+    panel = np.full((len(series), length), np.nan)
+    for i, s in enumerate(series):
+        panel[i, length - len(s):] = s
+    return panel
+
+
+def _moving_averages(close: np.ndarray, lookbacks: List[int]) -> np.ndarray:
+    """(N, K, T) trailing means for every lookback from one cumulative sum"""
+    n, t = close.shape
+    csum = np.concatenate([np.zeros((n, 1)), np.cumsum(np.nan_to_num(close), axis=1)], axis=1)
+    ends = np.arange(1, t + 1)
+    starts = ends[None, :] - np.array(lookbacks)[:, None]               # (K, T)
+    sums = csum[:, ends][:, None, :] - csum[:, np.clip(starts, 0, None)]
+    ma = sums / np.array(lookbacks)[None, :, None]
+
+    # Require a full window of real closes
+    count = np.concatenate([np.zeros((n, 1)), np.cumsum(~np.isnan(close), axis=1)], axis=1)
+    full = (count[:, ends][:, None, :] - count[:, np.clip(starts, 0, None)]) == np.array(lookbacks)[None, :, None]
+    return np.where(full & (starts >= 0)[None], ma, np.nan)
+
+
+def _channels(close: np.ndarray, lookbacks: List[int]) -> tuple:
+    """(N, K, T) trailing highs and lows of closes for every lookback"""
+    n, t = close.shape
+    longest = max(lookbacks)
+    taps = np.array(lookbacks) - 1
+    padded = np.pad(close, [(0, 0), (longest - 1, 0)], constant_values=np.nan)
+    highs = np.full((n, len(lookbacks), t), np.nan)
+    lows = np.full((n, len(lookbacks), t), np.nan)
+
+    for start in range(0, t, CHUNK):
+        stop = min(start + CHUNK, t)
+        # Windows newest-first, so a running max/min at position L-1 is the L-bar extreme
+        windows = sliding_window_view(padded[:, start:stop + longest - 1], longest, axis=1)[..., ::-1]
+        highs[:, :, start:stop] = np.moveaxis(np.maximum.accumulate(windows, axis=-1)[..., taps], -1, 1)
+        lows[:, :, start:stop] = np.moveaxis(np.minimum.accumulate(windows, axis=-1)[..., taps], -1, 1)
+    return highs, lows
+
+
+def _signal(close, ma, high, low) -> np.ndarray:
+    """Average of MA direction and position within the breakout channel, in [-1, 1]"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        trend = np.sign(close - ma)
+        half = (high - low) / 2
+        breakout = np.where(half > 0, np.clip((close - (high + low) / 2) / half, -1, 1), 0.0)
+    return 0.5 * trend + 0.5 * breakout
+
+
+def replicate(
+    close: np.ndarray,
+    lookbacks: List[int] = None,
+    vol_window: int = VOL_WINDOW,
+    target_vol: float = TARGET_VOL,
+    max_leverage: float = MAX_LEVERAGE,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulated CTA position history for an (N, T) close panel.
+
+    Returns:
+        {"signals": (N, K, T), "raw": (N, T) mean signal,
+         "position_pct": (N, T) vol-targeted position as % of the cap}
+    """
+    lookbacks = lookbacks or DEFAULT_LOOKBACKS
+    close = np.atleast_2d(np.asarray(close, dtype=float))
+    ma = _moving_averages(close, lookbacks)
+    high, low = _channels(close, lookbacks)
+    signals = _signal(close[:, None, :], ma, high, low)
+    raw = signals.mean(axis=1)
+
+    vol = close_to_close(close, vol_window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sized = np.clip(raw * target_vol / vol, -max_leverage, max_leverage)
+    return {"signals": signals, "raw": raw, "position_pct": sized / max_leverage * 100}
+
+
+def flip_levels(close: np.ndarray, lookbacks: List[int] = None, iterations: int = 40) -> Dict[str, np.ndarray]:
+    """
+    Next-close prices that flip the model.
+
+    Returns:
+        {"by_lookback": (N, K) price where each MA signal changes side,
+         "aggregate": (N,) price where the mean signal crosses zero
+         (NaN if not within +/-50% of the last close)}
+    """
+    lookbacks = lookbacks or DEFAULT_LOOKBACKS
+    close = np.atleast_2d(np.asarray(close, dtype=float))
+    last = close[:, -1]
+
+    # History each lookback keeps once tomorrow's close is added
+    prior = [close[:, -(lb - 1):] if lb > 1 else close[:, :0] for lb in lookbacks]
+    prior_sum = np.stack([p.sum(axis=1) for p in prior], axis=1)                       # (N, K)
+    prior_high = np.stack([p.max(axis=1) if p.shape[1] else last for p in prior], axis=1)
+    prior_low = np.stack([p.min(axis=1) if p.shape[1] else last for p in prior], axis=1)
+    sizes = np.array(lookbacks, dtype=float)
+
+    # P > (prior_sum + P) / L  <=>  P > prior_sum / (L - 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        by_lookback = prior_sum / (sizes - 1)
+
+    def mean_signal(p: np.ndarray) -> np.ndarray:
+        p = p[:, None]
+        ma = (prior_sum + p) / sizes
+        return _signal(p, ma, np.maximum(prior_high, p), np.minimum(prior_low, p)).mean(axis=1)
+
+    # Mean signal is non-decreasing in P: bisect towards the zero crossing
+    current = mean_signal(last)
+    lo = np.where(current > 0, last * 0.5, last)
+    hi = np.where(current > 0, last, last * 1.5)
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        above = mean_signal(mid) > 0
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    aggregate = (lo + hi) / 2
+
+    # No crossing inside the bracket
+    reachable = np.sign(mean_signal(last * 0.5)) != np.sign(mean_signal(last * 1.5))
+    aggregate = np.where(reachable & (current != 0), aggregate, np.nan)
+    return {"by_lookback": by_lookback, "aggregate": aggregate}
+
+
+def summarize(position_pct: np.ndarray, flips: Dict[str, np.ndarray], i: int,
+              last_close: float, lookbacks: List[int]) -> Dict:
+    """Latest position, recent change and flip levels for one market"""
+    series = position_pct[i]
+
+    def at(offset):
+        if len(series) <= offset or np.isnan(series[-1 - offset]):
+            return None
+        return round(float(series[-1 - offset]), 1)
+
+    latest = at(0)
+    aggregate = flips["aggregate"][i]
+    return {
+        "position_pct": latest,
+        "change_1w": round(latest - at(5), 1) if latest is not None and at(5) is not None else None,
+        "change_1m": round(latest - at(21), 1) if latest is not None and at(21) is not None else None,
+        "flip_price": None if np.isnan(aggregate) else round(float(aggregate), 4),
+        "flip_distance_pct": None if np.isnan(aggregate) else round(float((aggregate / last_close - 1) * 100), 2),
+        "ma_flip_levels": {
+            f"{lb}d": None if np.isnan(level) else round(float(level), 4)
+            for lb, level in zip(lookbacks, flips["by_lookback"][i])
+        },
+    }
+
+
+def universe_cta(universe: Dict[str, Dict], lookbacks: List[int] = None) -> Dict[str, Dict]:
+    """Position history and latest summary for every commodity in one pass"""
+    lookbacks = lookbacks or DEFAULT_LOOKBACKS
+    commodities = list(universe)
+    series = [universe[c]["prices"]["close"] for c in commodities]
+    panel = stack_closes(series)
+    model = replicate(panel, lookbacks)
+    flips = flip_levels(panel, lookbacks)
+
+    results = {}
+    for i, commodity in enumerate(commodities):
+        t = len(series[i])
+        results[commodity] = {
+            "dates": universe[commodity]["prices"]["dates"],
+            "position_pct": model["position_pct"][i, -t:],
+            "latest": summarize(model["position_pct"], flips, i, float(series[i][-1]), lookbacks),
+        }
+    return results
+
+
+def latest_cta(closes: List[float], lookbacks: List[int] = None) -> Dict:
+    """Model summary for one market's close list"""
+    lookbacks = lookbacks or DEFAULT_LOOKBACKS
+    if len(closes) < max(lookbacks) + 1:
+        return {"error": f"Need {max(lookbacks) + 1} closes for the longest lookback"}
+    close = np.array(closes, dtype=float)[None, :]
+    model = replicate(close, lookbacks)
+    summary = summarize(model["position_pct"], flip_levels(close, lookbacks), 0, float(closes[-1]), lookbacks)
+    summary["signals"] = {
+        f"{lb}d": round(float(s), 2) for lb, s in zip(lookbacks, model["signals"][0, :, -1])
+    }
+    return summary
+
+
+def position_score(position_pct: float) -> tuple:
+    """(label, confidence, score) for a model position"""
+    if position_pct is None or abs(position_pct) < POSITION_BANDS["medium"]:
+        return "Mixed/Flat", "Low", 0
+    confidence = "High" if abs(position_pct) >= POSITION_BANDS["high"] else "Medium"
+    if position_pct > 0:
+        return "Long", confidence, POSITION_SCORE
+    return "Short", confidence, -POSITION_SCORE
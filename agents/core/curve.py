@@ -0,0 +1,255 @@
+"""
+Futures Curve Store & Term-Structure Analytics
+Keeps per-contract daily closes in data/processed/curves/<commodity>.json
+(merged on every fetch, so expired contracts stay in the history), and
+computes constant-maturity prices, calendar spreads, annualized roll yield,
+curve slope/curvature and their historical percentiles for every commodity
+and date in one batched (commodities x dates x tenors) pass.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .data_fetch import DATA_PROCESSED
+from .volatility import rolling_percentile_rank
+
+CURVE_DIR = DATA_PROCESSED / "curves"
+
+# Constant-maturity tenors (months)
+TENORS = [1, 2, 3, 6, 12]
+DAYS_PER_MONTH = 30.4375
+PERCENTILE_LOOKBACK = 252
+
+FACTORS = ["spread_1_3_pct", "spread_1_12_pct", "roll_yield_pct", "slope_pct", "curvature_pct"]
+
+
+# =========================================
+# Store
+# =========================================
+
+class CurveStore:
+    """Accumulated per-contract close history for each commodity"""
+
+    def __init__(self, store_dir: Path = None):
+        self.store_dir = store_dir or CURVE_DIR
+
+    def _path(self, commodity: str) -> Path:
+        return self.store_dir / f"{commodity}.json"
+
+    def load(self, commodity: str) -> Dict:
+        """{symbol: {"expiry": str, "closes": {date: close}}}"""
+        path = self._path(commodity)
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[Curve] Ignoring unreadable {path.name}: {e}")
+            return {}
+
+    def merge(self, commodity: str, curve_data: Dict) -> Dict:
+        """Add a DataFetcher curve payload to the stored history and save"""
+        stored = self.load(commodity)
+        for contract in curve_data.get("contracts", []):
+            entry = stored.setdefault(contract["symbol"], {"expiry": contract["expiry"], "closes": {}})
+            entry["closes"].update({p["date"]: p["close"] for p in contract.get("prices", []) if p.get("close")})
+
+        if stored:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._path(commodity), 'w') as f:
+                json.dump(stored, f)
+        return stored
+
+
+def curve_arrays(stored: Dict) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Stored contracts as arrays: dates (T), expiries (K, sorted) and a
+    (T x K) close matrix with NaN where a contract has no close.
+    """
+    if not stored:
+        return None
+    symbols = sorted(stored, key=lambda s: stored[s]["expiry"])
+    dates = np.unique(np.array(
+        [d for s in symbols for d in stored[s]["closes"]], dtype="datetime64[D]",
+    ))
+    if not len(dates):
+        return None
+
+    prices = np.full((len(dates), len(symbols)), np.nan)
+    for k, symbol in enumerate(symbols):
+        closes = stored[symbol]["closes"]
+        idx = np.searchsorted(dates, np.array(list(closes), dtype="datetime64[D]"))
+        prices[idx, k] = list(closes.values())
+
+    return {
+        "dates": dates,
+        "expiries": np.array([stored[s]["expiry"] for s in symbols], dtype="datetime64[D]"),
+        "symbols": symbols,
+        "prices": prices,
+    }
+
+
+# =========================================
+# Batched analytics
+# =========================================
+
+def _stack(curves: List[Dict]) -> Dict[str, np.ndarray]:
+    """Pad curves to (N, T), (N, K), (N, T, K) arrays of day numbers / prices"""
+    n = len(curves)
+    t_max = max(len(c["dates"]) for c in curves)
+    k_max = max(len(c["expiries"]) for c in curves)
+
+    dates = np.full((n, t_max), np.nan)
+    expiries = np.full((n, k_max), np.nan)
+    prices = np.full((n, t_max, k_max), np.nan)
+    for i, c in enumerate(curves):
+        t, k = len(c["dates"]), len(c["expiries"])
+        dates[i, t_max - t:] = c["dates"].astype(np.int64)
+        expiries[i, :k] = c["expiries"].astype(np.int64)
+        prices[i, t_max - t:, :k] = c["prices"]
+    return {"dates": dates, "expiries": expiries, "prices": prices}
+
+
+def constant_maturity(
+    dates: np.ndarray,
+    expiries: np.ndarray,
+    prices: np.ndarray,
+    tenors: List[int] = None,
+) -> np.ndarray:
+    """
+    Log-linear interpolation of the curve at fixed tenors.
+
+    Args:
+        dates: (N, T) day numbers
+        expiries: (N, K) day numbers
+        prices: (N, T, K) closes
+
+    Returns:
+        (N, T, M) constant-maturity prices. The short end is held flat to the
+        first listed contract; beyond the last contract it is NaN.
+    """
+    tenors = tenors or TENORS
+    target = dates[:, :, None] + np.array(tenors) * DAYS_PER_MONTH            # (N, T, M)
+    log_p = np.log(prices)
+    exp = expiries[:, None, None, :]                                          # (N, 1, 1, K)
+    live = (~np.isnan(prices) & (expiries[:, None, :] > dates[:, :, None]))[:, :, None, :]
+
+    below = live & (exp <= target[..., None])                                 # (N, T, M, K)
+    above = live & (exp > target[..., None])
+    k = prices.shape[-1]
+    lo = k - 1 - np.argmax(below[..., ::-1], axis=-1)
+    hi = np.argmax(above, axis=-1)
+    has_lo, has_hi = below.any(-1), above.any(-1)
+
+    def take(values, idx):
+        return np.take_along_axis(values, idx[..., None], axis=-1)[..., 0]
+
+    log_full = np.broadcast_to(log_p[:, :, None, :], below.shape)
+    exp_full = np.broadcast_to(exp, below.shape)
+    y_lo, y_hi = take(log_full, lo), take(log_full, hi)
+    e_lo, e_hi = take(exp_full, lo), take(exp_full, hi)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = (target - e_lo) / (e_hi - e_lo)
+        interpolated = (1 - w) * y_lo + w * y_hi
+    out = np.where(has_lo & has_hi, interpolated, np.nan)
+    out = np.where(~has_lo & has_hi, y_hi, out)
+    return np.exp(out)
+
+
+def term_structure_factors(cm: np.ndarray, tenors: List[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Curve factors from constant-maturity prices (..., M). Positive spreads
+    and roll yield mean backwardation; slope is % per year along the curve.
+    """
+    tenors = list(tenors or TENORS)
+    years = np.array(tenors) / 12
+    log_cm = np.log(cm)
+    i1, i3, i6, i12 = (tenors.index(m) for m in (1, 3, 6, 12))
+
+    # OLS slope of log price on tenor, using the tenors available per date
+    valid = ~np.isnan(log_cm)
+    n = valid.sum(-1)
+    t = np.where(valid, years, 0.0)
+    y = np.where(valid, log_cm, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_mean = t.sum(-1) / n
+        y_mean = y.sum(-1) / n
+        cov = (np.where(valid, (years - t_mean[..., None]) * (log_cm - y_mean[..., None]), 0.0)).sum(-1)
+        var = (np.where(valid, (years - t_mean[..., None]) ** 2, 0.0)).sum(-1)
+        slope = np.where(n >= 3, cov / var, np.nan)
+
+    return {
+        "spread_1_3_pct": (cm[..., i1] / cm[..., i3] - 1) * 100,
+        "spread_1_12_pct": (cm[..., i1] / cm[..., i12] - 1) * 100,
+        "roll_yield_pct": (log_cm[..., i1] - log_cm[..., i3]) / (years[i3] - years[i1]) * 100,
+        "slope_pct": slope * 100,
+        "curvature_pct": (log_cm[..., i1] + log_cm[..., i12] - 2 * log_cm[..., i6]) * 100,
+    }
+
+
+def universe_term_structure(
+    curves: Dict[str, Dict],
+    tenors: List[int] = None,
+    lookback: int = PERCENTILE_LOOKBACK,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Constant-maturity curve, factors and factor percentiles for every
+    commodity and date in one pass.
+
+    Args:
+        curves: {commodity: curve_arrays(...)}
+    """
+    names = [c for c in curves if curves[c] is not None]
+    if not names:
+        return {}
+    tenors = tenors or TENORS
+
+    stacked = _stack([curves[c] for c in names])
+    cm = constant_maturity(stacked["dates"], stacked["expiries"], stacked["prices"], tenors)
+    factors = term_structure_factors(cm, tenors)
+    lookback = min(lookback, cm.shape[1])
+    percentiles = {f"{name}_percentile": rolling_percentile_rank(values, lookback) for name, values in factors.items()}
+
+    results = {}
+    for i, commodity in enumerate(names):
+        t = len(curves[commodity]["dates"])
+        results[commodity] = {
+            "dates": curves[commodity]["dates"],
+            "constant_maturity": cm[i, -t:],
+            **{name: values[i, -t:] for name, values in factors.items()},
+            **{name: values[i, -t:] for name, values in percentiles.items()},
+        }
+    return results
+
+
+def latest_term_structure(stored: Dict, tenors: List[int] = None) -> Dict:
+    """Current curve snapshot with factor percentiles for one commodity"""
+    curve = curve_arrays(stored)
+    if curve is None:
+        return {"error": "No futures curve stored"}
+
+    tenors = tenors or TENORS
+    result = universe_term_structure({"curve": curve}, tenors)["curve"]
+    latest = -1
+    while latest > -len(result["dates"]) and np.all(np.isnan(result["constant_maturity"][latest])):
+        latest -= 1
+
+    def value(name, digits=2):
+        v = result[name][latest]
+        return None if np.isnan(v) else round(float(v), digits)
+
+    return {
+        "as_of": str(result["dates"][latest]),
+        "contracts": len(curve["symbols"]),
+        "curve": {
+            f"{m}M": (None if np.isnan(p) else round(float(p), 4))
+            for m, p in zip(tenors, result["constant_maturity"][latest])
+        },
+        **{name: value(name) for name in FACTORS},
+        **{f"{name}_percentile": value(f"{name}_percentile", 1) for name in FACTORS},
+    }
@@ -10,6 +10,7 @@ import re
 import csv
 import io
 import hashlib
+import zipfile
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
@@ -19,10 +20,13 @@ from urllib.parse import quote, urlencode
 import ssl
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from .dedup import collapse_duplicates
+
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_RAW = PROJECT_ROOT / "data" / "raw"
 DATA_CACHE = PROJECT_ROOT / "data" / "cache"
+DATA_PROCESSED = PROJECT_ROOT / "data" / "processed"
 
 # Disable SSL verification for some sources
 SSL_CONTEXT = ssl.create_default_context()
@@ -180,14 +184,19 @@ class DataFetcher:
                 pass
         return None
 
+    def cached_snapshots(self, source: str) -> List[Path]:
+        """All stored daily cache files for a source, oldest first"""
+        pattern = re.compile(rf"^{re.escape(self.commodity)}_{re.escape(source)}_\d{{8}}\.json$")
+        return sorted(p for p in self.cache_dir.glob(f"{self.commodity}_{source}_*.json") if pattern.match(p.name))
+
     def _save_cache(self, source: str, data: Dict):
         """Save data to cache"""
         cache_path = self._get_cache_path(source)
         with open(cache_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, default=str)
 
-    def _fetch_url(self, url: str, headers: Dict = None, timeout: int = 30) -> Optional[str]:
-        """Fetch URL content with error handling"""
+    def _fetch_url(self, url: str, headers: Dict = None, timeout: int = 30, binary: bool = False) -> Optional[Any]:
+        """Fetch URL content with error handling (raw bytes if binary=True)"""
         try:
             req = Request(url)
             req.add_header('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
@@ -197,7 +206,8 @@ class DataFetcher:
                 for k, v in headers.items():
                     req.add_header(k, v)
             with urlopen(req, timeout=timeout, context=SSL_CONTEXT) as response:
-                return response.read().decode('utf-8', errors='ignore')
+                payload = response.read()
+                return payload if binary else payload.decode('utf-8', errors='ignore')
         except (URLError, HTTPError) as e:
             print(f"[DataFetcher] Error fetching {url}: {e}")
             return None
@@ -225,22 +235,7 @@ class DataFetcher:
             return {"error": "Failed to fetch price data"}
 
         try:
-            data = json.loads(content)
-            result = data.get("chart", {}).get("result", [{}])[0]
-            timestamps = result.get("timestamp", [])
-            quotes = result.get("indicators", {}).get("quote", [{}])[0]
-
-            prices = []
-            for i, ts in enumerate(timestamps):
-                if quotes.get("close") and i < len(quotes["close"]) and quotes["close"][i]:
-                    prices.append({
-                        "date": datetime.fromtimestamp(ts).strftime("%Y-%m-%d"),
-                        "open": quotes.get("open", [None])[i],
-                        "high": quotes.get("high", [None])[i],
-                        "low": quotes.get("low", [None])[i],
-                        "close": quotes["close"][i],
-                        "volume": quotes.get("volume", [None])[i],
-                    })
+            prices = self._parse_chart_prices(content)
 
             price_data = {
                 "symbol": symbol,
@@ -258,6 +253,120 @@ class DataFetcher:
         except Exception as e:
             return {"error": f"Failed to parse price data: {e}"}
 
+    def _parse_chart_prices(self, content: str) -> List[Dict]:
+        """Parse a Yahoo chart API response into daily OHLCV rows"""
+        data = json.loads(content)
+        result = data.get("chart", {}).get("result", [{}])[0]
+        timestamps = result.get("timestamp", [])
+        quotes = result.get("indicators", {}).get("quote", [{}])[0]
+
+        prices = []
+        for i, ts in enumerate(timestamps):
+            if quotes.get("close") and i < len(quotes["close"]) and quotes["close"][i]:
+                prices.append({
+                    "date": datetime.fromtimestamp(ts).strftime("%Y-%m-%d"),
+                    "open": quotes.get("open", [None])[i],
+                    "high": quotes.get("high", [None])[i],
+                    "low": quotes.get("low", [None])[i],
+                    "close": quotes["close"][i],
+                    "volume": quotes.get("volume", [None])[i],
+                })
+        return prices
+
+    def fetch_price_history(self) -> Dict:
+        """Fetch the full daily price history from Yahoo Finance (for backtests)"""
+        if not self.force_refresh:
+            cached = self._load_cache("price_history")
+            if cached:
+                return cached
+
+        symbol = self.config.get("yahoo")
+        if not symbol:
+            return {"error": f"No Yahoo symbol for {self.commodity}"}
+
+        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}?range=max&interval=1d"
+        content = self._fetch_url(url, timeout=60)
+        if not content:
+            return {"error": "Failed to fetch price history"}
+
+        try:
+            prices = self._parse_chart_prices(content)
+            history = {
+                "symbol": symbol,
+                "commodity": self.config.get("name", self.commodity),
+                "fetched_at": datetime.now().isoformat(),
+                "prices": prices,
+                "count": len(prices),
+            }
+            self._save_cache("price_history", history)
+            return history
+        except Exception as e:
+            return {"error": f"Failed to parse price history: {e}"}
+
+    # Futures month codes and Yahoo exchange suffixes for individual contracts
+    MONTH_CODES = "FGHJKMNQUVXZ"
+    YAHOO_EXCHANGE_SUFFIX = {"COMEX": ".CMX", "NYMEX": ".NYM", "CBOT": ".CBT", "ICE": ".NYB"}
+
+    def _curve_contracts(self, months: int) -> List[Dict]:
+        """Yahoo symbols for the next `months` contract months (approximate mid-month expiry)"""
+        symbol = self.config.get("yahoo")
+        exchanges = (self.config.get("exchange") or "").split("/")
+        suffix = next((self.YAHOO_EXCHANGE_SUFFIX[e] for e in exchanges if e in self.YAHOO_EXCHANGE_SUFFIX), None)
+        if not symbol or not suffix:
+            return []
+
+        root = symbol.replace("=F", "")
+        today = datetime.now()
+        contracts = []
+        for offset in range(months):
+            year = today.year + (today.month - 1 + offset) // 12
+            month = (today.month - 1 + offset) % 12 + 1
+            contracts.append({
+                "symbol": f"{root}{self.MONTH_CODES[month - 1]}{year % 100:02d}{suffix}",
+                "expiry": f"{year}-{month:02d}-15",
+            })
+        return contracts
+
+    def fetch_curve_data(self, months: int = 15) -> Dict:
+        """Fetch daily closes of the listed contracts along the futures curve"""
+        if not self.force_refresh:
+            cached = self._load_cache("curve")
+            if cached:
+                return cached
+
+        contracts = self._curve_contracts(months)
+        if not contracts:
+            return {"error": f"No curve symbols for {self.commodity}"}
+
+        def fetch_contract(contract: Dict) -> Optional[Dict]:
+            url = f"https://query1.finance.yahoo.com/v8/finance/chart/{quote(contract['symbol'])}?range=1y&interval=1d"
+            content = self._fetch_url(url)
+            if not content:
+                return None
+            try:
+                prices = self._parse_chart_prices(content)
+            except Exception:
+                return None
+            if not prices:
+                return None
+            return {**contract, "prices": [{"date": p["date"], "close": p["close"]} for p in prices]}
+
+        # Months that are not listed simply come back empty
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            listed = [c for c in executor.map(fetch_contract, contracts) if c]
+
+        if not listed:
+            return {"error": "No curve contracts found", "source": "Yahoo Finance"}
+
+        curve = {
+            "source": "Yahoo Finance",
+            "fetched_at": datetime.now().isoformat(),
+            "commodity": self.config.get("name"),
+            "contracts": listed,
+        }
+        self._save_cache("curve", curve)
+        return curve
+
     def fetch_cot_data(self) -> Dict:
         """Fetch and parse COT (Commitment of Traders) data from CFTC"""
         if not self.force_refresh:
@@ -409,6 +518,117 @@ class DataFetcher:
 
         return {"error": "No matching COT data found", "source": "CFTC"}
 
+    # Column name patterns for the COT history parser (first match wins)
+    COT_HISTORY_COLUMNS = {
+        "date": ["Report_Date_as_YYYY-MM-DD", "Report_Date_as_MM_DD_YYYY", "As_of_Date_In_Form_YYMMDD"],
+        "open_interest": ["Open_Interest_All", "Open_Interest"],
+        "mm_long": ["M_Money_Positions_Long_All", "M_Money_Positions_Long"],
+        "mm_short": ["M_Money_Positions_Short_All", "M_Money_Positions_Short"],
+        "prod_long": ["Prod_Merc_Positions_Long_All", "Prod_Merc_Positions_Long"],
+        "prod_short": ["Prod_Merc_Positions_Short_All", "Prod_Merc_Positions_Short"],
+        "swap_long": ["Swap_Positions_Long_All", "Swap_Positions_Long"],
+        "swap_short": ["Swap__Positions_Short_All", "Swap_Positions_Short_All", "Swap_Positions_Short"],
+        "other_long": ["Other_Rept_Positions_Long_All", "Other_Rept_Positions_Long"],
+        "other_short": ["Other_Rept_Positions_Short_All", "Other_Rept_Positions_Short"],
+    }
+
+    def fetch_cot_history(self, years: int = 10) -> Dict:
+        """Fetch weekly COT history (CFTC annual disaggregated archives + current year)"""
+        source = f"cot_history_{years}y"
+        if not self.force_refresh:
+            cached = self._load_cache(source)
+            if cached:
+                return cached
+
+        cftc_name = self.config.get("cftc_name")
+        if not cftc_name:
+            return {"error": f"No CFTC name for {self.commodity}", "source": "CFTC"}
+
+        print(f"[DataFetcher] Fetching CFTC COT history for {cftc_name}...")
+        records = {}
+        current_year = datetime.now().year
+        for year in range(current_year - years, current_year + 1):
+            url = f"https://www.cftc.gov/files/dea/history/fut_disagg_txt_{year}.zip"
+            payload = self._fetch_url(url, timeout=60, binary=True)
+            if not payload:
+                continue
+            try:
+                with zipfile.ZipFile(io.BytesIO(payload)) as archive:
+                    for member in archive.namelist():
+                        content = archive.read(member).decode('utf-8', errors='ignore')
+                        for record in self._parse_cot_history(content, cftc_name):
+                            records[record["date"]] = record
+            except zipfile.BadZipFile:
+                print(f"[DataFetcher] Bad COT archive for {year}")
+
+        if not records:
+            return {"error": "No COT history found", "source": "CFTC"}
+
+        history = {
+            "source": "CFTC",
+            "fetched_at": datetime.now().isoformat(),
+            "commodity": self.config.get("name"),
+            "cftc_name": cftc_name,
+            "records": [records[d] for d in sorted(records)],
+        }
+        self._save_cache(source, history)
+        return history
+
+    def _parse_cot_history(self, content: str, cftc_name: str) -> List[Dict]:
+        """Parse every row for this market from a disaggregated COT file"""
+        reader = csv.reader(io.StringIO(content))
+        try:
+            headers = [h.strip() for h in next(reader)]
+        except StopIteration:
+            return []
+
+        name_col = next((i for i, h in enumerate(headers) if 'Market_and_Exchange_Names' in h), 0)
+        columns = {}
+        for key, patterns in self.COT_HISTORY_COLUMNS.items():
+            for pattern in patterns:
+                if pattern in headers:
+                    columns[key] = headers.index(pattern)
+                    break
+
+        if "date" not in columns:
+            return []
+
+        def to_int(row, key):
+            idx = columns.get(key)
+            if idx is None or idx >= len(row):
+                return 0
+            val = row[idx].strip().replace(',', '')
+            try:
+                return int(float(val)) if val and val != '.' else 0
+            except ValueError:
+                return 0
+
+        records = []
+        for row in reader:
+            if len(row) <= name_col or cftc_name.upper() not in row[name_col].upper():
+                continue
+            raw_date = row[columns["date"]].strip()
+            if len(raw_date) == 6 and raw_date.isdigit():
+                raw_date = datetime.strptime(raw_date, "%y%m%d").strftime("%Y-%m-%d")
+            elif "/" in raw_date:
+                raw_date = datetime.strptime(raw_date, "%m/%d/%Y").strftime("%Y-%m-%d")
+            else:
+                raw_date = raw_date[:10]
+
+            records.append({
+                "date": raw_date,
+                "open_interest": to_int(row, "open_interest"),
+                "managed_money_long": to_int(row, "mm_long"),
+                "managed_money_short": to_int(row, "mm_short"),
+                "producer_long": to_int(row, "prod_long"),
+                "producer_short": to_int(row, "prod_short"),
+                "swap_long": to_int(row, "swap_long"),
+                "swap_short": to_int(row, "swap_short"),
+                "other_reportable_long": to_int(row, "other_long"),
+                "other_reportable_short": to_int(row, "other_short"),
+            })
+        return records
+
     def fetch_news(self) -> Dict:
         """Fetch recent news from Google News RSS"""
         if not self.force_refresh:
@@ -447,14 +667,8 @@ class DataFetcher:
                 if any(kw.lower() in item.get("title", "").lower() for kw in keywords):
                     news_items.append(item)
 
-        # Deduplicate and sort by date
-        seen_titles = set()
-        unique_items = []
-        for item in news_items:
-            title_key = item.get("title", "")[:50].lower()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_items.append(item)
+        # Collapse near-duplicates (syndicated copies) into one item each, then sort by date
+        unique_items = collapse_duplicates(news_items)
 
         # Sort by date (most recent first)
         unique_items.sort(key=lambda x: x.get("pub_date", ""), reverse=True)
@@ -467,6 +681,7 @@ class DataFetcher:
             "sources_fetched": sources_fetched,
             "items": unique_items[:20],  # Top 20 news items
             "total_found": len(unique_items),
+            "articles_fetched": len(news_items),
         }
 
         self._save_cache("news", news_data)
@@ -738,9 +953,21 @@ class DataFetcher:
         return results
 
 
-def calculate_technical_indicators(prices: List[Dict]) -> Dict:
-    """Calculate technical indicators from price data"""
-    if not prices or len(prices) < 60:
+def calculate_technical_indicators(prices: List[Dict], params: Dict = None) -> Dict:
+    """
+    Calculate technical indicators from price data.
+    `params` may override the MA windows / RSI period (ma_short, ma_trend,
+    ma_long, rsi_period). Output keys are window-neutral (ma_short, ma_trend,
+    ma_long, above_trend_ma, rsi); the windows used are returned in
+    ma_windows and rsi_period.
+    """
+    params = params or {}
+    ma_short_window = params.get("ma_short", 20)
+    ma_trend_window = params.get("ma_trend", 60)
+    ma_long_window = params.get("ma_long", 200)
+    rsi_period = params.get("rsi_period", 14)
+
+    if not prices or len(prices) < ma_trend_window:
         return {"error": "Insufficient price data"}
 
     closes = [p["close"] for p in prices if p.get("close")]
@@ -769,18 +996,19 @@ def calculate_technical_indicators(prices: List[Dict]) -> Dict:
         return 100 - (100 / (1 + rs))
 
     latest_close = closes[-1]
-    ma_20 = sma(closes, 20)
-    ma_60 = sma(closes, 60)
-    ma_200 = sma(closes, 200) if len(closes) >= 200 else None
-    rsi_14 = rsi(closes, 14)
+    ma_short = sma(closes, ma_short_window)
+    ma_trend = sma(closes, ma_trend_window)
+    ma_long = sma(closes, ma_long_window) if len(closes) >= ma_long_window else None
+    rsi_value = rsi(closes, rsi_period)
 
     trend = "neutral"
-    if ma_60 and latest_close > ma_60:
+    if ma_trend and latest_close > ma_trend:
         trend = "bullish"
-    elif ma_60 and latest_close < ma_60:
+    elif ma_trend and latest_close < ma_trend:
         trend = "bearish"
 
-    year_closes = closes[-252:] if len(closes) >= 252 else closes
+    level_window = params.get("level_window", 252)
+    year_closes = closes[-level_window:] if len(closes) >= level_window else closes
     high_52w = max(year_closes)
     low_52w = min(year_closes)
     pct_from_high = ((latest_close - high_52w) / high_52w) * 100
@@ -788,16 +1016,18 @@ def calculate_technical_indicators(prices: List[Dict]) -> Dict:
 
     return {
         "latest_close": latest_close,
-        "ma_20": round(ma_20, 4) if ma_20 else None,
-        "ma_60": round(ma_60, 4) if ma_60 else None,
-        "ma_200": round(ma_200, 4) if ma_200 else None,
-        "rsi_14": round(rsi_14, 2) if rsi_14 else None,
+        "ma_short": round(ma_short, 4) if ma_short else None,
+        "ma_trend": round(ma_trend, 4) if ma_trend else None,
+        "ma_long": round(ma_long, 4) if ma_long else None,
+        "rsi": round(rsi_value, 2) if rsi_value else None,
+        "rsi_period": rsi_period,
         "trend": trend,
-        "above_60ma": latest_close > ma_60 if ma_60 else None,
+        "above_trend_ma": latest_close > ma_trend if ma_trend else None,
         "high_52w": round(high_52w, 4),
         "low_52w": round(low_52w, 4),
         "pct_from_52w_high": round(pct_from_high, 2),
         "pct_from_52w_low": round(pct_from_low, 2),
+        "ma_windows": [ma_short_window, ma_trend_window, ma_long_window],
     }
 
 
@@ -3,13 +3,19 @@ Debate Protocol Engine
 Implements the debate protocol between Task Managers and Supervisors
 """
 
+import copy
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Callable, Any, Optional
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from .eventlog import EventLog, get_event_log
+
+_MISSING = object()
+
 
 class DebateOutcome(Enum):
     ACCEPTED = "accepted"
@@ -38,9 +44,13 @@ class Response:
 
 @dataclass
 class DebateRound:
-    """A single round of debate"""
+    """
+    A single round of debate. The analysis the round examined is stored as
+    a structural delta against the previous round's (round 1: against the
+    initial analysis); use DebateResult.analysis_at() to materialize it.
+    """
     round_number: int
-    tm_analysis: Dict
+    analysis_delta: Dict
     challenges: List[Challenge]
     responses: List[Response]
     outcome: str
@@ -59,6 +69,61 @@ class DebateResult:
     confidence: float
     escalated_to: Optional[str] = None
 
+    def analysis_at(self, round_number: int) -> Dict:
+        """The analysis examined in a given round (1-based), rebuilt from the deltas"""
+        analysis = self.initial_analysis
+        for debate_round in self.rounds[:round_number]:
+            analysis = apply_delta(analysis, debate_round.analysis_delta)
+        return analysis
+
+
+# =========================================
+# Round deltas
+# =========================================
+
+def diff_analysis(old: Dict, new: Dict) -> Dict:
+    """
+    Structural diff between two analysis dicts: {"set": [[path, value]],
+    "unset": [path]}, paths being key lists. Nested dicts are walked;
+    objects shared between the two (rounds are shallow copies) are skipped
+    by identity, so an unchanged price_data chart costs nothing.
+    """
+    changes = {"set": [], "unset": []}
+    _diff(old, new, [], changes)
+    return changes
+
+
+def _diff(old: Dict, new: Dict, path: List[str], changes: Dict):
+    for key, value in new.items():
+        prior = old.get(key, _MISSING)
+        if prior is value:
+            continue
+        if isinstance(prior, dict) and isinstance(value, dict):
+            _diff(prior, value, path + [key], changes)
+        elif prior is _MISSING or prior != value:
+            # Copied: later rounds must not be able to rewrite history in place
+            changes["set"].append([path + [key], copy.deepcopy(value)])
+    changes["unset"].extend(path + [key] for key in old if key not in new)
+
+
+def apply_delta(base: Dict, delta: Dict) -> Dict:
+    """New dict with a delta applied; only dicts along changed paths are copied"""
+    result = dict(base)
+    for path, value in delta["set"]:
+        _writable_parent(result, path)[path[-1]] = value
+    for path in delta["unset"]:
+        _writable_parent(result, path).pop(path[-1], None)
+    return result
+
+
+def _writable_parent(root: Dict, path: List[str]) -> Dict:
+    node = root
+    for key in path[:-1]:
+        child = node.get(key)
+        node[key] = child = dict(child) if isinstance(child, dict) else {}
+        node = child
+    return node
+
 
 class DebateEngine:
     """
@@ -77,10 +142,17 @@ class DebateEngine:
     MAX_ROUNDS = 5
     ESCALATION_THRESHOLD = 3
 
-    def __init__(self, module_name: str, output_dir: Path):
+    def __init__(self, module_name: str, output_dir: Path, event_log: EventLog = None):
         self.module_name = module_name
         self.output_dir = output_dir
+        self.commodity = output_dir.name
+        self.debate_id = f"{module_name}:{self.commodity}:{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+        # Rounds and the result go to the JSONL event log; the markdown view
+        # is rendered from it on demand (eventlog.write_debate_views)
+        self.event_log = event_log or get_event_log()
         self.rounds: List[DebateRound] = []
+        # Rule outcomes keyed by input fingerprint, shared by all rounds of this debate
+        self.rule_memo: Dict = {}
 
     def run_debate(
         self,
@@ -101,81 +173,115 @@ class DebateEngine:
         Returns:
             DebateResult with final analysis and debate history
         """
-        current_analysis = initial_analysis.copy()
-        outcome = DebateOutcome.REVISED
-
-        for round_num in range(1, self.MAX_ROUNDS + 1):
-            # SUP-A challenges logic
-            logic_challenges = sup_a_check(current_analysis)
-
-            # SUP-B validates data
-            data_challenges = sup_b_check(current_analysis)
-
-            all_challenges = logic_challenges + data_challenges
-
-            # If no challenges, accept
-            if not all_challenges and round_num >= self.MIN_ROUNDS:
-                round_result = DebateRound(
-                    round_number=round_num,
-                    tm_analysis=current_analysis,
-                    challenges=[],
-                    responses=[],
-                    outcome="accepted_no_challenges"
-                )
-                self.rounds.append(round_result)
-                outcome = DebateOutcome.ACCEPTED
-                break
-
-            # TM responds to challenges
-            revised_analysis, responses = tm_respond(current_analysis, all_challenges)
-
-            # Create round record
+        self.begin(initial_analysis)
+        while not self.done:
+            # SUP-A challenges logic, SUP-B validates data
+            challenges = self._check(sup_a_check, self.current_analysis) + self._check(sup_b_check, self.current_analysis)
+            self.advance(challenges, tm_respond)
+        return self.finish()
+
+    # The protocol as steps, so a batch executor can run many debates in
+    # lockstep and evaluate their supervisors together (core.batch)
+
+    def begin(self, initial_analysis: Dict):
+        self.initial_analysis = initial_analysis
+        self.current_analysis = initial_analysis.copy()
+        self.previous_analysis = initial_analysis
+        self.outcome = DebateOutcome.REVISED
+        self.round_num = 0
+        self.done = False
+        self._debate_started = self._round_started = time.perf_counter()
+
+    def advance(
+        self,
+        all_challenges: List[Challenge],
+        tm_respond: Callable[[Dict, List[Challenge]], tuple[Dict, List[Response]]],
+    ):
+        """One round: the supervisors' challenges on current_analysis and the TM's response"""
+        self.round_num += 1
+        round_num = self.round_num
+        current_analysis = self.current_analysis
+
+        # If no challenges, accept
+        if not all_challenges and round_num >= self.MIN_ROUNDS:
             round_result = DebateRound(
                 round_number=round_num,
-                tm_analysis=current_analysis,
-                challenges=[asdict(c) for c in all_challenges],
-                responses=[asdict(r) for r in responses],
-                outcome="revised" if any(r.revision_made for r in responses) else "defended"
+                analysis_delta=diff_analysis(self.previous_analysis, current_analysis),
+                challenges=[],
+                responses=[],
+                outcome="accepted_no_challenges"
             )
-            self.rounds.append(round_result)
-
-            # Check if all challenges addressed
-            high_severity_unaddressed = [
-                c for c, r in zip(all_challenges, responses)
-                if c.severity == "high" and not r.addressed
-            ]
-
-            if high_severity_unaddressed and round_num >= self.ESCALATION_THRESHOLD:
-                outcome = DebateOutcome.ESCALATED
-                break
-
-            # Update analysis for next round
-            current_analysis = revised_analysis
-
-            # If all addressed and min rounds complete, accept
-            if all(r.addressed for r in responses) and round_num >= self.MIN_ROUNDS:
-                outcome = DebateOutcome.ACCEPTED
-                break
-
+            self._record(round_result)
+            self.outcome = DebateOutcome.ACCEPTED
+            self.done = True
+            return
+
+        # TM responds to challenges
+        revised_analysis, responses = tm_respond(current_analysis, all_challenges)
+
+        # Create round record
+        round_result = DebateRound(
+            round_number=round_num,
+            analysis_delta=diff_analysis(self.previous_analysis, current_analysis),
+            challenges=[asdict(c) for c in all_challenges],
+            responses=[asdict(r) for r in responses],
+            outcome="revised" if any(r.revision_made for r in responses) else "defended"
+        )
+        self._record(round_result)
+
+        # Check if all challenges addressed
+        high_severity_unaddressed = [
+            c for c, r in zip(all_challenges, responses)
+            if c.severity == "high" and not r.addressed
+        ]
+
+        if high_severity_unaddressed and round_num >= self.ESCALATION_THRESHOLD:
+            self.outcome = DebateOutcome.ESCALATED
+            self.done = True
+            return
+
+        # Update analysis for next round
+        self.previous_analysis = current_analysis
+        self.current_analysis = revised_analysis
+
+        # If all addressed and min rounds complete, accept
+        if all(r.addressed for r in responses) and round_num >= self.MIN_ROUNDS:
+            self.outcome = DebateOutcome.ACCEPTED
+            self.done = True
+        elif round_num >= self.MAX_ROUNDS:
+            self.done = True
+
+    def finish(self) -> DebateResult:
         # Calculate confidence based on debate
-        confidence = self._calculate_confidence(outcome, self.rounds)
+        confidence = self._calculate_confidence(self.outcome, self.rounds)
 
         result = DebateResult(
             module=self.module_name,
-            initial_analysis=initial_analysis,
-            final_analysis=current_analysis,
+            initial_analysis=self.initial_analysis,
+            final_analysis=self.current_analysis,
             rounds=self.rounds,
             total_rounds=len(self.rounds),
-            outcome=outcome,
+            outcome=self.outcome,
             confidence=confidence,
-            escalated_to="Level1-SUP" if outcome == DebateOutcome.ESCALATED else None
+            escalated_to="Level1-SUP" if self.outcome == DebateOutcome.ESCALATED else None
         )
 
-        # Save debate log
-        self._save_debate_log(result)
+        # Log the debate (queued; never blocks on file I/O)
+        self._log_result(result, self._debate_started)
 
         return result
 
+    def _record(self, round_result: DebateRound):
+        self.rounds.append(round_result)
+        self._log_round(round_result, self._round_started)
+        self._round_started = time.perf_counter()
+
+    def _check(self, checker: Callable[[Dict], List[Challenge]], analysis: Dict) -> List[Challenge]:
+        """Run a supervisor, re-evaluating only rules whose inputs changed (compiled checkers)"""
+        if isinstance(checker, CompiledChecker):
+            return checker.evaluate(analysis, self.rule_memo)
+        return checker(analysis)
+
     def _calculate_confidence(self, outcome: DebateOutcome, rounds: List[DebateRound]) -> float:
         """Calculate confidence score based on debate outcome"""
         base_confidence = 0.7
@@ -205,41 +311,213 @@ class DebateEngine:
 
         return min(0.95, max(0.3, round(base_confidence, 2)))
 
-    def _save_debate_log(self, result: DebateResult):
-        """Save debate log to markdown file"""
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        log_path = self.output_dir / f"{self.module_name}_debate.md"
-
-        with open(log_path, 'w') as f:
-            f.write(f"# Debate Log: {self.module_name}\n\n")
-            f.write(f"**Outcome:** {result.outcome.value}\n")
-            f.write(f"**Total Rounds:** {result.total_rounds}\n")
-            f.write(f"**Confidence:** {result.confidence}\n\n")
-            f.write("---\n\n")
-
-            for round_data in result.rounds:
-                f.write(f"## Round {round_data.round_number}\n\n")
-                f.write(f"**Timestamp:** {round_data.timestamp}\n\n")
-
-                f.write("### Challenges\n\n")
-                if round_data.challenges:
-                    for c in round_data.challenges:
-                        if isinstance(c, dict):
-                            f.write(f"- **[{c.get('challenger', 'Unknown')}]** ({c.get('severity', 'N/A')}): {c.get('issue', 'N/A')}\n")
-                else:
-                    f.write("No challenges raised.\n")
-
-                f.write("\n### Responses\n\n")
-                if round_data.responses:
-                    for r in round_data.responses:
-                        if isinstance(r, dict):
-                            status = "Addressed" if r.get('addressed') else "Not Addressed"
-                            f.write(f"- **{status}**: {r.get('explanation', 'N/A')}\n")
+    def _log_round(self, round_result: DebateRound, started: float):
+        """Queue a round record on the event log (written by the background writer)"""
+        self.event_log.emit(
+            "debate_round",
+            debate_id=self.debate_id,
+            module=self.module_name,
+            commodity=self.commodity,
+            round=round_result.round_number,
+            timestamp=round_result.timestamp,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            challenges=round_result.challenges,
+            responses=round_result.responses,
+            outcome=round_result.outcome,
+            changes=len(round_result.analysis_delta["set"]) + len(round_result.analysis_delta["unset"]),
+        )
+
+    def _log_result(self, result: DebateResult, started: float):
+        self.event_log.emit(
+            "debate_result",
+            debate_id=self.debate_id,
+            module=self.module_name,
+            commodity=self.commodity,
+            output_dir=str(self.output_dir),
+            outcome=result.outcome.value,
+            total_rounds=result.total_rounds,
+            confidence=result.confidence,
+            escalated_to=result.escalated_to,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+            rules_evaluated=self.rule_memo.get("evaluated", 0),
+            rules_cached=self.rule_memo.get("cached", 0),
+        )
+
+
+# =========================================
+# Supervisor rules
+# =========================================
+# Rule specs are compiled once into closures; a checker is then a list of
+# (fingerprint, check) closure pairs, the check returning a Challenge or
+# None. The fingerprint captures exactly what the check reads, so a debate
+# can skip re-evaluating rules whose inputs did not change between rounds.
+# Fields may be dotted paths into nested analysis dicts ("trend_analysis.score").
+
+CompiledRule = tuple  # (fingerprint(analysis) -> hashable or None, check(analysis) -> Optional[Challenge])
+
+
+def compile_path(path: str) -> Callable[[Dict], Any]:
+    """Getter for a (possibly dotted) field path; None when any level is missing"""
+    keys = path.split(".")
+    if len(keys) == 1:
+        key = keys[0]
+        return lambda analysis: analysis.get(key)
+    if len(keys) == 2:
+        outer, inner = keys
+
+        def get_two(analysis: Dict) -> Any:
+            node = analysis.get(outer)
+            return node.get(inner) if isinstance(node, dict) else None
+        return get_two
+
+    def get_nested(analysis: Dict) -> Any:
+        node = analysis
+        for key in keys:
+            node = node.get(key, _MISSING) if isinstance(node, dict) else _MISSING
+            if node is _MISSING:
+                return None
+        return node
+    return get_nested
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable snapshot of a JSON-like value"""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _compile_logic_rule(rule: Dict) -> Optional[CompiledRule]:
+    field_path = rule.get("field")
+    condition = rule.get("condition")
+    message = rule.get("message")
+    severity = rule.get("severity", "medium")
+
+    if condition == "required":
+        get = compile_path(field_path)
+        issue = message or f"Missing required field: {field_path}"
+        action = f"Provide value for {field_path}"
+
+        def required(analysis: Dict) -> Optional[Challenge]:
+            if get(analysis) is None:
+                return Challenge("SUP-A", "logic", issue, severity, action)
+            return None
+        return (lambda analysis: get(analysis) is None), required
+
+    if condition == "consistency" and callable(rule.get("check")):
+        check = rule["check"]
+        # Arbitrary checks are only memoized when they declare the fields they read
+        readers = [compile_path(path) for path in rule.get("reads", [])]
+        fingerprint = (lambda analysis: tuple(_freeze(r(analysis)) for r in readers)) if readers else None
+        issue = message or f"Consistency check failed for {field_path}"
+        action = rule.get("action", "Review and correct")
+
+        def consistency(analysis: Dict) -> Optional[Challenge]:
+            if not check(analysis):
+                return Challenge("SUP-A", "logic", issue, severity, action)
+            return None
+        return fingerprint, consistency
+
+    if condition not in ("required", "consistency"):
+        print(f"[Debate] Ignoring logic rule with unknown condition {condition!r} ({field_path})")
+    return None
+
+
+def _compile_validation(validation: Dict) -> Optional[CompiledRule]:
+    field_path = validation.get("field")
+    vtype = validation.get("type")
+    message = validation.get("message")
+    severity = validation.get("severity", "medium")
+
+    if vtype == "range":
+        get = compile_path(field_path)
+        min_val = validation.get("min")
+        max_val = validation.get("max")
+        action = f"Verify {field_path} value"
+
+        def in_range(analysis: Dict) -> Optional[Challenge]:
+            value = get(analysis)
+            if value is None:
+                return None
+            if min_val is not None and value < min_val:
+                return Challenge("SUP-B", "data", message or f"{field_path} below minimum ({value} < {min_val})",
+                                 severity, action)
+            if max_val is not None and value > max_val:
+                return Challenge("SUP-B", "data", message or f"{field_path} above maximum ({value} > {max_val})",
+                                 severity, action)
+            return None
+        return (lambda analysis: _freeze(get(analysis))), in_range
+
+    if vtype == "source":
+        required = list(validation.get("required_sources") or [])
+        if not required:
+            return None  # nothing to check
+        get = compile_path(field_path or "sources")
+
+        def has_sources(analysis: Dict) -> Optional[Challenge]:
+            sources = get(analysis) or []
+            missing = [s for s in required if s not in sources]
+            if missing:
+                return Challenge("SUP-B", "data", f"Missing data sources: {missing}", severity,
+                                 "Add missing data sources")
+            return None
+        return (lambda analysis: _freeze(get(analysis))), has_sources
+
+    print(f"[Debate] Ignoring validation rule with unknown type {vtype!r} ({field_path})")
+    return None
+
+
+class CompiledChecker:
+    """A supervisor: compiled rules applied to an analysis, returning the Challenges raised"""
+
+    def __init__(self, rules: List[CompiledRule]):
+        self.rules = rules
+
+    def __call__(self, analysis: Dict) -> List[Challenge]:
+        return [c for c in (check(analysis) for _, check in self.rules) if c is not None]
+
+    def evaluate(self, analysis: Dict, memo: Dict) -> List[Challenge]:
+        """
+        Same as calling the checker, but a rule whose input fingerprint is
+        unchanged since the last evaluation with this memo reuses its outcome.
+        memo is owned by the caller (one per debate); it also counts hits.
+        """
+        return self.evaluate_many([analysis], [memo])[0]
+
+    def evaluate_many(self, analyses: List[Dict], memos: List[Dict]) -> List[List[Challenge]]:
+        """
+        evaluate() over many analyses sharing this checker, rule-major: each
+        rule's closures are looked up once and applied to every analysis.
+        """
+        challenges: List[List[Challenge]] = [[] for _ in analyses]
+        for i, (fingerprint, check) in enumerate(self.rules):
+            key = (id(self), i)
+            for found, analysis, memo in zip(challenges, analyses, memos):
+                if fingerprint is None:
+                    outcome = check(analysis)
+                    memo["evaluated"] = memo.get("evaluated", 0) + 1
                 else:
-                    f.write("No responses needed.\n")
+                    value = fingerprint(analysis)
+                    cached = memo.get(key)
+                    if cached is not None and cached[0] == value:
+                        outcome = cached[1]
+                        memo["cached"] = memo.get("cached", 0) + 1
+                    else:
+                        outcome = check(analysis)
+                        memo[key] = (value, outcome)
+                        memo["evaluated"] = memo.get("evaluated", 0) + 1
+                if outcome is not None:
+                    found.append(outcome)
+        return challenges
 
-                f.write(f"\n**Round Outcome:** {round_data.outcome}\n\n")
-                f.write("---\n\n")
+    def __len__(self) -> int:
+        return len(self.rules)
 
 
 def create_logic_checker(rules: List[Dict]) -> Callable[[Dict], List[Challenge]]:
@@ -252,39 +530,7 @@ def create_logic_checker(rules: List[Dict]) -> Callable[[Dict], List[Challenge]]
     Returns:
         Function that checks analysis against logic rules
     """
-    def check_logic(analysis: Dict) -> List[Challenge]:
-        challenges = []
-
-        for rule in rules:
-            field = rule.get("field")
-            condition = rule.get("condition")
-            message = rule.get("message")
-            severity = rule.get("severity", "medium")
-
-            value = analysis.get(field)
-
-            if condition == "required" and value is None:
-                challenges.append(Challenge(
-                    challenger="SUP-A",
-                    challenge_type="logic",
-                    issue=message or f"Missing required field: {field}",
-                    severity=severity,
-                    suggested_action=f"Provide value for {field}"
-                ))
-
-            elif condition == "consistency" and callable(rule.get("check")):
-                if not rule["check"](analysis):
-                    challenges.append(Challenge(
-                        challenger="SUP-A",
-                        challenge_type="logic",
-                        issue=message or f"Consistency check failed for {field}",
-                        severity=severity,
-                        suggested_action=rule.get("action", "Review and correct")
-                    ))
-
-        return challenges
-
-    return check_logic
+    return CompiledChecker([c for c in map(_compile_logic_rule, rules) if c is not None])
 
 
 def create_data_validator(validations: List[Dict]) -> Callable[[Dict], List[Challenge]]:
@@ -297,50 +543,4 @@ def create_data_validator(validations: List[Dict]) -> Callable[[Dict], List[Chal
     Returns:
         Function that validates data in analysis
     """
-    def validate_data(analysis: Dict) -> List[Challenge]:
-        challenges = []
-
-        for validation in validations:
-            field = validation.get("field")
-            vtype = validation.get("type")
-            message = validation.get("message")
-            severity = validation.get("severity", "medium")
-
-            value = analysis.get(field)
-
-            if vtype == "range" and value is not None:
-                min_val = validation.get("min")
-                max_val = validation.get("max")
-                if min_val is not None and value < min_val:
-                    challenges.append(Challenge(
-                        challenger="SUP-B",
-                        challenge_type="data",
-                        issue=message or f"{field} below minimum ({value} < {min_val})",
-                        severity=severity,
-                        suggested_action=f"Verify {field} value"
-                    ))
-                if max_val is not None and value > max_val:
-                    challenges.append(Challenge(
-                        challenger="SUP-B",
-                        challenge_type="data",
-                        issue=message or f"{field} above maximum ({value} > {max_val})",
-                        severity=severity,
-                        suggested_action=f"Verify {field} value"
-                    ))
-
-            elif vtype == "source" and validation.get("required_sources"):
-                sources = analysis.get("sources", [])
-                required = validation["required_sources"]
-                missing = [s for s in required if s not in sources]
-                if missing:
-                    challenges.append(Challenge(
-                        challenger="SUP-B",
-                        challenge_type="data",
-                        issue=f"Missing data sources: {missing}",
-                        severity=severity,
-                        suggested_action="Add missing data sources"
-                    ))
-
-        return challenges
-
-    return validate_data
+    return CompiledChecker([c for c in map(_compile_validation, validations) if c is not None])
@@ -0,0 +1,123 @@
+"""
+Near-Duplicate Headline Clustering
+MinHash signatures over word-bigram shingles of normalized headlines, with
+LSH banding to find candidate pairs in near-linear time. Candidates whose
+estimated Jaccard similarity clears the threshold are merged (union-find),
+so a story syndicated across outlets becomes one cluster whose breadth is
+kept as a separate signal.
+"""
+
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16                    # 16 bands x 4 rows: ~50% similarity is the LSH midpoint
+SIMILARITY_THRESHOLD = 0.5
+SHINGLE_SIZE = 2
+
+# Universal hashing (a * h + b) mod p over 32-bit token hashes; a < 2^31 keeps it in uint64
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240601)  # fixed: signatures must be stable across runs
+_PERM_A = _rng.integers(1, 1 << 31, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64)
+
+# "Headline text - Outlet" (Google News style)
+_OUTLET_SUFFIX = re.compile(r"\s+[-|]\s+([^-|]{2,60})$")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def split_outlet(title: str) -> Tuple[str, Optional[str]]:
+    """Headline without a trailing ' - Outlet' and the outlet name (if any)"""
+    match = _OUTLET_SUFFIX.search(title or "")
+    if not match:
+        return title or "", None
+    return title[:match.start()], match.group(1).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Word n-gram shingles of lowercased alphanumeric tokens"""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def minhash(tokens: List[str]) -> np.ndarray:
+    """(NUM_PERM,) MinHash signature; all-max for an empty token set"""
+    if not tokens:
+        return np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    hashes = np.array(sorted({zlib.crc32(t.encode("utf-8")) for t in tokens}), dtype=np.uint64)
+    values = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _PRIME
+    return values.min(axis=1)
+
+
+def signatures(texts: List[str]) -> np.ndarray:
+    """(N, NUM_PERM) MinHash signatures of normalized headlines"""
+    if not texts:
+        return np.empty((0, NUM_PERM), dtype=np.uint64)
+    return np.stack([minhash(shingles(split_outlet(t)[0])) for t in texts])
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster(
+    texts: List[str],
+    bands: int = BANDS,
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> List[List[int]]:
+    """
+    Groups of near-duplicate texts (indices, input order kept within and
+    across clusters). Only LSH-bucket collisions are compared.
+    """
+    sigs = signatures(texts)
+    n = len(texts)
+    parent = list(range(n))
+    rows = NUM_PERM // bands
+    empty = np.all(sigs == np.iinfo(np.uint64).max, axis=1) if n else np.array([], dtype=bool)
+
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        block = np.ascontiguousarray(sigs[:, band * rows:(band + 1) * rows])
+        for i in range(n):
+            if not empty[i]:
+                buckets.setdefault(block[i].tobytes(), []).append(i)
+        for members in buckets.values():
+            for j, first in enumerate(members):
+                for other in members[j + 1:]:
+                    root_a, root_b = _find(parent, first), _find(parent, other)
+                    if root_a != root_b and np.mean(sigs[first] == sigs[other]) >= threshold:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(n):
+        groups.setdefault(_find(parent, i), []).append(i)
+    return list(groups.values())
+
+
+def collapse_duplicates(items: List[Dict]) -> List[Dict]:
+    """
+    One item per near-duplicate cluster (its first member), annotated with
+    syndication breadth: the number of distinct outlets/links carrying it.
+    """
+    clusters = cluster([item.get("title", "") for item in items])
+    collapsed = []
+    for members in clusters:
+        representative = dict(items[members[0]])
+        outlets = []
+        for i in members:
+            outlet = split_outlet(items[i].get("title", ""))[1] or items[i].get("source") or items[i].get("link")
+            if outlet and outlet not in outlets:
+                outlets.append(outlet)
+        links = {items[i].get("link") or items[i].get("title") for i in members}
+        representative["syndication"] = max(len(outlets), len(links), 1)
+        representative["syndicated_by"] = outlets[:10]
+        collapsed.append(representative)
+    return collapsed
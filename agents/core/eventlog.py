@@ -0,0 +1,241 @@
+"""
+Event Log
+Structured JSONL event log (debate rounds and results, pipeline events).
+Callers only enqueue a record; one background thread writes the lines in
+batches and fsyncs at most once per FSYNC_INTERVAL, so TM threads never
+block on file I/O. The markdown views (per-module debate logs, log.md
+session entries) are rendered from the records on demand.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .data_fetch import PROJECT_ROOT
+
+EVENTS_PATH = PROJECT_ROOT / "logs" / "events.jsonl"
+
+FSYNC_INTERVAL = 1.0          # seconds between fsyncs while events keep arriving
+BATCH_SIZE = 512              # records written per wake-up at most
+FLUSH_TIMEOUT = 30.0          # seconds flush() waits for a live but stuck writer
+
+_STOP = object()
+
+
+class EventLog:
+    """Append-only JSONL log with a single buffered background writer"""
+
+    def __init__(self, path: Path = None):
+        self.path = path or EVENTS_PATH
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._error: Optional[Exception] = None   # set when the writer died
+
+    def emit(self, event_type: str, **fields):
+        """Queue one record (non-blocking; dropped once the writer has failed)"""
+        if self._error is not None:
+            return
+        if self._thread is None:
+            self._start()
+        self._queue.put({"type": event_type, "ts": datetime.now().isoformat(timespec="milliseconds"), **fields})
+
+    def flush(self) -> int:
+        """
+        Wait until everything queued so far is on disk; returns the file size.
+        Returns early if the writer is dead, or after FLUSH_TIMEOUT.
+        """
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            deadline = time.monotonic() + FLUSH_TIMEOUT
+            while not done.wait(min(FSYNC_INTERVAL, FLUSH_TIMEOUT)):
+                if not thread.is_alive() or time.monotonic() >= deadline:
+                    print(f"[EventLog] Flush gave up: {self._error or 'writer not responding'}")
+                    break
+        try:
+            return self.path.stat().st_size if self.path.exists() else 0
+        except OSError:
+            return 0
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            self._write_loop()
+        except Exception as e:
+            self._error = e
+            print(f"[EventLog] Writer stopped, events are no longer logged: {e}")
+            # Release anyone waiting in flush(); later records are dropped
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write_loop(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            last_sync = time.monotonic()
+            unsynced = False
+            while True:
+                try:
+                    batch = [self._queue.get(timeout=FSYNC_INTERVAL)]
+                except queue.Empty:
+                    if unsynced:
+                        os.fsync(f.fileno())
+                        unsynced, last_sync = False, time.monotonic()
+                    continue
+                while len(batch) < BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                records = [r for r in batch if isinstance(r, dict)]
+                waiters = [r for r in batch if isinstance(r, threading.Event)]
+                stop = any(r is _STOP for r in batch)
+                if records:
+                    f.write("".join(json.dumps(r, default=str) + "\n" for r in records))
+                    f.flush()
+                    unsynced = True
+                if unsynced and (waiters or stop or time.monotonic() - last_sync >= FSYNC_INTERVAL):
+                    os.fsync(f.fileno())
+                    unsynced, last_sync = False, time.monotonic()
+                for waiter in waiters:
+                    waiter.set()
+                if stop:
+                    return
+
+
+_default_log: Optional[EventLog] = None
+_default_lock = threading.Lock()
+
+
+def get_event_log() -> EventLog:
+    """Process-wide event log, flushed and closed at exit"""
+    global _default_log
+    with _default_lock:
+        if _default_log is None:
+            _default_log = EventLog()
+            atexit.register(_default_log.close)
+        return _default_log
+
+
+def read_events(path: Path = None, offset: int = 0, **match) -> Iterator[Dict]:
+    """Records from a byte offset on whose fields equal all `match` values"""
+    path = path or EVENTS_PATH
+    if not path.exists():
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        f.seek(offset)
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line after a crash
+            if all(record.get(k) == v for k, v in match.items()):
+                yield record
+
+
+# =========================================
+# Markdown views
+# =========================================
+
+def render_debate(records: List[Dict]) -> str:
+    """Debate log markdown from one debate's round and result records"""
+    result = next((r for r in records if r["type"] == "debate_result"), {})
+    lines = [
+        f"# Debate Log: {result.get('module', 'unknown')}\n",
+        f"**Outcome:** {result.get('outcome')}",
+        f"**Total Rounds:** {result.get('total_rounds')}",
+        f"**Confidence:** {result.get('confidence')}",
+        f"**Rule checks:** {result.get('rules_evaluated', 0)} evaluated, "
+        f"{result.get('rules_cached', 0)} unchanged inputs reused\n",
+        "---\n",
+    ]
+    for r in (r for r in records if r["type"] == "debate_round"):
+        lines.append(f"## Round {r['round']}\n")
+        lines.append(f"**Timestamp:** {r['timestamp']}  ")
+        lines.append(f"**Duration:** {r.get('duration_ms', 0):.1f} ms\n")
+
+        lines.append("### Challenges\n")
+        if r["challenges"]:
+            lines += [
+                f"- **[{c.get('challenger', 'Unknown')}]** ({c.get('severity', 'N/A')}): {c.get('issue', 'N/A')}"
+                for c in r["challenges"]
+            ]
+        else:
+            lines.append("No challenges raised.")
+
+        lines.append("\n### Responses\n")
+        if r["responses"]:
+            lines += [
+                f"- **{'Addressed' if resp.get('addressed') else 'Not Addressed'}**: {resp.get('explanation', 'N/A')}"
+                for resp in r["responses"]
+            ]
+        else:
+            lines.append("No responses needed.")
+
+        lines.append(f"\n**Round Outcome:** {r['outcome']}\n")
+        lines.append("---\n")
+    return "\n".join(lines)
+
+
+def write_debate_views(offset: int = 0, path: Path = None) -> List[Path]:
+    """
+    Write <output_dir>/<module>_debate.md for the last debate of every
+    module/commodity logged after `offset`
+    """
+    debates: Dict[str, List[Dict]] = {}
+    latest: Dict[tuple, str] = {}
+    for record in read_events(path, offset):
+        if record["type"] in ("debate_round", "debate_result"):
+            debates.setdefault(record["debate_id"], []).append(record)
+            if record["type"] == "debate_result":
+                latest[(record["output_dir"], record["module"])] = record["debate_id"]
+
+    written = []
+    for (output_dir, module), debate_id in latest.items():
+        target = Path(output_dir) / f"{module}_debate.md"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'w') as f:
+            f.write(render_debate(debates[debate_id]))
+        written.append(target)
+    return written
+
+
+def render_session(records: List[Dict]) -> str:
+    """log.md entries for one session's pipeline records"""
+    entry = ""
+    for r in records:
+        if r["type"] == "session_start":
+            entry += f"\n## Session: {r['ts'][:10]}\n"
+        elif r["type"] == "pipeline":
+            entry += f"\n### [{r['ts'][11:16]}] {r['action']}\n"
+            entry += f"- **Agent:** {r['agent']}\n"
+            entry += f"- **Action:** {r['action']}\n"
+            entry += f"- **Status:** {r['status']}\n"
+            if r.get("notes"):
+                entry += f"- **Notes:** {r['notes']}\n"
+    return entry
@@ -0,0 +1,101 @@
+"""
+History Arrays
+Turns the DataFetcher history payloads into NumPy arrays so the analytics
+engines (backtest, sweep, ...) can work on full history in one pass.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .data_fetch import DataFetcher
+
+# CFTC reports are as-of Tuesday and published on Friday
+COT_RELEASE_LAG_DAYS = 3
+
+PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
+COT_FIELDS = [
+    "open_interest",
+    "managed_money_long", "managed_money_short",
+    "producer_long", "producer_short",
+    "swap_long", "swap_short",
+    "other_reportable_long", "other_reportable_short",
+]
+
+
+def price_arrays(price_history: Dict) -> Optional[Dict[str, np.ndarray]]:
+    """Convert a price payload ({"prices": [...]}) into column arrays"""
+    prices = [p for p in price_history.get("prices", []) if p.get("close")]
+    if not prices:
+        return None
+
+    arrays = {"dates": np.array([p["date"] for p in prices], dtype="datetime64[D]")}
+    for name in PRICE_FIELDS:
+        arrays[name] = np.array(
+            [p.get(name) if p.get(name) is not None else np.nan for p in prices],
+            dtype=float,
+        )
+    return arrays
+
+
+def cot_arrays(cot_history: Dict) -> Optional[Dict[str, np.ndarray]]:
+    """Convert a COT history payload into column arrays (plus net positions)"""
+    records = cot_history.get("records", [])
+    if not records:
+        return None
+
+    arrays = {"dates": np.array([r["date"] for r in records], dtype="datetime64[D]")}
+    for name in COT_FIELDS:
+        arrays[name] = np.array([r.get(name, 0) or 0 for r in records], dtype=float)
+
+    arrays["managed_money_net"] = arrays["managed_money_long"] - arrays["managed_money_short"]
+    arrays["producer_net"] = arrays["producer_long"] - arrays["producer_short"]
+    arrays["swap_net"] = arrays["swap_long"] - arrays["swap_short"]
+    arrays["other_reportable_net"] = arrays["other_reportable_long"] - arrays["other_reportable_short"]
+    return arrays
+
+
+def align_to_dates(
+    source_dates: np.ndarray,
+    values: np.ndarray,
+    target_dates: np.ndarray,
+    lag_days: int = 0,
+) -> np.ndarray:
+    """
+    Forward-fill a sparse series (e.g. weekly COT) onto daily target dates.
+    A value dated d becomes visible on d + lag_days, so no look-ahead.
+    """
+    visible = source_dates + np.timedelta64(lag_days, "D")
+    idx = np.searchsorted(visible, target_dates, side="right") - 1
+    out = np.full(len(target_dates), np.nan)
+    valid = idx >= 0
+    out[valid] = values[idx[valid]]
+    return out
+
+
+def load_universe(
+    commodities: List[str] = None,
+    force_refresh: bool = False,
+    with_cot: bool = True,
+) -> Dict[str, Dict]:
+    """
+    Load full price (and optionally COT) history for each commodity.
+
+    Returns:
+        {commodity: {"prices": {...arrays}, "cot": {...arrays} or None}}
+        Commodities without price history are skipped.
+    """
+    commodities = commodities or list(DataFetcher.COMMODITY_SYMBOLS)
+    universe = {}
+
+    for commodity in commodities:
+        fetcher = DataFetcher(commodity, force_refresh=force_refresh)
+        prices = price_arrays(fetcher.fetch_price_history())
+        if prices is None:
+            print(f"[History] No price history for {commodity}, skipping")
+            continue
+
+        cot = cot_arrays(fetcher.fetch_cot_history()) if with_cot else None
+        universe[commodity] = {"prices": prices, "cot": cot}
+
+    return universe
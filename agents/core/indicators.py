@@ -0,0 +1,126 @@
+"""
+Vectorized Indicators
+Array versions of the indicators used by the Task Managers, computed for
+every date of a series at once (NumPy). Each function returns an array the
+same length as its input, with NaN where the lookback is not yet filled.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _pad_front(values: np.ndarray, length: int) -> np.ndarray:
+    """Left-pad a windowed result with NaN back to the input length"""
+    out = np.full(length, np.nan)
+    if len(values):
+        out[length - len(values):] = values
+    return out
+
+
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling sum (cumsum based)"""
+    x = np.asarray(x, dtype=float)
+    if window <= 0 or len(x) < window:
+        return np.full(len(x), np.nan)
+    csum = np.cumsum(np.insert(x, 0, 0.0))
+    return _pad_front(csum[window:] - csum[:-window], len(x))
+
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing simple moving average"""
+    return rolling_sum(x, window) / window
+
+
+def nan_rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean along the last axis of a 1-D or 2-D array; NaN unless the
+    whole window has data.
+    """
+    x = np.asarray(x, dtype=float)
+    valid = ~np.isnan(x)
+    filled = np.where(valid, x, 0.0)
+    pad = [(0, 0)] * (x.ndim - 1) + [(1, 0)]
+    csum = np.cumsum(np.pad(filled, pad), axis=-1)
+    count = np.cumsum(np.pad(valid.astype(float), pad), axis=-1)
+    out = np.full(x.shape, np.nan)
+    if x.shape[-1] < window:
+        return out
+    sums = csum[..., window:] - csum[..., :-window]
+    counts = count[..., window:] - count[..., :-window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[..., window - 1:] = np.where(counts == window, sums / counts, np.nan)
+    return out
+
+
+def rolling_std(x: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Trailing rolling standard deviation"""
+    x = np.asarray(x, dtype=float)
+    if len(x) < window or window <= ddof:
+        return np.full(len(x), np.nan)
+    std = np.std(sliding_window_view(x, window), axis=-1, ddof=ddof)
+    return _pad_front(std, len(x))
+
+
+def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling maximum"""
+    x = np.asarray(x, dtype=float)
+    if len(x) < window:
+        return np.full(len(x), np.nan)
+    return _pad_front(sliding_window_view(x, window).max(axis=-1), len(x))
+
+
+def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing rolling minimum"""
+    x = np.asarray(x, dtype=float)
+    if len(x) < window:
+        return np.full(len(x), np.nan)
+    return _pad_front(sliding_window_view(x, window).min(axis=-1), len(x))
+
+
+def rolling_percentile(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    Percentile rank (0-100) of each value within its trailing window,
+    using the same count-less-than definition as the COT snapshot.
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) < window:
+        return np.full(len(x), np.nan)
+    windows = sliding_window_view(x, window)
+    ranks = (windows < windows[:, -1:]).sum(axis=-1) / window * 100
+    return _pad_front(ranks, len(x))
+
+
+def rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """Simple-average RSI, matching calculate_technical_indicators()"""
+    closes = np.asarray(closes, dtype=float)
+    if len(closes) < period + 1:
+        return np.full(len(closes), np.nan)
+    change = np.diff(closes)
+    avg_gain = rolling_mean(np.maximum(change, 0), period)
+    avg_loss = rolling_mean(np.maximum(-change, 0), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    values[np.isnan(avg_gain)] = np.nan
+    return np.concatenate([[np.nan], values])
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Daily true range (first bar uses high - low)"""
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    ranges = np.vstack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    return np.nanmax(ranges, axis=0)
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Simple-average true range"""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def forward_returns(closes: np.ndarray, horizon: int) -> np.ndarray:
+    """Simple return from each date to `horizon` bars later (NaN at the tail)"""
+    closes = np.asarray(closes, dtype=float)
+    out = np.full(len(closes), np.nan)
+    if horizon < len(closes):
+        out[:-horizon] = closes[horizon:] / closes[:-horizon] - 1
+    return out
@@ -0,0 +1,56 @@
+"""
+Keyword Matcher
+Compiled multi-group keyword matcher (news categories, sentiment words,
+geopolitical terms, ...). Built once per keyword set and reused: keywords
+are lowercased and de-duplicated across groups up front, and each article
+is lowercased and scanned once, returning the hits of every group together.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive multi-group substring matcher.
+    Same semantics as `keyword.lower() in text.lower()` for every keyword.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups = {name: [kw.lower() for kw in keywords if kw] for name, keywords in groups.items()}
+        owners: Dict[str, List[str]] = {}
+        for name, keywords in self.groups.items():
+            for keyword in keywords:
+                if name not in owners.setdefault(keyword, []):
+                    owners[keyword].append(name)
+        # One substring test per distinct keyword, whatever the number of groups it feeds
+        self._keywords: List[str] = list(owners)
+        self._owners: Dict[str, Tuple[str, ...]] = {kw: tuple(names) for kw, names in owners.items()}
+
+    def match(self, text: str) -> Dict[str, Set[str]]:
+        """Distinct keywords found per group"""
+        text = text.lower()
+        found = {name: set() for name in self.groups}
+        for keyword in [kw for kw in self._keywords if kw in text]:
+            for name in self._owners[keyword]:
+                found[name].add(keyword)
+        return found
+
+    def match_article(self, item: Dict) -> Dict[str, Set[str]]:
+        """Hits per group in an article's title + description (one scan)"""
+        return self.match((item.get("title", "") or "") + " " + (item.get("description", "") or ""))
+
+
+@lru_cache(maxsize=32)
+def _compiled(frozen: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> KeywordMatcher:
+    return KeywordMatcher(dict(frozen))
+
+
+def get_matcher(groups: Dict[str, Iterable[str]]) -> KeywordMatcher:
+    """Matcher for a keyword set, compiled once and reused for identical sets"""
+    return _compiled(tuple(sorted((name, tuple(keywords)) for name, keywords in groups.items())))
+
+
+def match_articles(items: List[Dict], matcher: KeywordMatcher) -> List[Dict[str, Set[str]]]:
+    """match_article for a batch of stored articles"""
+    return [matcher.match_article(item) for item in items]
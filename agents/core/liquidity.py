@@ -0,0 +1,133 @@
+"""
+Liquidity Estimators
+Daily liquidity measures from OHLCV arrays: Amihud illiquidity, Roll
+implied spread, Corwin-Schultz high-low spread and dollar volume. Each is
+smoothed over a rolling window and ranked against its own history; all of
+them come out of one vectorized pass per symbol.
+"""
+
+import warnings
+from typing import Dict, List
+
+import numpy as np
+
+from .indicators import nan_rolling_mean
+from .volatility import rolling_percentile_rank
+
+DEFAULT_WINDOW = 20
+PERCENTILE_LOOKBACK = 252
+
+# Higher = less liquid; dollar volume is inverted when combined
+ILLIQUIDITY_MEASURES = ["amihud", "roll_spread_pct", "cs_spread_pct"]
+
+
+def amihud(close: np.ndarray, volume: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """Mean |return| per million of traded notional (close x volume)"""
+    close, volume = np.asarray(close, dtype=float), np.asarray(volume, dtype=float)
+    ret = np.full(close.shape, np.nan)
+    ret[..., 1:] = np.abs(np.diff(close, axis=-1) / close[..., :-1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(volume > 0, ret / (close * volume) * 1e6, np.nan)
+    return nan_rolling_mean(ratio, window)
+
+
+def roll_spread(close: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """
+    Roll (1984) implied spread in % of price: 2 * sqrt(-cov(r_t, r_t-1)).
+    Zero where the serial covariance is positive.
+    """
+    close = np.asarray(close, dtype=float)
+    ret = np.full(close.shape, np.nan)
+    ret[..., 1:] = np.diff(np.log(close), axis=-1)
+    lagged = np.full(close.shape, np.nan)
+    lagged[..., 1:] = ret[..., :-1]
+
+    mean_xy = nan_rolling_mean(ret * lagged, window)
+    mean_x = nan_rolling_mean(ret, window)
+    mean_y = nan_rolling_mean(lagged, window)
+    cov = (mean_xy - mean_x * mean_y) * window / (window - 1)
+    return 2 * np.sqrt(np.clip(-cov, 0, None)) * 100
+
+
+def corwin_schultz(high: np.ndarray, low: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """
+    Corwin-Schultz (2012) high-low spread estimator in % of price, from each
+    pair of consecutive bars (negative estimates set to zero), averaged.
+    """
+    high, low = np.asarray(high, dtype=float), np.asarray(low, dtype=float)
+    hl = np.log(high / low) ** 2
+    beta = np.full(high.shape, np.nan)
+    gamma = np.full(high.shape, np.nan)
+    beta[..., 1:] = hl[..., 1:] + hl[..., :-1]
+    pair_high = np.maximum(high[..., 1:], high[..., :-1])
+    pair_low = np.minimum(low[..., 1:], low[..., :-1])
+    gamma[..., 1:] = np.log(pair_high / pair_low) ** 2
+
+    k = 3 - 2 * np.sqrt(2)
+    alpha = (np.sqrt(2 * beta) - np.sqrt(beta)) / k - np.sqrt(gamma / k)
+    spread = 2 * (np.exp(alpha) - 1) / (1 + np.exp(alpha))
+    spread = np.where(np.isnan(spread), np.nan, np.clip(spread, 0, None))
+    return nan_rolling_mean(spread, window) * 100
+
+
+def dollar_volume(close: np.ndarray, volume: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """Mean daily traded notional (close x contracts, no multiplier)"""
+    close, volume = np.asarray(close, dtype=float), np.asarray(volume, dtype=float)
+    return nan_rolling_mean(np.where(volume > 0, close * volume, np.nan), window)
+
+
+def liquidity_panel(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+    window: int = DEFAULT_WINDOW, lookback: int = PERCENTILE_LOOKBACK,
+) -> Dict[str, np.ndarray]:
+    """
+    All estimators, their historical percentiles and a combined
+    illiquidity percentile (mean of the available measures).
+    """
+    measures = {
+        "amihud": amihud(close, volume, window),
+        "roll_spread_pct": roll_spread(close, window),
+        "cs_spread_pct": corwin_schultz(high, low, window),
+        "dollar_volume": dollar_volume(close, volume, window),
+    }
+    lookback = min(lookback, np.shape(close)[-1])
+    percentiles = {f"{name}_percentile": rolling_percentile_rank(values, lookback) for name, values in measures.items()}
+
+    stacked = np.stack(
+        [percentiles[f"{name}_percentile"] for name in ILLIQUIDITY_MEASURES]
+        + [100 - percentiles["dollar_volume_percentile"]]
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN columns during warm-up
+        combined = np.nanmean(stacked, axis=0)
+
+    return {**measures, **percentiles, "illiquidity_percentile": combined}
+
+
+def latest_liquidity(prices: List[Dict], window: int = DEFAULT_WINDOW) -> Dict:
+    """Current liquidity snapshot for a Task Manager's price list"""
+    rows = [p for p in prices if p.get("close")]
+    if len(rows) < window + 2:
+        return {"error": "Insufficient data for liquidity estimators"}
+
+    def col(name):
+        return np.array([p.get(name) if p.get(name) is not None else np.nan for p in rows], dtype=float)
+
+    panel = liquidity_panel(col("high"), col("low"), col("close"), col("volume"), window)
+
+    def last(name, digits=4):
+        value = panel[name][-1]
+        return None if np.isnan(value) else round(float(value), digits)
+
+    return {
+        "window_days": window,
+        "amihud": last("amihud", 6),
+        "roll_spread_pct": last("roll_spread_pct"),
+        "cs_spread_pct": last("cs_spread_pct"),
+        "dollar_volume": last("dollar_volume", 0),
+        "amihud_percentile": last("amihud_percentile", 1),
+        "roll_spread_pct_percentile": last("roll_spread_pct_percentile", 1),
+        "cs_spread_pct_percentile": last("cs_spread_pct_percentile", 1),
+        "dollar_volume_percentile": last("dollar_volume_percentile", 1),
+        "illiquidity_percentile": last("illiquidity_percentile", 1),
+    }
@@ -0,0 +1,173 @@
+"""
+Open Interest Percentile Engine
+Rolling order statistics over open-interest history. A Fenwick tree over
+the compressed value ranks holds the current window, so the percentile of
+each new observation within the last N days costs O(log n) per step over
+the whole history. Also tests whether 5-day OI changes are significant.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+OI_LOOKBACK_DAYS = 365
+CHANGE_DAYS = 7               # 5 trading days
+SIGNIFICANCE_Z = 2.0
+
+
+class FenwickTree:
+    """Binary indexed tree of counts over value ranks 0..size-1"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, rank: int, delta: int = 1):
+        i = rank + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def count_below(self, rank: int) -> int:
+        """Number of stored values with rank < `rank`"""
+        total, i = 0, rank
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+def rolling_percentile_by_days(
+    dates: np.ndarray,
+    values: np.ndarray,
+    lookback_days: int = OI_LOOKBACK_DAYS,
+    min_periods: int = 10,
+) -> np.ndarray:
+    """
+    Percentile (0-100, count-less-than) of each value among the values dated
+    within the trailing `lookback_days`, itself included. Works on daily or
+    weekly series. NaN values are skipped; NaN until `min_periods` are held.
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    valid = ~np.isnan(values)
+    if not valid.any():
+        return out
+
+    # Coordinate-compress to ranks so the tree size is the number of distinct values
+    distinct, ranks = np.unique(values[valid], return_inverse=True)
+    rank_of = np.full(len(values), -1)
+    rank_of[valid] = ranks
+    tree = FenwickTree(len(distinct))
+
+    # Index of the first date still inside each date's window
+    starts = np.searchsorted(dates, dates - np.timedelta64(lookback_days - 1, "D"), side="left")
+
+    held, left = 0, 0
+    for i in range(len(values)):
+        while left < starts[i]:
+            if rank_of[left] >= 0:
+                tree.add(rank_of[left], -1)
+                held -= 1
+            left += 1
+        if rank_of[i] < 0:
+            continue
+        tree.add(rank_of[i])
+        held += 1
+        if held >= min_periods:
+            out[i] = tree.count_below(rank_of[i]) / held * 100
+    return out
+
+
+def change_over_days(dates: np.ndarray, values: np.ndarray, days: int = CHANGE_DAYS) -> np.ndarray:
+    """Percent change from the last value at least `days` calendar days earlier"""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    values = np.asarray(values, dtype=float)
+    prior = np.searchsorted(dates, dates - np.timedelta64(days, "D"), side="right") - 1
+    out = np.full(len(values), np.nan)
+    has_prior = prior >= 0
+    base = values[prior[has_prior]]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[has_prior] = np.where(base > 0, (values[has_prior] / base - 1) * 100, np.nan)
+    return out
+
+
+def change_significance(
+    dates: np.ndarray,
+    changes: np.ndarray,
+    lookback_days: int = OI_LOOKBACK_DAYS,
+    min_periods: int = 10,
+) -> Dict[str, np.ndarray]:
+    """
+    Z-score and percentile of each change against the changes in its
+    trailing window (prior observations only for the z-score).
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    changes = np.asarray(changes, dtype=float)
+    valid = ~np.isnan(changes)
+    filled = np.where(valid, changes, 0.0)
+
+    csum = np.concatenate([[0.0], np.cumsum(filled)])
+    csq = np.concatenate([[0.0], np.cumsum(filled ** 2)])
+    count = np.concatenate([[0], np.cumsum(valid)])
+    starts = np.searchsorted(dates, dates - np.timedelta64(lookback_days - 1, "D"), side="left")
+    idx = np.arange(len(changes))
+
+    # Window of prior observations [start, i)
+    n = count[idx] - count[starts]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (csum[idx] - csum[starts]) / n
+        var = ((csq[idx] - csq[starts]) - n * mean ** 2) / (n - 1)
+        z = (changes - mean) / np.sqrt(var)
+    z[(n < min_periods) | ~valid | ~(var > 0)] = np.nan
+
+    return {
+        "zscore": z,
+        "percentile": rolling_percentile_by_days(dates, changes, lookback_days, min_periods),
+        "significant": np.abs(np.nan_to_num(z)) >= SIGNIFICANCE_Z,
+    }
+
+
+def oi_statistics(
+    dates: np.ndarray,
+    open_interest: np.ndarray,
+    lookback_days: int = OI_LOOKBACK_DAYS,
+    change_days: int = CHANGE_DAYS,
+) -> Dict[str, np.ndarray]:
+    """OI percentile and change significance for every date of the history"""
+    oi = np.where(np.asarray(open_interest, dtype=float) > 0, open_interest, np.nan)
+    changes = change_over_days(dates, oi, change_days)
+    significance = change_significance(dates, changes, lookback_days)
+    return {
+        "dates": np.asarray(dates, dtype="datetime64[D]"),
+        "open_interest": oi,
+        "percentile": rolling_percentile_by_days(dates, oi, lookback_days),
+        "change_pct": changes,
+        "change_zscore": significance["zscore"],
+        "change_percentile": significance["percentile"],
+        "change_significant": significance["significant"],
+    }
+
+
+def latest_oi_snapshot(cot: Optional[Dict[str, np.ndarray]], lookback_days: int = OI_LOOKBACK_DAYS) -> Dict:
+    """Current OI percentile / change test from COT history arrays"""
+    if cot is None or not len(cot.get("open_interest", [])):
+        return {"error": "No open interest history"}
+
+    stats = oi_statistics(cot["dates"], cot["open_interest"], lookback_days)
+
+    def last(name, digits=1):
+        value = stats[name][-1]
+        return None if np.isnan(value) else round(float(value), digits)
+
+    return {
+        "as_of": str(stats["dates"][-1]),
+        "open_interest": last("open_interest", 0),
+        "percentile": last("percentile"),
+        "change_pct": last("change_pct", 2),
+        "change_zscore": last("change_zscore", 2),
+        "change_percentile": last("change_percentile"),
+        "change_significant": bool(stats["change_significant"][-1]),
+        "observations": int(np.sum(~np.isnan(stats["open_interest"]))),
+    }
@@ -0,0 +1,71 @@
+"""
+Module Parameters
+Default thresholds for the TM-TECH and TM-POS scoring rules, plus the
+per-commodity overrides written by the parameter sweep.
+Overrides live in data/processed/params/<commodity>.json.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+from .data_fetch import DATA_PROCESSED
+
+PARAMS_DIR = DATA_PROCESSED / "params"
+
+TECH_PARAMS = {
+    "ma_short": 20,
+    "ma_trend": 60,
+    "ma_long": 200,
+    "rsi_period": 14,
+    "rsi_overbought": 70,
+    "rsi_oversold": 30,
+    "level_window": 252,
+    "level_proximity_pct": 5,
+    "tech_weights": [0.4, 0.35, 0.25],
+}
+
+POS_PARAMS = {
+    "cta_windows": [20, 50, 200],
+    "cot_window": 52,
+    "cot_cutoffs": [20, 40, 60, 80],
+    "crowding_cutoffs": [15, 30, 70, 85],
+    "contrarian_cutoffs": [10, 20, 80, 90],
+    "pos_weights": [0.35, 0.25, 0.2, 0.2],
+}
+
+
+def params_path(commodity: str, params_dir: Path = None) -> Path:
+    """Path of the tuned-parameter file for a commodity"""
+    return (params_dir or PARAMS_DIR) / f"{commodity.lower().replace(' ', '_')}.json"
+
+
+def load_params(commodity: str, defaults: Dict, params_dir: Path = None) -> Dict:
+    """Defaults overlaid with any tuned values saved for this commodity"""
+    params = dict(defaults)
+    path = params_path(commodity, params_dir)
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                tuned = json.load(f).get("params", {})
+            params.update({k: v for k, v in tuned.items() if k in defaults})
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[Params] Ignoring unreadable {path.name}: {e}")
+    return params
+
+
+def save_params(commodity: str, params: Dict, meta: Dict = None, params_dir: Path = None) -> Path:
+    """Merge tuned values into the commodity's parameter file"""
+    path = params_path(commodity, params_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    existing = {}
+    if path.exists():
+        with open(path, 'r') as f:
+            existing = json.load(f)
+
+    existing.setdefault("params", {}).update(params)
+    existing.setdefault("history", []).append(meta or {})
+    with open(path, 'w') as f:
+        json.dump(existing, f, indent=2)
+    return path
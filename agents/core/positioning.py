@@ -0,0 +1,157 @@
+"""
+Positioning Analytics
+Rolling percentiles, z-scores and weekly deltas of the net position of
+every COT trader category over 1/3/5-year lookbacks. The full history of
+all categories (and of every commodity, when stacked) is computed in one
+vectorized pass; windows shorter than the lookback are used until enough
+weeks exist, so young histories still get a percentile.
+"""
+
+import warnings
+from typing import Dict, List, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Trader category -> net-position field in the COT arrays
+CATEGORIES = {
+    "managed_money": "managed_money_net",
+    "producer_merchant": "producer_net",
+    "swap_dealer": "swap_net",
+    "other_reportable": "other_reportable_net",
+}
+
+LOOKBACKS = {"1y": 52, "3y": 156, "5y": 260}
+MIN_WEEKS = 26
+
+
+def _trailing_windows(x: np.ndarray, lookback: int) -> np.ndarray:
+    """(..., T, lookback) trailing windows, front-padded with NaN"""
+    pad = [(0, 0)] * (x.ndim - 1) + [(lookback - 1, 0)]
+    return sliding_window_view(np.pad(x, pad, constant_values=np.nan), lookback, axis=-1)
+
+
+def rolling_stats(
+    x: np.ndarray,
+    lookback: int,
+    min_periods: int = MIN_WEEKS,
+) -> Dict[str, np.ndarray]:
+    """
+    Percentile (count-less-than, 0-100) and z-score of each value within
+    its trailing window, along the last axis. NaN-aware.
+    """
+    x = np.asarray(x, dtype=float)
+    windows = _trailing_windows(x, lookback)
+    valid = ~np.isnan(windows)
+    counts = valid.sum(axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        below = ((windows < x[..., None]) & valid).sum(axis=-1)
+        percentile = below / counts * 100
+        mean = np.nanmean(windows, axis=-1)
+        std = np.nanstd(windows, axis=-1, ddof=1)
+        zscore = (x - mean) / std
+
+    enough = (counts >= min(min_periods, lookback)) & ~np.isnan(x)
+    zscore[~enough | ~(std > 0)] = np.nan
+    percentile[~enough] = np.nan
+    return {"percentile": percentile, "zscore": zscore}
+
+
+def positioning_stats(
+    cot: Dict[str, np.ndarray],
+    lookbacks: Dict[str, int] = None,
+) -> Dict:
+    """
+    Net, weekly delta, % of OI, percentile and z-score per lookback for
+    every category over the full COT history.
+
+    Returns:
+        {"dates": ..., category: {"net", "delta", "pct_oi",
+         "percentile_1y", "zscore_1y", ...}}
+    """
+    lookbacks = lookbacks or LOOKBACKS
+    names = list(CATEGORIES)
+    nets = np.stack([cot.get(CATEGORIES[name], np.full(len(cot["dates"]), np.nan)) for name in names])
+    return {"dates": cot["dates"], **_category_stats(nets, cot.get("open_interest"), names, lookbacks)}
+
+
+def _category_stats(nets: np.ndarray, open_interest: Optional[np.ndarray],
+                    names: List[str], lookbacks: Dict[str, int]) -> Dict:
+    """Stats for a (..., categories, T) stack of net positions"""
+    delta = np.full(nets.shape, np.nan)
+    delta[..., 1:] = np.diff(nets, axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct_oi = nets / open_interest[..., None, :] * 100 if open_interest is not None else np.full(nets.shape, np.nan)
+
+    stats = {}
+    for label, weeks in lookbacks.items():
+        result = rolling_stats(nets, weeks)
+        stats[f"percentile_{label}"] = result["percentile"]
+        stats[f"zscore_{label}"] = result["zscore"]
+
+    axis = nets.ndim - 2
+    return {
+        name: {
+            "net": np.take(nets, i, axis=axis),
+            "delta": np.take(delta, i, axis=axis),
+            "pct_oi": np.take(pct_oi, i, axis=axis),
+            **{key: np.take(values, i, axis=axis) for key, values in stats.items()},
+        }
+        for i, name in enumerate(names)
+    }
+
+
+def universe_positioning(universe: Dict[str, Dict], lookbacks: Dict[str, int] = None) -> Dict[str, Dict]:
+    """positioning_stats for every commodity with COT data, stacked into one pass"""
+    lookbacks = lookbacks or LOOKBACKS
+    names = list(CATEGORIES)
+    commodities = [c for c, data in universe.items() if data.get("cot") is not None]
+    if not commodities:
+        return {}
+
+    length = max(len(universe[c]["cot"]["dates"]) for c in commodities)
+    nets = np.full((len(commodities), len(names), length), np.nan)
+    oi = np.full((len(commodities), length), np.nan)
+    for i, commodity in enumerate(commodities):
+        cot = universe[commodity]["cot"]
+        t = len(cot["dates"])
+        for j, name in enumerate(names):
+            if CATEGORIES[name] in cot:
+                nets[i, j, length - t:] = cot[CATEGORIES[name]]
+        oi[i, length - t:] = cot["open_interest"]
+
+    stacked = _category_stats(nets, oi, names, lookbacks)
+    results = {}
+    for i, commodity in enumerate(commodities):
+        t = len(universe[commodity]["cot"]["dates"])
+        results[commodity] = {"dates": universe[commodity]["cot"]["dates"]}
+        for name in names:
+            results[commodity][name] = {key: values[i, -t:] for key, values in stacked[name].items()}
+    return results
+
+
+def latest_positioning(cot: Optional[Dict[str, np.ndarray]], lookbacks: Dict[str, int] = None) -> Dict:
+    """Latest report's stats per category (None where not computable)"""
+    if cot is None or not len(cot.get("dates", [])):
+        return {"error": "No COT history"}
+
+    stats = positioning_stats(cot, lookbacks)
+
+    def last(values, digits=1):
+        value = values[-1]
+        return None if np.isnan(value) else round(float(value), digits)
+
+    categories = {}
+    for name in CATEGORIES:
+        category = stats[name]
+        categories[name] = {
+            key: (last(values, 0) if key in ("net", "delta") else last(values, 2 if key.startswith("zscore") else 1))
+            for key, values in category.items()
+        }
+    return {
+        "report_date": str(stats["dates"][-1]),
+        "weeks": len(stats["dates"]),
+        "categories": categories,
+    }
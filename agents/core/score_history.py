@@ -0,0 +1,186 @@
+"""
+Score History Store
+Append-only SQLite history of module and composite scores, keyed by
+(commodity, module, timestamp). The key is the table's clustered primary
+key, so range and as-of queries are index seeks rather than scans of old
+output files; every Task Manager run and every report adds a row.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .data_fetch import DATA_PROCESSED
+
+HISTORY_PATH = DATA_PROCESSED / "score_history.db"
+
+COMPOSITE = "composite"       # module name for the weighted overall score
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    commodity TEXT NOT NULL,
+    module TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    score REAL,
+    confidence REAL,
+    interpretation TEXT,
+    PRIMARY KEY (commodity, module, ts)
+) WITHOUT ROWID
+"""
+
+
+def _ts(value: Any = None) -> str:
+    """Fixed-width ISO timestamp so text order is time order (dates -> midnight)"""
+    if value is None:
+        value = datetime.now()
+    elif not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value))
+    return value.isoformat(timespec="microseconds")
+
+
+def _get(result: Any, name: str):
+    return result.get(name) if isinstance(result, dict) else getattr(result, name, None)
+
+
+class ScoreHistory:
+    """Indexed score time series per commodity and module"""
+
+    def __init__(self, path: Path = None):
+        self.path = path or HISTORY_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def record(
+        self,
+        commodity: str,
+        module: str,
+        score: Optional[float],
+        confidence: Optional[float] = None,
+        interpretation: Optional[str] = None,
+        ts: Any = None,
+    ) -> bool:
+        """Append one score; returns False if the write failed"""
+        return self.record_many([(commodity, module, _ts(ts), score, confidence, interpretation)])
+
+    def record_output(self, commodity: str, output: Any) -> bool:
+        """Append a ModuleOutput (or its dict form)"""
+        return self.record(
+            commodity,
+            _get(output, "module"),
+            _get(output, "score"),
+            _get(output, "confidence"),
+            _get(output, "interpretation"),
+            _get(output, "timestamp"),
+        )
+
+    def record_many(self, rows: List[tuple]) -> bool:
+        """Append (commodity, module, ts, score, confidence, interpretation) rows"""
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR IGNORE INTO scores VALUES (?, ?, ?, ?, ?, ?)", rows)
+            return True
+        except sqlite3.Error as e:
+            print(f"[ScoreHistory] Write failed: {e}")
+            return False
+
+    def series(self, commodity: str, module: str, start: Any = None, end: Any = None) -> Dict[str, np.ndarray]:
+        """
+        Scores of one module in [start, end] (either open), oldest first
+
+        Returns:
+            {"ts": datetime64[s], "score": float (NaN = none), "confidence": float}
+        """
+        query = "SELECT ts, score, confidence FROM scores WHERE commodity = ? AND module = ?"
+        args: List[Any] = [commodity, module]
+        if start is not None:
+            query += " AND ts >= ?"
+            args.append(_ts(start))
+        if end is not None:
+            query += " AND ts <= ?"
+            args.append(_ts(end))
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY ts", args).fetchall()
+
+        ts, score, confidence = zip(*rows) if rows else ((), (), ())
+        return {
+            "ts": np.array(ts, dtype="datetime64[s]"),
+            "score": np.array([np.nan if s is None else s for s in score], dtype=float),
+            "confidence": np.array([np.nan if c is None else c for c in confidence], dtype=float),
+        }
+
+    def as_of(self, commodity: str, ts: Any = None, modules: Sequence[str] = None) -> Dict[str, Dict]:
+        """Latest record at or before ts for each module (modules without one are omitted)"""
+        modules = self.modules(commodity) if modules is None else modules
+        bound = _ts(ts)
+        latest = {}
+        with self._lock:
+            for module in modules:
+                row = self._conn.execute(
+                    "SELECT ts, score, confidence, interpretation FROM scores "
+                    "WHERE commodity = ? AND module = ? AND ts <= ? ORDER BY ts DESC LIMIT 1",
+                    (commodity, module, bound),
+                ).fetchone()
+                if row:
+                    latest[module] = dict(zip(("ts", "score", "confidence", "interpretation"), row))
+        return latest
+
+    def modules(self, commodity: str) -> List[str]:
+        """Modules with history for a commodity (one index seek per module, no scan)"""
+        modules: List[str] = []
+        with self._lock:
+            while True:
+                (module,) = self._conn.execute(
+                    "SELECT MIN(module) FROM scores WHERE commodity = ? AND module > ?",
+                    (commodity, modules[-1] if modules else ""),
+                ).fetchone()
+                if module is None:
+                    return modules
+                modules.append(module)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def persistence(scores: np.ndarray, neutral_band: float = 1.0) -> Dict:
+    """
+    Signal persistence of a score series (oldest first): the current
+    direction, how many consecutive records it has held and how many
+    times the direction flipped (scores inside +/- neutral_band are flat)
+    """
+    scores = np.asarray(scores, dtype=float)
+    scores = scores[~np.isnan(scores)]
+    if not len(scores):
+        return {"direction": None, "run_length": 0, "flips": 0, "records": 0}
+
+    signs = np.where(scores >= neutral_band, 1, np.where(scores <= -neutral_band, -1, 0))
+    changes = np.flatnonzero(np.diff(signs)) + 1
+    directional = signs[signs != 0]
+    return {
+        "direction": {1: "bullish", -1: "bearish", 0: "neutral"}[int(signs[-1])],
+        "run_length": int(len(signs) - (changes[-1] if len(changes) else 0)),
+        "flips": int(np.count_nonzero(np.diff(directional))),
+        "records": int(len(scores)),
+    }
+
+
+_default_history: Optional[ScoreHistory] = None
+_default_lock = threading.Lock()
+
+
+def get_score_history() -> ScoreHistory:
+    """Process-wide score history store"""
+    global _default_history
+    with _default_lock:
+        if _default_history is None:
+            _default_history = ScoreHistory()
+        return _default_history
@@ -0,0 +1,259 @@
+"""
+Seasonal Profile Engine
+Day-of-year and month-of-year return and volume profiles from multi-year
+daily history. Everything is reduced to additive sufficient statistics
+(sums, sums of squares, counts per calendar bucket, built with bincount
+group-bys), stored per symbol in data/processed/seasonal/<commodity>.json
+and refreshed incrementally: only bars newer than the stored ones are
+folded in. Profiles and confidence bands are derived from the statistics.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from .data_fetch import DATA_PROCESSED, DataFetcher
+from .history import price_arrays
+
+SEASONAL_DIR = DATA_PROCESSED / "seasonal"
+
+HORIZON = 20                  # trading days, forward return measured from each day of year
+SMOOTHING_DAYS = 7            # +/- calendar days pooled around each day of year
+VOLUME_LOOKBACK = 252         # trailing bars for the relative-volume baseline
+MIN_YEARS = 5
+TRADING_DAYS_PER_CALENDAR_DAY = 252 / 365
+Z_95 = 1.96
+
+MONTH_DAYS = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+MONTH_START = np.concatenate([[0], np.cumsum(MONTH_DAYS)[:-1]])
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def calendar_index(dates: np.ndarray) -> Dict[str, np.ndarray]:
+    """Year, month (0-11) and 365-day day-of-year (Feb 29 folded into Feb 28)"""
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    months = dates.astype("datetime64[M]")
+    month = months.astype(np.int64) % 12
+    day = np.minimum((dates - months).astype(np.int64), MONTH_DAYS[month] - 1)
+    return {
+        "year": dates.astype("datetime64[Y]").astype(np.int64) + 1970,
+        "month": month,
+        "doy": MONTH_START[month] + day,
+    }
+
+
+def _empty_stats() -> Dict:
+    return {
+        "through": None,           # last bar folded into the daily statistics
+        "forward_through": None,   # last start date whose forward return was folded in
+        "doy": {name: [0.0] * 365 for name in ("fwd_sum", "fwd_sumsq", "fwd_count", "fwd_pos", "vol_sum", "vol_count")},
+        "months": {},              # "YYYY-MM": [sum log return, bars, sum relative volume, volume bars]
+    }
+
+
+def update_stats(stats: Optional[Dict], dates: np.ndarray, close: np.ndarray,
+                 volume: np.ndarray, horizon: int = HORIZON) -> Dict:
+    """
+    Fold bars newer than the stored ones into the statistics. Forward
+    returns are added once their horizon has completed.
+    """
+    stats = stats or _empty_stats()
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    cal = calendar_index(dates)
+
+    log_close = np.log(close)
+    ret = np.full(len(close), np.nan)
+    ret[1:] = np.diff(log_close)
+    forward = np.full(len(close), np.nan)
+    forward[:-horizon] = log_close[horizon:] - log_close[:-horizon]
+
+    # Volume relative to its trailing mean (excluding today)
+    vol = np.where(volume > 0, volume, np.nan)
+    valid = ~np.isnan(vol)
+    csum = np.concatenate([[0.0], np.cumsum(np.where(valid, vol, 0.0))])
+    ccount = np.concatenate([[0], np.cumsum(valid)])
+    idx = np.arange(len(vol))
+    start = np.maximum(idx - VOLUME_LOOKBACK, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        baseline = (csum[idx] - csum[start]) / (ccount[idx] - ccount[start])
+        rel_volume = np.where(ccount[idx] - ccount[start] >= VOLUME_LOOKBACK // 2, vol / baseline, np.nan)
+
+    def newer(through):
+        return dates > np.datetime64(through) if through else np.ones(len(dates), dtype=bool)
+
+    # Daily statistics: returns and relative volume per month, relative volume per day of year
+    new = newer(stats["through"]) & ~np.isnan(ret)
+    if new.any():
+        doy = stats["doy"]
+        has_vol = new & ~np.isnan(rel_volume)
+        for name, values in (
+            ("vol_sum", np.bincount(cal["doy"][has_vol], rel_volume[has_vol], minlength=365)),
+            ("vol_count", np.bincount(cal["doy"][has_vol], minlength=365)),
+        ):
+            doy[name] = (np.array(doy[name]) + values).tolist()
+
+        keys = cal["year"][new] * 12 + cal["month"][new]
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse, ret[new])
+        bars = np.bincount(inverse)
+        vol_new = np.nan_to_num(rel_volume[new])
+        vol_sums = np.bincount(inverse, vol_new)
+        vol_bars = np.bincount(inverse, ~np.isnan(rel_volume[new]))
+        for key, s, b, vs, vb in zip(unique, sums, bars, vol_sums, vol_bars):
+            label = f"{key // 12}-{key % 12 + 1:02d}"
+            entry = stats["months"].setdefault(label, [0.0, 0, 0.0, 0])
+            stats["months"][label] = [entry[0] + float(s), entry[1] + int(b), entry[2] + float(vs), entry[3] + int(vb)]
+        stats["through"] = str(dates[new][-1])
+
+    # Forward returns per day of year, once complete
+    new = newer(stats["forward_through"]) & ~np.isnan(forward)
+    if new.any():
+        doy = stats["doy"]
+        for name, values in (
+            ("fwd_sum", np.bincount(cal["doy"][new], forward[new], minlength=365)),
+            ("fwd_sumsq", np.bincount(cal["doy"][new], forward[new] ** 2, minlength=365)),
+            ("fwd_count", np.bincount(cal["doy"][new], minlength=365)),
+            ("fwd_pos", np.bincount(cal["doy"][new], forward[new] > 0, minlength=365)),
+        ):
+            doy[name] = (np.array(doy[name]) + values).tolist()
+        stats["forward_through"] = str(dates[new][-1])
+
+    return stats
+
+
+def _circular_pool(values: np.ndarray, half_width: int) -> np.ndarray:
+    """Sum of each day-of-year bucket with its +/- half_width neighbours (wrapping)"""
+    padded = np.concatenate([values[-half_width:], values, values[:half_width]])
+    return np.convolve(padded, np.ones(2 * half_width + 1), mode="valid")
+
+
+def profiles(stats: Dict, smoothing: int = SMOOTHING_DAYS) -> Dict[str, np.ndarray]:
+    """
+    Profiles with 95% bands from the statistics.
+
+    Returns:
+        doy_*: (365,) pooled forward-return mean/std/band/hit rate and relative volume
+        month_*: (12,) mean monthly return across years, band, % positive, years, relative volume
+    """
+    doy = {name: np.array(values, dtype=float) for name, values in stats["doy"].items()}
+    pooled = {name: _circular_pool(values, smoothing) for name, values in doy.items()}
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n = pooled["fwd_count"]
+        mean = pooled["fwd_sum"] / n
+        std = np.sqrt(np.maximum(pooled["fwd_sumsq"] / n - mean ** 2, 0) * n / (n - 1))
+        # Overlapping forward windows: count years, not days, for the standard error
+        years = n / ((2 * smoothing + 1) * TRADING_DAYS_PER_CALENDAR_DAY)
+        se = std / np.sqrt(years)
+        doy_volume = pooled["vol_sum"] / pooled["vol_count"]
+
+    # Monthly: one observation per (year, month) with a complete-looking month
+    current = datetime.now().strftime("%Y-%m")
+    rows = [(int(label[5:7]) - 1, v) for label, v in sorted(stats["months"].items()) if label != current and v[1] >= 15]
+    month_idx = np.array([m for m, _ in rows], dtype=np.int64)
+    month_ret = np.array([v[0] for _, v in rows], dtype=float)
+    month_vol = np.array([v[2] / v[3] if v[3] else np.nan for _, v in rows], dtype=float)
+
+    count = np.bincount(month_idx, minlength=12).astype(float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        m_mean = np.bincount(month_idx, month_ret, minlength=12) / count
+        m_var = np.bincount(month_idx, month_ret ** 2, minlength=12) / count - m_mean ** 2
+        m_std = np.sqrt(np.maximum(m_var, 0) * count / (count - 1))
+        m_se = m_std / np.sqrt(count)
+        m_pos = np.bincount(month_idx, month_ret > 0, minlength=12) / count
+        has_vol = ~np.isnan(month_vol)
+        m_volume = (np.bincount(month_idx[has_vol], month_vol[has_vol], minlength=12)
+                    / np.bincount(month_idx[has_vol], minlength=12))
+
+    return {
+        "doy_mean": mean, "doy_std": std, "doy_years": years,
+        "doy_lower": mean - Z_95 * se, "doy_upper": mean + Z_95 * se,
+        "doy_hit_rate": pooled["fwd_pos"] / n, "doy_volume": doy_volume,
+        "month_mean": m_mean, "month_lower": m_mean - Z_95 * m_se, "month_upper": m_mean + Z_95 * m_se,
+        "month_positive": m_pos, "month_years": count, "month_volume": m_volume,
+    }
+
+
+class SeasonalStore:
+    """Per-symbol seasonal statistics, refreshed with new bars only"""
+
+    def __init__(self, store_dir: Path = None):
+        self.store_dir = store_dir or SEASONAL_DIR
+
+    def _path(self, commodity: str) -> Path:
+        return self.store_dir / f"{commodity}.json"
+
+    def load(self, commodity: str) -> Optional[Dict]:
+        path = self._path(commodity)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                stats = json.load(f)
+            return stats if stats.get("horizon") == HORIZON else None
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[Seasonal] Rebuilding unreadable {path.name}: {e}")
+            return None
+
+    def refresh(self, commodity: str, prices: Dict[str, np.ndarray]) -> Dict:
+        """Fold new bars of a price-array dict into the stored statistics and save"""
+        stats = update_stats(self.load(commodity), prices["dates"], prices["close"], prices["volume"])
+        stats["horizon"] = HORIZON
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._path(commodity), 'w') as f:
+            json.dump(stats, f)
+        return stats
+
+
+def load_seasonal(commodity: str, force_refresh: bool = False, store: SeasonalStore = None) -> Dict:
+    """Refreshed seasonal statistics for one commodity from its full price history"""
+    fetcher = DataFetcher(commodity, force_refresh=force_refresh)
+    prices = price_arrays(fetcher.fetch_price_history())
+    store = store or SeasonalStore()
+    if prices is None:
+        return store.load(fetcher.commodity) or {"error": "No price history for seasonal profiles"}
+    return store.refresh(fetcher.commodity, prices)
+
+
+def current_seasonality(stats: Dict, when: datetime = None) -> Dict:
+    """Seasonal snapshot for a date: forward-return profile at its day of year and its month"""
+    if "error" in stats:
+        return stats
+    when = when or datetime.now()
+    prof = profiles(stats)
+    doy = int(calendar_index(np.array([when.strftime("%Y-%m-%d")], dtype="datetime64[D]"))["doy"][0])
+    month = when.month - 1
+
+    def pct(x, digits=2):
+        return None if np.isnan(x) else round(float(x) * 100, digits)
+
+    years = prof["doy_years"][doy]
+    mean, lower, upper = prof["doy_mean"][doy], prof["doy_lower"][doy], prof["doy_upper"][doy]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_stat = float(mean / ((upper - lower) / (2 * Z_95)))
+
+    return {
+        "as_of_day": int(doy) + 1,
+        "years": round(float(years), 1) if not np.isnan(years) else 0,
+        "forward_days": HORIZON,
+        "forward_return_pct": pct(mean),
+        "forward_band_pct": [pct(lower), pct(upper)],
+        "forward_hit_rate": pct(prof["doy_hit_rate"][doy], 1),
+        "t_stat": None if np.isnan(t_stat) else round(t_stat, 2),
+        "relative_volume": None if np.isnan(prof["doy_volume"][doy]) else round(float(prof["doy_volume"][doy]), 2),
+        "month": MONTH_NAMES[month],
+        "month_return_pct": pct(prof["month_mean"][month]),
+        "month_band_pct": [pct(prof["month_lower"][month]), pct(prof["month_upper"][month])],
+        "month_positive_pct": pct(prof["month_positive"][month], 1),
+        "month_profile_pct": {
+            name: pct(value) for name, value in zip(MONTH_NAMES, prof["month_mean"])
+        },
+        "month_volume_profile": {
+            name: None if np.isnan(v) else round(float(v), 2) for name, v in zip(MONTH_NAMES, prof["month_volume"])
+        },
+    }
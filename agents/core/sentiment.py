@@ -0,0 +1,198 @@
+"""
+Lexicon Sentiment Scorer
+Price-direction sentiment for commodity news. Each article is tokenized
+once (whole words, so "gain" no longer matches "again"), scored against a
+weighted lexicon of words and two-word phrases held in a hash map, and
+sentiment words inside a negation window flip sign. Scores are cached per
+article hash (in memory and in data/processed/sentiment/cache.json), so
+re-scoring a stored article set only tokenizes new articles.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .data_fetch import DATA_PROCESSED
+
+SENTIMENT_DIR = DATA_PROCESSED / "sentiment"
+MAX_CACHE_ENTRIES = 100000
+
+NEGATION_WINDOW = 3           # tokens after a negator whose sentiment flips
+
+# Weight > 0 = bullish for price, < 0 = bearish. Inflections are listed explicitly.
+LEXICON: Dict[str, float] = {
+    **dict.fromkeys(["rise", "rises", "rising", "rose", "risen"], 1.0),
+    **dict.fromkeys(["surge", "surges", "surged", "surging"], 1.5),
+    **dict.fromkeys(["soar", "soars", "soared", "soaring"], 1.5),
+    **dict.fromkeys(["jump", "jumps", "jumped", "jumping"], 1.2),
+    **dict.fromkeys(["rally", "rallies", "rallied", "rallying"], 1.2),
+    **dict.fromkeys(["gain", "gains", "gained", "gaining"], 1.0),
+    **dict.fromkeys(["climb", "climbs", "climbed", "climbing"], 1.0),
+    **dict.fromkeys(["increase", "increases", "increased", "increasing"], 0.8),
+    **dict.fromkeys(["boost", "boosts", "boosted", "boosting"], 0.8),
+    **dict.fromkeys(["strong", "stronger", "strength", "robust"], 0.8),
+    **dict.fromkeys(["shortage", "shortages", "deficit", "deficits", "scarcity"], 1.2),
+    **dict.fromkeys(["tight", "tighter", "tightening"], 0.8),
+    **dict.fromkeys(["disruption", "disruptions", "outage", "outages"], 0.8),
+    **dict.fromkeys(["growth", "recovery", "rebound", "rebounds", "rebounded"], 0.6),
+    "demand": 0.3,
+    "higher": 0.5,
+    **dict.fromkeys(["fall", "falls", "fell", "falling", "fallen"], -1.0),
+    **dict.fromkeys(["drop", "drops", "dropped", "dropping"], -1.0),
+    **dict.fromkeys(["decline", "declines", "declined", "declining"], -1.0),
+    **dict.fromkeys(["slump", "slumps", "slumped", "slumping"], -1.5),
+    **dict.fromkeys(["plunge", "plunges", "plunged", "plunging"], -1.5),
+    **dict.fromkeys(["tumble", "tumbles", "tumbled", "tumbling"], -1.3),
+    **dict.fromkeys(["slide", "slides", "slid", "sliding"], -1.0),
+    **dict.fromkeys(["weak", "weaker", "weakness", "weakening", "sluggish"], -0.8),
+    **dict.fromkeys(["surplus", "surpluses", "glut", "oversupply", "oversupplied"], -1.3),
+    **dict.fromkeys(["loss", "losses"], -0.8),
+    **dict.fromkeys(["slowdown", "slowing", "recession"], -1.0),
+    **dict.fromkeys(["cut", "cuts"], -0.5),
+    "lower": -0.5,
+    # Phrases override their words
+    **dict.fromkeys(["production cut", "production cuts", "output cut", "output cuts",
+                     "supply cut", "supply cuts"], 1.0),
+    "record high": 1.0,
+    "record low": -1.0,
+    **dict.fromkeys(["demand slowdown", "weak demand", "weaker demand"], -1.2),
+    **dict.fromkeys(["strong demand", "stronger demand"], 1.2),
+}
+
+NEGATORS = {
+    "not", "no", "never", "without", "hardly", "barely", "neither", "nor", "cannot",
+    "isn't", "aren't", "wasn't", "weren't", "doesn't", "don't", "didn't", "won't", "can't", "fails", "failed",
+}
+
+# Punctuation and contrast words end a negation window
+CLAUSE_BREAKS = set(".,;:!?") | {"but", "despite", "although", "though", "while", "yet"}
+
+_TOKEN = re.compile(r"[a-z]+(?:'[a-z]+)?|[.,;:!?]")
+# Tokens worth looking at; everything else is skipped without a Python-level step
+_ACTIVE = {term.split()[0] for term in LEXICON} | NEGATORS | CLAUSE_BREAKS
+
+# Changes whenever the lexicon or negation rules change, invalidating cached scores
+LEXICON_VERSION = hashlib.sha1(
+    json.dumps([sorted(LEXICON.items()), sorted(NEGATORS), sorted(CLAUSE_BREAKS), NEGATION_WINDOW]).encode("utf-8")
+).hexdigest()[:12]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens (apostrophes kept) and clause punctuation"""
+    return _TOKEN.findall(text.lower().replace("’", "'"))
+
+
+def score_tokens(tokens: List[str]) -> Dict:
+    """Weighted bullish/bearish sums and matched terms for one token list"""
+    bullish = bearish = 0.0
+    terms = []
+    negate_until = -1
+    skip_to = 0
+    for i in [i for i, token in enumerate(tokens) if token in _ACTIVE]:
+        if i < skip_to:
+            continue  # second word of a matched phrase
+        token = tokens[i]
+        if token in CLAUSE_BREAKS:
+            negate_until = -1
+            continue
+        if token in NEGATORS:
+            negate_until = i + NEGATION_WINDOW
+            continue
+
+        phrase = token + " " + tokens[i + 1] if i + 1 < len(tokens) else None
+        if phrase in LEXICON:
+            term, weight, skip_to = phrase, LEXICON[phrase], i + 2
+        elif token in LEXICON:
+            term, weight = token, LEXICON[token]
+        else:
+            continue
+
+        if i <= negate_until:
+            weight, term = -weight, "not " + term
+        if weight > 0:
+            bullish += weight
+        else:
+            bearish -= weight
+        terms.append(term)
+
+    return {"bullish": round(bullish, 2), "bearish": round(bearish, 2), "terms": terms}
+
+
+def article_text(item: Dict) -> str:
+    return (item.get("title", "") or "") + ". " + (item.get("description", "") or "")
+
+
+def article_hash(item: Dict) -> str:
+    return hashlib.sha1((LEXICON_VERSION + article_text(item)).encode("utf-8")).hexdigest()
+
+
+class SentimentScorer:
+    """Batch scorer with a per-article-hash result cache (safe to share across TM threads)"""
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = cache_path or SENTIMENT_DIR / "cache.json"
+        self.cache: Dict[str, Dict] = {}
+        self._dirty = False
+        self._lock = threading.Lock()         # guards cache and _dirty
+        self._write_lock = threading.Lock()   # one writer of cache_path at a time
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, 'r') as f:
+                    self.cache = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"[Sentiment] Ignoring unreadable cache: {e}")
+
+    def score(self, item: Dict) -> Dict:
+        key = article_hash(item)
+        with self._lock:
+            result = self.cache.get(key)
+        if result is None:
+            result = score_tokens(tokenize(article_text(item)))
+            with self._lock:
+                result = self.cache.setdefault(key, result)
+                self._dirty = True
+        return result
+
+    def score_batch(self, items: List[Dict]) -> List[Dict]:
+        """Scores for many articles; only unseen articles are tokenized"""
+        return [self.score(item) for item in items]
+
+    def save(self):
+        """Write the cache atomically (temp file + os.replace)"""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                if len(self.cache) > MAX_CACHE_ENTRIES:
+                    # Insertion order: drop the oldest entries
+                    self.cache = dict(list(self.cache.items())[-MAX_CACHE_ENTRIES:])
+                snapshot = dict(self.cache)
+                self._dirty = False
+
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.cache_path)
+            except OSError:
+                with self._lock:
+                    self._dirty = True
+                raise
+
+
+_default_scorer: Optional[SentimentScorer] = None
+_default_lock = threading.Lock()
+
+
+def get_scorer() -> SentimentScorer:
+    """Process-wide scorer sharing one cache"""
+    global _default_scorer
+    with _default_lock:
+        if _default_scorer is None:
+            _default_scorer = SentimentScorer()
+        return _default_scorer
@@ -0,0 +1,273 @@
+"""
+Parameter Sweep
+Grid or random search over the TM-TECH / TM-POS thresholds, evaluated with
+the vectorized backtest on a process pool. Price/COT arrays are placed in
+one shared-memory block that every worker attaches to, so only the small
+parameter dicts travel between processes.
+"""
+
+import csv
+import itertools
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .backtest import DEFAULT_PARAMS, backtest_commodity
+from .data_fetch import DATA_PROCESSED
+from .params import save_params
+
+# Candidate values per parameter, split by the module they tune
+SEARCH_SPACES = {
+    "tech": {
+        "ma_trend": [40, 50, 60, 80, 100],
+        "ma_long": [150, 200, 250],
+        "rsi_overbought": [65, 70, 75, 80],
+        "rsi_oversold": [20, 25, 30, 35],
+        "tech_weights": [[0.4, 0.35, 0.25], [0.5, 0.3, 0.2], [0.34, 0.33, 0.33], [0.6, 0.25, 0.15]],
+    },
+    "pos": {
+        "cta_windows": [[20, 50, 200], [10, 40, 120], [20, 60, 250], [50, 100, 200]],
+        "cot_window": [52, 104, 156],
+        "cot_cutoffs": [[20, 40, 60, 80], [10, 30, 70, 90], [15, 35, 65, 85], [25, 45, 55, 75]],
+        "pos_weights": [[0.35, 0.25, 0.2, 0.2], [0.25, 0.45, 0.15, 0.15], [0.5, 0.2, 0.15, 0.15]],
+    },
+}
+
+# Composite rule each family is ranked on
+TARGET_RULES = {"tech": "tech_composite", "pos": "pos_composite"}
+
+MIN_SIGNALS = 100
+
+# Worker-side view of the shared arrays (set by _attach_shared)
+_SHARED_BLOCK = None
+_SHARED_UNIVERSE = None
+
+
+# =========================================
+# Search space
+# =========================================
+
+def build_grid(space: Dict[str, List]) -> List[Dict]:
+    """Every combination of the candidate values"""
+    keys = list(space)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(space[k] for k in keys))]
+
+
+def random_candidates(space: Dict[str, List], samples: int, seed: int = 42) -> List[Dict]:
+    """`samples` distinct random combinations (all of them if the grid is smaller)"""
+    grid_size = int(np.prod([len(v) for v in space.values()]))
+    if samples >= grid_size:
+        return build_grid(space)
+
+    rng = random.Random(seed)
+    seen, candidates = set(), []
+    while len(candidates) < samples:
+        combo = {k: rng.choice(v) for k, v in space.items()}
+        key = json.dumps(combo, sort_keys=True)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(combo)
+    return candidates
+
+
+def _is_valid(params: Dict) -> bool:
+    """Reject incoherent combinations (e.g. trend MA longer than the long MA)"""
+    if params.get("ma_trend", 0) >= params.get("ma_long", float("inf")):
+        return False
+    if params.get("rsi_oversold", 0) >= params.get("rsi_overbought", 100):
+        return False
+    return True
+
+
+# =========================================
+# Shared memory
+# =========================================
+
+def _share_universe(universe: Dict[str, Dict]) -> Tuple[shared_memory.SharedMemory, Dict]:
+    """
+    Pack every array of the universe into one float64 shared-memory block.
+    Returns the block and a layout {commodity: {section: {field: (offset, length)}}}.
+    Dates are stored as day numbers.
+    """
+    layout, chunks, offset = {}, [], 0
+    for commodity, data in universe.items():
+        layout[commodity] = {}
+        for section in ("prices", "cot"):
+            arrays = data.get(section)
+            if arrays is None:
+                layout[commodity][section] = None
+                continue
+            layout[commodity][section] = {}
+            for name, arr in arrays.items():
+                values = arr.astype("datetime64[D]").astype(np.int64) if name == "dates" else arr
+                values = np.asarray(values, dtype=np.float64)
+                layout[commodity][section][name] = (offset, len(values))
+                chunks.append(values)
+                offset += len(values)
+
+    block = shared_memory.SharedMemory(create=True, size=max(offset, 1) * 8)
+    buffer = np.ndarray((offset,), dtype=np.float64, buffer=block.buf)
+    position = 0
+    for values in chunks:
+        buffer[position:position + len(values)] = values
+        position += len(values)
+    return block, layout
+
+
+def _attach_shared(block_name: str, layout: Dict):
+    """Process-pool initializer: map the shared block back into arrays"""
+    global _SHARED_BLOCK, _SHARED_UNIVERSE
+    _SHARED_BLOCK = shared_memory.SharedMemory(name=block_name)
+    total = sum(
+        length
+        for sections in layout.values()
+        for fields in sections.values() if fields
+        for _, length in fields.values()
+    )
+    buffer = np.ndarray((total,), dtype=np.float64, buffer=_SHARED_BLOCK.buf)
+
+    _SHARED_UNIVERSE = {}
+    for commodity, sections in layout.items():
+        _SHARED_UNIVERSE[commodity] = {}
+        for section, fields in sections.items():
+            if fields is None:
+                _SHARED_UNIVERSE[commodity][section] = None
+                continue
+            arrays = {}
+            for name, (start, length) in fields.items():
+                view = buffer[start:start + length]
+                arrays[name] = view.astype(np.int64).astype("datetime64[D]") if name == "dates" else view
+            _SHARED_UNIVERSE[commodity][section] = arrays
+
+
+def _evaluate_batch(commodity: str, candidates: List[Dict], target: str, horizon: int) -> List[Dict]:
+    """Worker task: backtest a batch of parameter sets for one commodity"""
+    data = _SHARED_UNIVERSE[commodity]
+    rows = []
+    for candidate in candidates:
+        stats = backtest_commodity(data, candidate, [horizon], [target]).get(target)
+        rows.append(_summarize(commodity, candidate, stats, horizon))
+    return rows
+
+
+def _summarize(commodity: str, candidate: Dict, stats: Dict, horizon: int) -> Dict:
+    """Reduce backtest stats to one ranked-table row"""
+    dist = (stats or {}).get("horizons", {}).get(str(horizon), {})
+    count = dist.get("count", 0)
+    mean, std = dist.get("mean_return_pct"), dist.get("std_return_pct")
+
+    # t-stat of directional returns (overlapping windows, so for ranking only)
+    objective = None
+    if count >= MIN_SIGNALS and std:
+        objective = round(float(mean / std * np.sqrt(count)), 4)
+
+    return {
+        "commodity": commodity,
+        "objective": objective,
+        "hit_rate": dist.get("hit_rate"),
+        "mean_return_pct": mean,
+        "signals": count,
+        "turnover_annual": (stats or {}).get("turnover_annual"),
+        "params": candidate,
+    }
+
+
+# =========================================
+# Sweep
+# =========================================
+
+def run_sweep(
+    universe: Dict[str, Dict],
+    family: str = "tech",
+    mode: str = "grid",
+    samples: int = 200,
+    horizon: int = 20,
+    max_workers: int = None,
+    batch_size: int = 16,
+) -> Dict[str, List[Dict]]:
+    """
+    Evaluate the search space for every commodity on a process pool.
+
+    Returns:
+        {commodity: rows ranked best-first by objective}
+    """
+    space = SEARCH_SPACES[family]
+    target = TARGET_RULES[family]
+    candidates = build_grid(space) if mode == "grid" else random_candidates(space, samples)
+    candidates = [c for c in candidates if _is_valid({**DEFAULT_PARAMS, **c})]
+
+    print(f"[Sweep] {family}: {len(candidates)} parameter sets x {len(universe)} commodities ({mode})")
+
+    block, layout = _share_universe(universe)
+    rows: Dict[str, List[Dict]] = {c: [] for c in universe}
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers or os.cpu_count(),
+            initializer=_attach_shared,
+            initargs=(block.name, layout),
+        ) as executor:
+            futures = [
+                executor.submit(_evaluate_batch, commodity, candidates[i:i + batch_size], target, horizon)
+                for commodity in universe
+                for i in range(0, len(candidates), batch_size)
+            ]
+            for future in as_completed(futures):
+                for row in future.result():
+                    rows[row["commodity"]].append(row)
+    finally:
+        block.close()
+        block.unlink()
+
+    for commodity, commodity_rows in rows.items():
+        commodity_rows.sort(key=lambda r: (r["objective"] is None, -(r["objective"] or 0)))
+        for rank, row in enumerate(commodity_rows, 1):
+            row["rank"] = rank
+    return rows
+
+
+def save_sweep(rows: Dict[str, List[Dict]], family: str, output_dir: Path = None) -> List[Path]:
+    """Write one ranked CSV per commodity to data/processed/sweep/"""
+    output_dir = output_dir or DATA_PROCESSED / "sweep"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M")
+
+    paths = []
+    for commodity, commodity_rows in rows.items():
+        if not commodity_rows:
+            continue
+        param_keys = list(commodity_rows[0]["params"])
+        path = output_dir / f"{commodity}_{family}_{stamp}.csv"
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["rank", "objective", "hit_rate", "mean_return_pct", "signals", "turnover_annual"] + param_keys)
+            for row in commodity_rows:
+                writer.writerow(
+                    [row["rank"], row["objective"], row["hit_rate"], row["mean_return_pct"],
+                     row["signals"], row["turnover_annual"]]
+                    + [json.dumps(row["params"][k]) for k in param_keys]
+                )
+        paths.append(path)
+    return paths
+
+
+def apply_best(rows: Dict[str, List[Dict]], family: str) -> Dict[str, Path]:
+    """Save each commodity's top-ranked parameters for the Task Managers to load"""
+    applied = {}
+    for commodity, commodity_rows in rows.items():
+        if not commodity_rows or commodity_rows[0]["objective"] is None:
+            continue
+        best = commodity_rows[0]
+        applied[commodity] = save_params(commodity, best["params"], meta={
+            "family": family,
+            "objective": best["objective"],
+            "hit_rate": best["hit_rate"],
+            "tuned_at": datetime.now().isoformat(),
+        })
+    return applied
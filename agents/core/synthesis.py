@@ -0,0 +1,277 @@
+"""
+Weighted Score Synthesis
+One engine for the composite module score used by the PM, the report and
+screening/historical analysis: a (commodity x date x module) score array
+(any leading shape, NaN = module missing) and module weights go in;
+composite scores, interpretations and module coverage for the whole
+matrix come out of one vectorized call.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MODULES = ["tm_fund", "tm_news", "tm_views", "tm_tech", "tm_struct", "tm_pos"]
+
+MODULE_WEIGHTS = {
+    "tm_fund": 1.5,   # Fundamentals weighted higher
+    "tm_news": 1.0,
+    "tm_views": 1.0,
+    "tm_tech": 1.2,
+    "tm_struct": 0.8,
+    "tm_pos": 1.0,
+}
+DEFAULT_WEIGHT = 1.0          # modules without a configured weight
+
+# Monte Carlo uncertainty
+MC_DRAWS = 100_000
+MC_SEED = 20240611            # fixed: a rerun of the same report shows the same numbers
+SCORE_NOISE = 2.0             # score s.d. at debate confidence 0, shrinking linearly to 0 at 1
+DEFAULT_CONFIDENCE = 0.5      # modules without a debate confidence
+WEIGHT_JITTER = 0.25          # log-normal s.d. of each module weight
+
+# Same bands as TaskManager._interpret_score: bearish bounds inclusive, bullish exclusive
+INTERPRETATIONS = ["Strongly Bearish", "Bearish", "Neutral", "Bullish", "Strongly Bullish", "Insufficient data"]
+
+
+def weight_vector(modules: Sequence[str], weights: Dict[str, float] = None) -> np.ndarray:
+    weights = MODULE_WEIGHTS if weights is None else weights
+    return np.array([weights.get(m, DEFAULT_WEIGHT) for m in modules], dtype=float)
+
+
+def interpretation_codes(scores: np.ndarray) -> np.ndarray:
+    """Index into INTERPRETATIONS for every score (NaN -> "Insufficient data")"""
+    scores = np.asarray(scores, dtype=float)
+    with np.errstate(invalid="ignore"):
+        return np.select(
+            [np.isnan(scores), scores <= -3, scores <= -1, scores < 1, scores < 3],
+            [5, 0, 1, 2, 3],
+            default=4,
+        )
+
+
+def synthesize(
+    scores: np.ndarray,
+    modules: Sequence[str] = None,
+    weights: Dict[str, float] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Composite scores for a score array whose last axis is modules.
+
+    Args:
+        scores: (..., M) module scores, NaN where a module has no score
+        modules: names of the M modules (default MODULES)
+        weights: {module: weight} (default MODULE_WEIGHTS)
+
+    Returns:
+        weighted_score: (...) weighted mean of the present modules (NaN if none)
+        interpretation: (...) labels; interpretation_code: indices into INTERPRETATIONS
+        modules_included: (...) count of present modules
+        weight_coverage: (...) share of the total weight that was present
+    """
+    scores = np.asarray(scores, dtype=float)
+    modules = MODULES if modules is None else modules
+    w = weight_vector(modules, weights)
+    present = ~np.isnan(scores)
+
+    weight_present = present @ w
+    total = np.where(present, scores, 0.0) @ w
+    with np.errstate(invalid="ignore", divide="ignore"):
+        composite = np.where(weight_present > 0, total / weight_present, np.nan)
+
+    codes = interpretation_codes(composite)
+    return {
+        "weighted_score": composite,
+        "interpretation": np.array(INTERPRETATIONS, dtype=object)[codes],
+        "interpretation_code": codes,
+        "modules_included": present.sum(axis=-1),
+        "weight_coverage": weight_present / w.sum() if w.sum() > 0 else np.zeros_like(weight_present),
+    }
+
+
+def _field_of(result: Any, name: str) -> float:
+    value = result.get(name) if isinstance(result, dict) else getattr(result, name, None)
+    try:
+        return np.nan if value is None else float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _score_of(result: Any) -> float:
+    return _field_of(result, "score")
+
+
+def score_matrix(results: Dict[str, Dict[str, Any]], modules: Sequence[str] = None) -> np.ndarray:
+    """(commodities x modules) array from {commodity: {module: output with "score"}}"""
+    modules = MODULES if modules is None else modules
+    return np.array([[_score_of(outputs.get(m)) for m in modules] for outputs in results.values()], dtype=float)
+
+
+def synthesize_outputs(outputs: Dict[str, Any], weights: Dict[str, float] = None) -> Dict:
+    """
+    Composite for one commodity's module outputs (dicts or ModuleOutputs),
+    JSON-ready. Modules outside MODULES take part with DEFAULT_WEIGHT.
+    """
+    modules = MODULES + [m for m in outputs if m not in MODULES and not np.isnan(_score_of(outputs[m]))]
+    result = synthesize(score_matrix({"_": outputs}, modules)[0], modules, weights)
+    weighted = float(result["weighted_score"])
+    return {
+        "weighted_score": None if np.isnan(weighted) else round(weighted, 2),
+        "modules_included": int(result["modules_included"]),
+        "weight_coverage": round(float(result["weight_coverage"]), 3),
+        "interpretation": str(result["interpretation"]),
+    }
+
+
+def interpret(score: Optional[float]) -> str:
+    return INTERPRETATIONS[int(interpretation_codes(np.nan if score is None else score))]
+
+
+def format_score(score: Optional[float]) -> str:
+    return "n/a" if score is None else f"{score:+.1f}"
+
+
+def screen(results: Dict[str, Dict[str, Any]], weights: Dict[str, float] = None) -> List[Dict]:
+    """Composite per commodity from {commodity: module outputs}, strongest conviction first"""
+    matrix = score_matrix(results)
+    synthesis = synthesize(matrix, MODULES, weights)
+    rows = [
+        {
+            "commodity": commodity,
+            "weighted_score": None if np.isnan(s) else round(float(s), 2),
+            "interpretation": str(label),
+            "modules_included": int(n),
+        }
+        for commodity, s, label, n in zip(
+            results, synthesis["weighted_score"], synthesis["interpretation"], synthesis["modules_included"]
+        )
+    ]
+    return sorted(rows, key=lambda r: -abs(r["weighted_score"]) if r["weighted_score"] is not None else 0)
+
+
+# =========================================
+# Uncertainty & weight sensitivity
+# =========================================
+
+@lru_cache(maxsize=8)
+def _base_draws(draws: int, n_modules: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Standard-normal score shocks and mean-one log-normal weight factors,
+    generated once per shape and shared by every commodity and report
+    (common random numbers: comparisons between commodities are not noise).
+    """
+    rng = np.random.default_rng(MC_SEED)
+    z = rng.standard_normal((2, draws, n_modules), dtype=np.float32)
+    weight_factors = np.exp(WEIGHT_JITTER * z[1] - WEIGHT_JITTER ** 2 / 2)
+    z.setflags(write=False)
+    weight_factors.setflags(write=False)
+    return z[0], weight_factors
+
+
+def simulate(
+    scores: np.ndarray,
+    confidences: np.ndarray,
+    modules: Sequence[str] = None,
+    weights: Dict[str, float] = None,
+    draws: int = MC_DRAWS,
+) -> Dict[str, np.ndarray]:
+    """
+    Distribution of the composite score under module-score and weight
+    uncertainty, for every row of a (C, M) score matrix at once.
+
+    Each draw perturbs a module's score by N(0, SCORE_NOISE * (1 - confidence))
+    (clipped to the -5..5 score range) and each weight by a log-normal factor.
+
+    Returns:
+        mean, std, p05, p50, p95: (C,) composite statistics
+        bucket_prob: (C, len(INTERPRETATIONS)) probability of each interpretation
+        same_call_prob / same_sign_prob: (C,) share of draws agreeing with the point estimate
+    """
+    scores = np.atleast_2d(np.asarray(scores, dtype=np.float32))
+    confidences = np.atleast_2d(np.asarray(confidences, dtype=np.float32))
+    modules = MODULES if modules is None else modules
+    n, m = scores.shape
+    shocks, weight_factors = _base_draws(draws, m)
+
+    present = ~np.isnan(scores)
+    conf = np.where(np.isnan(confidences), DEFAULT_CONFIDENCE, np.clip(confidences, 0, 1))
+    sd = np.where(present, SCORE_NOISE * (1 - conf), 0).astype(np.float32)
+
+    drawn = np.clip(np.where(present, scores, 0)[:, None, :] + sd[:, None, :] * shocks, -5, 5)  # (C, N, M)
+    w = (weight_vector(modules, weights).astype(np.float32) * weight_factors)[None] * present[:, None, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        composite = np.einsum("cnm,cnm->cn", drawn, w) / w.sum(axis=-1)  # (C, N)
+
+    point = synthesize(scores.astype(float), modules, weights)
+    codes = interpretation_codes(composite)
+    offsets = np.arange(n)[:, None] * len(INTERPRETATIONS)
+    bucket_prob = np.bincount((codes + offsets).ravel(), minlength=n * len(INTERPRETATIONS))
+    bucket_prob = bucket_prob.reshape(n, len(INTERPRETATIONS)) / draws
+
+    p05, p50, p95 = np.percentile(composite, [5, 50, 95], axis=-1)
+    return {
+        "point": point["weighted_score"],
+        "mean": composite.mean(axis=-1),
+        "std": composite.std(axis=-1),
+        "p05": p05,
+        "p50": p50,
+        "p95": p95,
+        "bucket_prob": bucket_prob,
+        "same_call_prob": (codes == point["interpretation_code"][:, None]).mean(axis=-1),
+        "same_sign_prob": (np.sign(composite) == np.sign(point["weighted_score"])[:, None]).mean(axis=-1),
+    }
+
+
+def weight_sensitivity(
+    scores: np.ndarray,
+    modules: Sequence[str] = None,
+    weights: Dict[str, float] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Closed-form weight sensitivity of the composite for a (C, M) matrix:
+    the composite without each module, and its change per +10% weight
+    on the module (w_m * (s_m - composite) / sum(w) * 0.1).
+    """
+    scores = np.atleast_2d(np.asarray(scores, dtype=float))
+    modules = MODULES if modules is None else modules
+    w = weight_vector(modules, weights)
+    present = ~np.isnan(scores)
+    s = np.where(present, scores, 0.0)
+    wp = present * w
+    total, weight_sum = (s * wp).sum(-1, keepdims=True), wp.sum(-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        composite = total / weight_sum
+        leave_out = np.where(present, (total - s * wp) / (weight_sum - wp), np.nan)
+        per_10pct = np.where(present, 0.1 * wp * (s - composite) / weight_sum, np.nan)
+    return {"leave_out": leave_out, "per_10pct_weight": per_10pct}
+
+
+def score_uncertainty(outputs: Dict[str, Any], weights: Dict[str, float] = None, draws: int = MC_DRAWS) -> Dict:
+    """Monte Carlo composite distribution and weight sensitivity for one commodity, JSON-ready"""
+    scores = np.array([[_score_of(outputs.get(m)) for m in MODULES]])
+    if np.isnan(scores).all():
+        return {"error": "No module scores to simulate"}
+    confidences = np.array([[_field_of(outputs.get(m), "confidence") for m in MODULES]])
+    sim = simulate(scores, confidences, MODULES, weights, draws)
+    sens = weight_sensitivity(scores, MODULES, weights)
+
+    def r(x, digits=2):
+        return None if np.isnan(x) else round(float(x), digits)
+
+    return {
+        "draws": draws,
+        "mean": r(sim["mean"][0]),
+        "std": r(sim["std"][0]),
+        "range_90": [r(sim["p05"][0]), r(sim["p95"][0])],
+        "median": r(sim["p50"][0]),
+        "bucket_probabilities": {
+            label: p for label, p in zip(INTERPRETATIONS, np.round(sim["bucket_prob"][0], 3).tolist()) if p > 0
+        },
+        "same_call_prob": round(float(sim["same_call_prob"][0]), 3),
+        "same_sign_prob": round(float(sim["same_sign_prob"][0]), 3),
+        "sensitivity": {
+            module: {"without": r(sens["leave_out"][0, i]), "per_10pct_weight": r(sens["per_10pct_weight"][0, i], 3)}
+            for i, module in enumerate(MODULES) if not np.isnan(scores[0, i])
+        },
+    }
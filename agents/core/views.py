@@ -0,0 +1,312 @@
+"""
+Market Views Aggregates
+Market consensus built from data the system already stores: headline
+sentiment over time (every saved daily news snapshot), managed-money
+positioning from the crowding index, the replicated CTA position and price
+momentum. Nothing is fetched: inputs are read from the DataFetcher cache and
+the crowding store, scored articles are kept in
+data/processed/views/<commodity>.json and only new snapshots are folded in.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .crowding import CrowdingCache, classify
+from .cta import DEFAULT_LOOKBACKS, replicate
+from .data_fetch import DATA_PROCESSED, DataFetcher
+from .history import price_arrays
+from .sentiment import LEXICON_VERSION, get_scorer
+
+VIEWS_DIR = DATA_PROCESSED / "views"
+
+NEWS_WINDOW_DAYS = 7          # recent headline tone
+RETENTION_DAYS = 365          # days of scored articles and consensus values kept
+MIN_TONE_HISTORY = 20         # daily tone windows needed before calling an extreme
+TONE_EXTREME_PCT = 90         # two-sided: top/bottom 10% of past tone is an extreme
+MOMENTUM_DAYS = 63            # ~3 months
+REVISION_DAYS = 30            # consensus change measured over this many calendar days
+
+# Tilts are each in [-1, 1]; missing inputs are dropped and the rest re-weighted
+COMPONENT_WEIGHTS = {"news": 0.3, "managed_money": 0.25, "cta": 0.2, "momentum": 0.25}
+
+CONSENSUS_LABELS = [
+    (0.6, "Strongly bullish"),
+    (0.3, "Bullish"),
+    (0.1, "Cautiously bullish"),
+    (-0.1, "Neutral"),
+    (-0.3, "Cautiously bearish"),
+    (-0.6, "Bearish"),
+]
+
+
+def consensus_label(value: Optional[float]) -> str:
+    if value is None:
+        return "Neutral"
+    for cutoff, label in CONSENSUS_LABELS:
+        if value >= cutoff:
+            return label
+    return "Strongly bearish"
+
+
+# =========================================
+# Inputs
+# =========================================
+
+def _article_key(item: Dict) -> str:
+    return hashlib.sha1((item.get("link") or item.get("title", "")).encode("utf-8")).hexdigest()[:16]
+
+
+def _article_date(item: Dict, fallback: str) -> str:
+    try:
+        return parsedate_to_datetime(item.get("pub_date", "")).strftime("%Y-%m-%d")
+    except (TypeError, ValueError, IndexError):
+        return fallback
+
+
+def fold_news(store: Dict, snapshots: List[Path]) -> int:
+    """Score articles of unseen news snapshots into the store; returns articles added"""
+    scorer = get_scorer()
+    seen = set(store["snapshots"])
+    articles = store["articles"]
+    added = 0
+    # The newest snapshot is re-read: a forced refresh rewrites today's file
+    for path in [p for p in snapshots if p.name not in seen] + snapshots[-1:]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                items = json.load(f).get("items", [])
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[Views] Skipping unreadable {path.name}: {e}")
+            continue
+        snapshot_date = datetime.strptime(path.stem[-8:], "%Y%m%d").strftime("%Y-%m-%d")
+        for item in items:
+            key = _article_key(item)
+            if key in articles:
+                continue
+            result = scorer.score(item)
+            articles[key] = [_article_date(item, snapshot_date), result["bullish"], result["bearish"], result["terms"]]
+            added += 1
+        if path.name not in seen:
+            store["snapshots"].append(path.name)
+            seen.add(path.name)
+    scorer.save()
+
+    cutoff = (datetime.now() - timedelta(days=RETENTION_DAYS)).strftime("%Y-%m-%d")
+    store["articles"] = {k: v for k, v in articles.items() if v[0] >= cutoff}
+    return added
+
+
+def news_tone(articles: Dict[str, List], as_of: str, window: int = NEWS_WINDOW_DAYS) -> Dict:
+    """
+    Net headline tone, (bullish - bearish) / (bullish + bearish), over the
+    trailing window, plus where it sits among all past windows.
+    """
+    if not articles:
+        return {"error": "No stored headlines"}
+    records = list(articles.values())
+    dates = np.array([r[0] for r in records], dtype="datetime64[D]")
+    end = np.datetime64(as_of[:10])
+    start = min(dates.min(), end - window + 1)
+    day = (dates - start).astype(int)
+    keep = day <= (end - start).astype(int)
+    length = int((end - start).astype(int)) + 1  # >= window
+
+    bull = np.bincount(day[keep], weights=np.array([r[1] for r in records])[keep], minlength=length)
+    bear = np.bincount(day[keep], weights=np.array([r[2] for r in records])[keep], minlength=length)
+    count = np.bincount(day[keep], minlength=length)
+
+    def trailing(x):
+        c = np.concatenate([[0.0], np.cumsum(x)])
+        return c[window:] - c[:-window]
+
+    bull_w, bear_w, count_w = trailing(bull), trailing(bear), trailing(count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tone = np.where(bull_w + bear_w > 0, (bull_w - bear_w) / (bull_w + bear_w), np.nan)
+    tone[count_w == 0] = np.nan
+
+    current = tone[-1]
+    past = tone[:-1][~np.isnan(tone[:-1])]
+    percentile = None
+    if not np.isnan(current) and len(past) >= MIN_TONE_HISTORY:
+        percentile = round(float((past < current).mean() * 100), 1)
+
+    recent_terms: Dict[str, int] = {}
+    recent = str(end - window + 1)
+    for r in records:
+        if recent <= r[0] <= as_of[:10]:
+            for term in r[3]:
+                recent_terms[term] = recent_terms.get(term, 0) + 1
+
+    return {
+        "tone": None if np.isnan(current) else round(float(current), 2),
+        "articles": int(count_w[-1]),
+        "bullish": round(float(bull_w[-1]), 1),
+        "bearish": round(float(bear_w[-1]), 1),
+        "tone_percentile": percentile,
+        "tone_extreme": percentile is not None and max(percentile, 100 - percentile) >= TONE_EXTREME_PCT,
+        "history_windows": int(len(past)),
+        "top_terms": sorted(recent_terms.items(), key=lambda kv: -kv[1])[:5],
+    }
+
+
+def price_momentum(close: np.ndarray, days: int = MOMENTUM_DAYS) -> Dict:
+    """Trailing return scaled by its expected volatility over the same horizon"""
+    close = close[~np.isnan(close)]
+    if len(close) < days + 1:
+        return {"error": f"Need {days + 1} closes for momentum"}
+    log_returns = np.diff(np.log(close[-(days + 1):]))
+    move = float(log_returns.sum())
+    scale = float(log_returns.std() * np.sqrt(days))
+    z = move / scale if scale > 0 else 0.0
+    return {
+        "return_pct": round((np.exp(move) - 1) * 100, 2),
+        "return_1m_pct": round(float(close[-1] / close[-22] - 1) * 100, 2) if len(close) > 21 else None,
+        "z_score": round(z, 2),
+    }
+
+
+# =========================================
+# Consensus
+# =========================================
+
+def _tilts(news: Dict, crowding: Optional[Dict], cta_pct: Optional[float], momentum: Dict) -> Dict[str, float]:
+    tilts = {}
+    if news.get("tone") is not None:
+        tilts["news"] = news["tone"]
+    if crowding and crowding.get("mm_percentile") is not None:
+        tilts["managed_money"] = (crowding["mm_percentile"] - 50) / 50
+    if cta_pct is not None:
+        tilts["cta"] = float(np.clip(cta_pct / 100, -1, 1))
+    if "z_score" in momentum:
+        tilts["momentum"] = float(np.clip(momentum["z_score"] / 2, -1, 1))
+    return tilts
+
+
+def consensus(tilts: Dict[str, float]) -> Dict:
+    """Weighted consensus of the available tilts and how much they agree"""
+    if not tilts:
+        return {"value": None, "label": consensus_label(None), "dispersion": None, "inputs": 0}
+    values = np.array(list(tilts.values()))
+    weights = np.array([COMPONENT_WEIGHTS[name] for name in tilts])
+    value = float((values * weights).sum() / weights.sum())
+    return {
+        "value": round(value, 3),
+        "label": consensus_label(value),
+        "dispersion": round(float(values.std()), 3) if len(values) > 1 else None,
+        "inputs": len(values),
+    }
+
+
+def _revision(history: Dict[str, float], today: str, value: Optional[float]) -> Optional[float]:
+    """Consensus change since the last recorded value at least REVISION_DAYS ago"""
+    if value is None:
+        return None
+    cutoff = (datetime.strptime(today, "%Y-%m-%d") - timedelta(days=REVISION_DAYS)).strftime("%Y-%m-%d")
+    prior = [d for d in history if d <= cutoff]
+    return round(value - history[max(prior)], 3) if prior else None
+
+
+class ViewsStore:
+    """Scored headline history and daily consensus values per commodity"""
+
+    def __init__(self, store_dir: Path = None):
+        self.store_dir = store_dir or VIEWS_DIR
+
+    def _path(self, commodity: str) -> Path:
+        return self.store_dir / f"{commodity}.json"
+
+    def load(self, commodity: str) -> Dict:
+        path = self._path(commodity)
+        empty = {"lexicon": LEXICON_VERSION, "snapshots": [], "articles": {}, "consensus": {}, "key": None}
+        if not path.exists():
+            return empty
+        try:
+            with open(path, 'r') as f:
+                store = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"[Views] Rebuilding unreadable {path.name}: {e}")
+            return empty
+        if store.get("lexicon") != LEXICON_VERSION:
+            # Re-score every snapshot with the new lexicon; keep the consensus history
+            return {**empty, "consensus": store.get("consensus", {})}
+        return store
+
+    def save(self, commodity: str, store: Dict):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._path(commodity), 'w') as f:
+            json.dump(store, f)
+
+
+def load_views(commodity: str, lookbacks: List[int] = None, store: ViewsStore = None) -> Dict:
+    """
+    Consensus and its inputs for one commodity from stored data only.
+    Recomputed when a new news/price snapshot or crowding update has been
+    stored since the last call, otherwise returned from the store.
+    """
+    lookbacks = lookbacks or DEFAULT_LOOKBACKS
+    fetcher = DataFetcher(commodity)
+    store = store or ViewsStore()
+    state = store.load(fetcher.commodity)
+
+    news_files = fetcher.cached_snapshots("news")
+    price_files = fetcher.cached_snapshots("price_history")
+    crowding_history = CrowdingCache().stored(fetcher.commodity)
+    key = {
+        "news": news_files[-1].name if news_files else None,
+        "prices": price_files[-1].name if price_files else None,
+        "crowding": (crowding_history or {}).get("key"),
+        "lookbacks": list(lookbacks),
+    }
+    if state.get("key") == key and state.get("views"):
+        return state["views"]
+    if not news_files and not price_files and crowding_history is None:
+        return {"error": "No stored news, price or crowding data yet"}
+
+    if news_files:
+        fold_news(state, news_files)
+    today = datetime.now().strftime("%Y-%m-%d")
+    news = news_tone(state["articles"], today)
+
+    prices = None
+    if price_files:
+        with open(price_files[-1], 'r', encoding='utf-8') as f:
+            prices = price_arrays(json.load(f))
+    momentum, cta_pct = {"error": "No stored price history"}, None
+    if prices is not None:
+        momentum = price_momentum(prices["close"])
+        if len(prices["close"]) > max(lookbacks):
+            position = replicate(prices["close"][None, :], lookbacks)["position_pct"][0, -1]
+            cta_pct = None if np.isnan(position) else round(float(position), 1)
+
+    crowding = None
+    if crowding_history and crowding_history.get("dates"):
+        crowding = {name: values[-1] for name, values in crowding_history.items()
+                    if isinstance(values, list) and name != "dates"}
+        crowding["as_of"] = crowding_history["dates"][-1]
+        crowding["level"] = classify(np.nan if crowding.get("crowding_index") is None else crowding["crowding_index"])
+
+    tilts = _tilts(news, crowding, cta_pct, momentum)
+    view = consensus(tilts)
+    view["revision"] = _revision(state["consensus"], today, view["value"])
+    if view["value"] is not None:
+        state["consensus"][today] = view["value"]
+        state["consensus"] = dict(sorted(state["consensus"].items())[-RETENTION_DAYS:])
+
+    views = {
+        "as_of": today,
+        "consensus": view,
+        "tilts": {name: round(value, 3) for name, value in tilts.items()},
+        "news": news,
+        "crowding": crowding,
+        "cta_position_pct": cta_pct,
+        "momentum": momentum,
+        "consensus_days": len(state["consensus"]),
+    }
+    state.update({"lexicon": LEXICON_VERSION, "key": key, "views": views})
+    store.save(fetcher.commodity, state)
+    return views
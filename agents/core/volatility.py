@@ -0,0 +1,178 @@
+"""
+Realized Volatility & Regime Detection
+Close-to-close, Parkinson and Garman-Klass volatility over rolling windows,
+with percentile-based regime classification. Works on one symbol or on a
+whole (symbols x dates) panel in one batched call.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from .indicators import nan_rolling_mean
+
+TRADING_DAYS = 252
+DEFAULT_WINDOW = 20
+REGIME_LOOKBACK = 252
+
+# Percentile bands of current vol within its own history
+REGIMES = [
+    (20, "Calm"),
+    (70, "Normal"),
+    (90, "Elevated"),
+    (100, "Stressed"),
+]
+
+# Multiplier applied to directional sub-scores per regime: a move means more
+# in a calm market than in a panicked one
+REGIME_SCALING = {
+    "Calm": 1.2,
+    "Normal": 1.0,
+    "Elevated": 0.8,
+    "Stressed": 0.6,
+}
+
+
+def close_to_close(close: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """Annualized close-to-close volatility (zero-mean log returns)"""
+    close = np.asarray(close, dtype=float)
+    log_ret = np.full(close.shape, np.nan)
+    log_ret[..., 1:] = np.diff(np.log(close), axis=-1)
+    return np.sqrt(nan_rolling_mean(log_ret ** 2, window) * TRADING_DAYS)
+
+
+def parkinson(high: np.ndarray, low: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """Annualized Parkinson (high-low range) volatility"""
+    hl = np.log(np.asarray(high, dtype=float) / np.asarray(low, dtype=float)) ** 2
+    return np.sqrt(nan_rolling_mean(hl, window) / (4 * np.log(2)) * TRADING_DAYS)
+
+
+def garman_klass(
+    open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+    window: int = DEFAULT_WINDOW,
+) -> np.ndarray:
+    """Annualized Garman-Klass (OHLC) volatility"""
+    open_, high, low, close = (np.asarray(a, dtype=float) for a in (open_, high, low, close))
+    hl = np.log(high / low) ** 2
+    co = np.log(close / open_) ** 2
+    daily = 0.5 * hl - (2 * np.log(2) - 1) * co
+    return np.sqrt(np.clip(nan_rolling_mean(daily, window), 0, None) * TRADING_DAYS)
+
+
+def rolling_percentile_rank(x: np.ndarray, lookback: int = REGIME_LOOKBACK) -> np.ndarray:
+    """Percentile (0-100) of each value within its trailing lookback, NaN-aware"""
+    x = np.asarray(x, dtype=float)
+    if x.shape[-1] < lookback:
+        return np.full(x.shape, np.nan)
+    windows = np.lib.stride_tricks.sliding_window_view(x, lookback, axis=-1)
+    current = windows[..., -1:]
+    valid = ~np.isnan(windows)
+    with np.errstate(invalid="ignore"):
+        below = ((windows < current) & valid).sum(axis=-1)
+    counts = valid.sum(axis=-1)
+
+    out = np.full(x.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ranks = np.where((counts >= lookback // 2) & ~np.isnan(current[..., 0]), below / counts * 100, np.nan)
+    out[..., lookback - 1:] = ranks
+    return out
+
+
+def classify_regime(percentile: np.ndarray) -> np.ndarray:
+    """Map vol percentiles to regime labels ("" where unknown)"""
+    percentile = np.asarray(percentile, dtype=float)
+    labels = np.full(percentile.shape, "", dtype=object)
+    lower = -np.inf
+    for upper, name in REGIMES:
+        labels[(percentile > lower) & (percentile <= upper)] = name
+        lower = upper
+    return labels
+
+
+def volatility_panel(
+    open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+    window: int = DEFAULT_WINDOW, lookback: int = REGIME_LOOKBACK,
+) -> Dict[str, np.ndarray]:
+    """
+    All estimators plus regime for a (symbols x dates) panel (or a 1-D series).
+    The regime is taken from the Garman-Klass estimate, falling back to
+    close-to-close where OHLC is missing.
+    """
+    cc = close_to_close(close, window)
+    pk = parkinson(high, low, window)
+    gk = garman_klass(open_, high, low, close, window)
+    reference = np.where(np.isnan(gk), cc, gk)
+    pct = rolling_percentile_rank(reference, lookback)
+    return {
+        "close_to_close": cc,
+        "parkinson": pk,
+        "garman_klass": gk,
+        "percentile": pct,
+        "regime": classify_regime(pct),
+    }
+
+
+def stack_panel(series: List[Dict[str, np.ndarray]], fields: List[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Right-align several price-array dicts into (symbols x dates) matrices,
+    left-padding shorter histories with NaN.
+    """
+    fields = fields or ["open", "high", "low", "close"]
+    length = max(len(s["close"]) for s in series)
+    panel = {}
+    for name in fields:
+        matrix = np.full((len(series), length), np.nan)
+        for i, s in enumerate(series):
+            values = np.asarray(s[name], dtype=float)
+            matrix[i, length - len(values):] = values
+        panel[name] = matrix
+    return panel
+
+
+def universe_volatility(universe: Dict[str, Dict], window: int = DEFAULT_WINDOW,
+                        lookback: int = REGIME_LOOKBACK) -> Dict[str, Dict[str, np.ndarray]]:
+    """Volatility and regime history for every symbol in one batched call"""
+    commodities = list(universe)
+    series = [universe[c]["prices"] for c in commodities]
+    panel = stack_panel(series)
+    result = volatility_panel(panel["open"], panel["high"], panel["low"], panel["close"], window, lookback)
+
+    per_symbol = {}
+    for i, (commodity, s) in enumerate(zip(commodities, series)):
+        n = len(s["close"])
+        per_symbol[commodity] = {key: values[i, -n:] for key, values in result.items()}
+        per_symbol[commodity]["dates"] = s["dates"]
+    return per_symbol
+
+
+def latest_regime(prices: List[Dict], window: int = DEFAULT_WINDOW,
+                  lookback: int = REGIME_LOOKBACK) -> Dict:
+    """
+    Current volatility snapshot for a Task Manager's price list.
+    Lookback shrinks to the available history (min 60 bars).
+    """
+    rows = [p for p in prices if p.get("close")]
+    if len(rows) < window + 1:
+        return {"regime": "Unknown", "scaling": 1.0, "note": "Insufficient data for volatility"}
+
+    def col(name):
+        return np.array([p.get(name) if p.get(name) is not None else np.nan for p in rows], dtype=float)
+
+    lookback = min(lookback, len(rows))
+    vols = volatility_panel(col("open"), col("high"), col("low"), col("close"), window, max(lookback, 60))
+
+    def last(arr):
+        value = arr[-1]
+        return None if np.isnan(value) else round(float(value) * 100, 2)
+
+    regime = vols["regime"][-1] or "Unknown"
+    pct = vols["percentile"][-1]
+    return {
+        "window_days": window,
+        "close_to_close_pct": last(vols["close_to_close"]),
+        "parkinson_pct": last(vols["parkinson"]),
+        "garman_klass_pct": last(vols["garman_klass"]),
+        "vol_percentile": None if np.isnan(pct) else round(float(pct), 1),
+        "regime": regime,
+        "scaling": REGIME_SCALING.get(regime, 1.0),
+    }
@@ -8,6 +8,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
 from dataclasses import dataclass, asdict
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.synthesis import interpret, synthesize_outputs
 
 
 @dataclass
@@ -136,7 +141,7 @@ class ProjectManager:
                 "commodity": plan.commodity,
                 "scope": "Technical Analysis",
                 "requirements": [
-                    "Trend indicators (60MA, 200MA)",
+                    "Trend indicators (trend and long MAs)",
                     "Momentum signals (RSI, MACD)",
                     "Support/resistance levels",
                     "Key technical triggers",
@@ -218,35 +223,17 @@ class ProjectManager:
         """
         Synthesize final analysis from all module results.
         """
-        # Calculate weighted score
-        scores = []
-        weights = []
-
-        score_map = {
-            "tm_fund": 1.5,   # Fundamentals weighted higher
-            "tm_news": 1.0,
-            "tm_views": 1.0,
-            "tm_tech": 1.2,
-            "tm_struct": 0.8,
-            "tm_pos": 1.0,
-        }
-
-        for module, result in results.items():
-            if isinstance(result, dict) and "score" in result:
-                scores.append(result["score"])
-                weights.append(score_map.get(module, 1.0))
-
-        weighted_score = None
-        if scores and weights:
-            weighted_score = sum(s * w for s, w in zip(scores, weights)) / sum(weights)
+        # Weighted score (shared engine with TM-REPORT)
+        composite = synthesize_outputs(results)
 
         synthesis = {
             "commodity": commodity,
             "synthesized_at": datetime.now().isoformat(),
             "modules_completed": len([r for r in results.values() if isinstance(r, dict) and r.get("status") != "not_found"]),
             "total_modules": len(self.MODULES),
-            "weighted_score": round(weighted_score, 2) if weighted_score else None,
-            "interpretation": self._interpret_score(weighted_score) if weighted_score else "Insufficient data",
+            "weighted_score": composite["weighted_score"],
+            "modules_included": composite["modules_included"],
+            "interpretation": composite["interpretation"],
             "module_summaries": {
                 module: result.get("summary", "N/A") if isinstance(result, dict) else "N/A"
                 for module, result in results.items()
@@ -257,13 +244,4 @@ class ProjectManager:
 
     def _interpret_score(self, score: float) -> str:
         """Interpret the weighted score"""
-        if score <= -3:
-            return "Strongly Bearish"
-        elif score <= -1:
-            return "Bearish"
-        elif score <= 1:
-            return "Neutral"
-        elif score <= 3:
-            return "Bullish"
-        else:
-            return "Strongly Bullish"
+        return interpret(score)
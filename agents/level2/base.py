@@ -9,6 +9,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict, field
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -17,6 +18,12 @@ from core.debate import (
     DebateEngine, Challenge, Response, DebateResult,
     create_logic_checker, create_data_validator
 )
+from core.batch import DebateJob, run_debates
+from core.params import load_params
+from core.score_history import get_score_history
+
+# SUP-A / SUP-B checkers per TM class, compiled on first use
+_SUPERVISORS: Dict[type, tuple] = {}
 
 
 @dataclass
@@ -46,6 +53,12 @@ class TaskManager(ABC):
 
     MODULE_NAME: str = "base"
 
+    # Tunable thresholds; per-commodity overrides come from the parameter sweep
+    PARAMS: Dict = {}
+
+    # Modules whose stored data this TM reads; it runs in a later phase
+    RUNS_AFTER: tuple = ()
+
     def __init__(self, project_root: Path, commodity: str, force_refresh: bool = False):
         self.project_root = project_root
         self.commodity = commodity
@@ -53,6 +66,7 @@ class TaskManager(ABC):
         self.output_dir = project_root / "modules" / self.commodity_key
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.force_refresh = force_refresh
+        self.params = load_params(self.commodity_key, self.PARAMS)
 
     @abstractmethod
     def fetch_data(self) -> Dict:
@@ -74,6 +88,20 @@ class TaskManager(ABC):
         """Get validation rules for SUP-B"""
         pass
 
+    def get_supervisors(self) -> tuple:
+        """
+        (SUP-A, SUP-B) checkers compiled from the rule specs once per TM
+        class and shared across commodities, so rules must not depend on
+        the commodity.
+        """
+        cls = type(self)
+        if cls not in _SUPERVISORS:
+            _SUPERVISORS[cls] = (
+                create_logic_checker(self.get_logic_rules()),
+                create_data_validator(self.get_validation_rules()),
+            )
+        return _SUPERVISORS[cls]
+
     def respond_to_challenges(
         self,
         analysis: Dict,
@@ -126,28 +154,40 @@ class TaskManager(ABC):
         """
         Execute the full analysis with debate protocol.
         """
-        # 1. Fetch data
-        data = self.fetch_data()
-
-        # 2. Initial analysis
-        initial_analysis = self.analyze(data)
+        # 1-2. Fetch data and initial analysis
+        job = self.prepare_debate()
 
         # 3. Set up debate
         debate_engine = DebateEngine(self.MODULE_NAME, self.output_dir)
 
-        # 4. Create supervisors
-        sup_a = create_logic_checker(self.get_logic_rules())
-        sup_b = create_data_validator(self.get_validation_rules())
-
-        # 5. Run debate
+        # 4-5. Run debate with the compiled supervisors
         debate_result = debate_engine.run_debate(
-            initial_analysis=initial_analysis,
-            sup_a_check=sup_a,
-            sup_b_check=sup_b,
-            tm_respond=self.respond_to_challenges
+            initial_analysis=job.analysis,
+            sup_a_check=job.sup_a,
+            sup_b_check=job.sup_b,
+            tm_respond=job.respond
         )
 
-        # 6. Create output
+        # 6-7. Create and save output
+        return self.complete(debate_result)
+
+    def prepare_debate(self) -> DebateJob:
+        """Fetch data and run the initial analysis; returns the debate still to run"""
+        data = self.fetch_data()
+        initial_analysis = self.analyze(data)
+        sup_a, sup_b = self.get_supervisors()
+        return DebateJob(
+            module=self.MODULE_NAME,
+            commodity=self.commodity_key,
+            analysis=initial_analysis,
+            sup_a=sup_a,
+            sup_b=sup_b,
+            respond=self.respond_to_challenges,
+            output_dir=self.output_dir,
+        )
+
+    def complete(self, debate_result: DebateResult) -> ModuleOutput:
+        """Module output from a finished debate, saved to the output dir"""
         final_analysis = debate_result.final_analysis
         output = ModuleOutput(
             module=self.MODULE_NAME,
@@ -163,7 +203,6 @@ class TaskManager(ABC):
             debate_rounds=debate_result.total_rounds
         )
 
-        # 7. Save output
         self._save_output(output)
 
         return output
@@ -186,3 +225,56 @@ class TaskManager(ABC):
         output_path = self.output_dir / f"{self.MODULE_NAME.replace('tm_', '')}_output.json"
         with open(output_path, 'w') as f:
             json.dump(asdict(output), f, indent=2, default=str)
+        get_score_history().record_output(self.commodity_key, output)
+
+
+def run_phases(managers: List[TaskManager]) -> List[List[TaskManager]]:
+    """
+    Managers split into phases that run one after another: a TM runs after
+    the modules in its RUNS_AFTER for the same commodity
+    """
+    remaining, phases = list(managers), []
+    while remaining:
+        pending = {(tm.commodity_key, tm.MODULE_NAME) for tm in remaining}
+        phase = [
+            tm for tm in remaining
+            if not any((tm.commodity_key, module) in pending for module in tm.RUNS_AFTER)
+        ] or remaining  # dependency cycle: run the rest together
+        phases.append(phase)
+        remaining = [tm for tm in remaining if tm not in phase]
+    return phases
+
+
+def run_batch(managers: List[TaskManager], max_workers: int = 6) -> Dict[tuple, Any]:
+    """
+    Run many Task Managers (any modules, any commodities) together: data
+    fetch and analysis in a thread pool (phase by phase, see run_phases),
+    then all debates through the batch executor in grouped supervisor passes.
+
+    Returns:
+        {(commodity_key, module): ModuleOutput or {"error": ...}}
+    """
+    jobs, outputs = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for phase in run_phases(managers):
+            futures = {executor.submit(tm.prepare_debate): tm for tm in phase}
+            for future in as_completed(futures):
+                tm = futures[future]
+                try:
+                    jobs[tm] = future.result()
+                except Exception as e:
+                    print(f"[Batch] {tm.MODULE_NAME}/{tm.commodity_key} failed: {e}")
+                    outputs[(tm.commodity_key, tm.MODULE_NAME)] = {"error": str(e)}
+
+    ready = [tm for tm in managers if tm in jobs]
+    for tm, result in zip(ready, run_debates([jobs[tm] for tm in ready], max_workers)):
+        key = (tm.commodity_key, tm.MODULE_NAME)
+        if isinstance(result, dict):
+            outputs[key] = result
+            continue
+        try:
+            outputs[key] = tm.complete(result)
+        except Exception as e:
+            print(f"[Batch] {tm.MODULE_NAME}/{tm.commodity_key} failed: {e}")
+            outputs[key] = {"error": str(e)}
+    return outputs
@@ -14,6 +14,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from .base import TaskManager
 from core.data_fetch import DataFetcher
+from core.seasonal import MIN_YEARS, current_seasonality, load_seasonal
 
 
 class FundamentalsManager(TaskManager):
@@ -106,6 +107,8 @@ class FundamentalsManager(TaskManager):
         fetcher = DataFetcher(self.commodity, force_refresh=self.force_refresh)
         fundamentals = fetcher.fetch_fundamentals()
         exchange_data = fetcher.fetch_exchange_data()
+        # Seasonal statistics from the full price history (stored, refreshed with new bars)
+        seasonal = load_seasonal(self.commodity_key, self.force_refresh)
 
         return {
             "commodity": self.commodity,
@@ -115,6 +118,7 @@ class FundamentalsManager(TaskManager):
             "economic_indicators": fundamentals.get("economic_indicators", {}),
             "market_context": fundamentals.get("market_context", {}),
             "exchange_data": exchange_data,
+            "seasonal": seasonal,
             "data_sources": fundamentals.get("data_sources", []),
         }
 
@@ -142,7 +146,7 @@ class FundamentalsManager(TaskManager):
         # Build analysis
         supply_demand = self._analyze_supply_demand(base_data, data.get("market_context", {}))
         inventory = self._analyze_inventory(data)
-        seasonal = self._analyze_seasonal(base_data)
+        seasonal = self._analyze_seasonal(base_data, data.get("seasonal", {}))
         cost_analysis = self._analyze_costs(base_data)
         macro = self._analyze_macro(economic)
 
@@ -224,34 +228,37 @@ class FundamentalsManager(TaskManager):
             "rationale": f"Volume trend: {volume_trend}; market activity {'elevated' if volume_trend == 'increasing' else 'subdued' if volume_trend == 'decreasing' else 'stable'}",
         }
 
-    def _analyze_seasonal(self, base_data: Dict) -> Dict:
-        """Analyze seasonal patterns"""
+    def _analyze_seasonal(self, base_data: Dict, seasonal_stats: Dict) -> Dict:
+        """Analyze seasonal patterns from the historical return/volume profiles"""
         seasonal_factors = base_data.get("seasonal_factors", {})
         current_quarter = f"Q{(datetime.now().month - 1) // 3 + 1}"
         current_factor = seasonal_factors.get(current_quarter, "Neutral")
 
-        score_map = {
-            "Weak (post-holiday)": -1,
-            "Construction pickup": 0.5,
-            "Peak demand": 1,
-            "Pre-holiday restocking": 0.5,
-            "Northern hemisphere harvest (Sept-Nov)": -0.5,
-            "Brazil peak harvest": -0.5,
-            "Moderate (China restocking)": 0.3,
-            "Construction peak": 0.7,
-            "Steady demand": 0.2,
-            "Seasonal slowdown": -0.3,
-            "Neutral": 0,
-        }
+        profile = current_seasonality(seasonal_stats) if seasonal_stats else {"error": "No seasonal statistics"}
+        if "error" in profile or profile["years"] < MIN_YEARS or profile["t_stat"] is None:
+            return {
+                "current_quarter": current_quarter,
+                "seasonal_factor": current_factor,
+                "historical_pattern": seasonal_factors,
+                "score": 0,
+                "rationale": profile.get("error", f"Fewer than {MIN_YEARS} years of history for a seasonal profile"),
+            }
 
-        score = score_map.get(current_factor, 0)
+        # t-stat of the seasonal forward return: |t| >= 2 is a full-strength signal
+        score = round(max(min(profile["t_stat"] / 2, 1), -1), 1)
+        low, high = profile["forward_band_pct"]
 
         return {
             "current_quarter": current_quarter,
             "seasonal_factor": current_factor,
             "historical_pattern": seasonal_factors,
+            "profile": profile,
             "score": score,
-            "rationale": f"Current quarter ({current_quarter}): {current_factor}",
+            "rationale": (
+                f"Next {profile['forward_days']} trading days historically {profile['forward_return_pct']:+.2f}% "
+                f"(95% band {low:+.2f}% to {high:+.2f}%, up {profile['forward_hit_rate']:.0f}% of the time, "
+                f"{profile['years']:.0f} years); {current_factor}"
+            ),
         }
 
     def _analyze_costs(self, base_data: Dict) -> Dict:
@@ -325,6 +332,7 @@ class FundamentalsManager(TaskManager):
                 "field": "consistency",
                 "condition": "consistency",
                 "check": lambda a: -5 <= a.get("score", 0) <= 5,
+                "reads": ["score"],
                 "message": "Score must be in valid range [-5, 5]",
                 "severity": "high",
             },
@@ -14,6 +14,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from .base import TaskManager
 from core.data_fetch import DataFetcher
+from core.keywords import get_matcher, match_articles
+from core.sentiment import get_scorer
 
 
 class NewsManager(TaskManager):
@@ -52,6 +54,10 @@ class NewsManager(TaskManager):
         },
     }
 
+    # Geopolitical and event vocabularies (shared by all commodities)
+    GEOPOLITICAL_KEYWORDS = ["war", "conflict", "sanction", "trade war", "tension", "crisis", "embargo"]
+    EVENT_KEYWORDS = ["announce", "report", "decision", "meeting", "data", "release", "forecast"]
+
     def fetch_data(self) -> Dict:
         """Fetch news from multiple internet sources"""
         commodity_key = self.commodity.lower().replace(" ", "_")
@@ -85,14 +91,22 @@ class NewsManager(TaskManager):
         themes = data.get("themes", {})
         news_items = data.get("news_items", [])
 
+        # One keyword scan per article: category, geo and event hits together
+        hits = match_articles(news_items, self._get_matcher(themes))
+
+        # Lexicon sentiment per article (cached by article hash)
+        scorer = get_scorer()
+        sentiment = scorer.score_batch(news_items)
+        scorer.save()
+
         # Categorize and analyze news
-        categorized = self._categorize_news(news_items, themes)
+        categorized = self._categorize_news(news_items, hits, sentiment)
 
         # Analyze each category
         policy_impact = self._analyze_category(categorized.get("policy", []), "Policy & Regulation")
         supply_news = self._analyze_category(categorized.get("supply", []), "Supply Developments")
         demand_news = self._analyze_category(categorized.get("demand", []), "Demand Developments")
-        geopolitical = self._analyze_geopolitical(news_items, themes)
+        geopolitical = self._analyze_geopolitical(news_items, hits, themes)
 
         # Weight the impacts
         scores = [
@@ -111,43 +125,41 @@ class NewsManager(TaskManager):
             "supply_news": supply_news,
             "demand_news": demand_news,
             "geopolitical": geopolitical,
-            "key_events": self._identify_key_events(news_items),
+            "key_events": self._identify_key_events(news_items, hits, themes),
+            "syndication": self._analyze_syndication(news_items),
             "sources": data.get("sources_checked", []),
             "news_count": len(news_items),
             "recent_headlines": [item.get("title", "") for item in news_items[:5]],
         }
 
-    def _categorize_news(self, news_items: List[Dict], themes: Dict) -> Dict:
-        """Categorize news items by theme"""
+    def _get_matcher(self, themes: Dict):
+        """Compiled matcher for this theme set (cached across runs and commodities)"""
+        return get_matcher({
+            "policy": themes.get("policy_keywords", []),
+            "supply": themes.get("supply_keywords", []),
+            "demand": themes.get("demand_keywords", []),
+            "geopolitical": self.GEOPOLITICAL_KEYWORDS,
+            "event": self.EVENT_KEYWORDS,
+        })
+
+    def _categorize_news(self, news_items: List[Dict], hits: List[Dict], sentiment: List[Dict]) -> Dict:
+        """Categorize news items by theme; each entry is (item, sentiment)"""
         categorized = {"policy": [], "supply": [], "demand": [], "other": []}
 
-        policy_kw = themes.get("policy_keywords", [])
-        supply_kw = themes.get("supply_keywords", [])
-        demand_kw = themes.get("demand_keywords", [])
-
-        for item in news_items:
-            title = item.get("title", "").lower()
-            desc = item.get("description", "").lower()
-            text = title + " " + desc
-
+        for item, item_hits, item_sentiment in zip(news_items, hits, sentiment):
             matched = False
-            if any(kw.lower() in text for kw in policy_kw):
-                categorized["policy"].append(item)
-                matched = True
-            if any(kw.lower() in text for kw in supply_kw):
-                categorized["supply"].append(item)
-                matched = True
-            if any(kw.lower() in text for kw in demand_kw):
-                categorized["demand"].append(item)
-                matched = True
+            for category in ("policy", "supply", "demand"):
+                if item_hits[category]:
+                    categorized[category].append((item, item_sentiment))
+                    matched = True
             if not matched:
-                categorized["other"].append(item)
+                categorized["other"].append((item, item_sentiment))
 
         return categorized
 
-    def _analyze_category(self, items: List[Dict], category_name: str) -> Dict:
-        """Analyze a category of news items"""
-        if not items:
+    def _analyze_category(self, entries: List[tuple], category_name: str) -> Dict:
+        """Analyze a category of (news item, sentiment) entries"""
+        if not entries:
             return {
                 "category": category_name,
                 "count": 0,
@@ -157,17 +169,10 @@ class NewsManager(TaskManager):
                 "headlines": [],
             }
 
-        # Sentiment scoring based on keywords
-        bullish_words = ["rise", "surge", "increase", "strong", "shortage", "rally", "gain", "boost", "demand", "growth"]
-        bearish_words = ["fall", "drop", "decline", "weak", "surplus", "slump", "loss", "cut", "slowdown", "oversupply"]
-
-        bullish_count = 0
-        bearish_count = 0
-
-        for item in items:
-            text = (item.get("title", "") + " " + item.get("description", "")).lower()
-            bullish_count += sum(1 for word in bullish_words if word in text)
-            bearish_count += sum(1 for word in bearish_words if word in text)
+        # Weighted lexicon sentiment (negation-aware)
+        items = [item for item, _ in entries]
+        bullish_count = round(sum(s["bullish"] for _, s in entries), 2)
+        bearish_count = round(sum(s["bearish"] for _, s in entries), 2)
 
         # Calculate score (-2 to +2 range)
         if bullish_count + bearish_count > 0:
@@ -191,18 +196,14 @@ class NewsManager(TaskManager):
             "headlines": [item.get("title", "")[:100] for item in items[:3]],
             "bullish_signals": bullish_count,
             "bearish_signals": bearish_count,
+            # Sentiment counts each story once; how widely it was carried is reported separately
+            "syndication": sum(item.get("syndication", 1) for item in items),
         }
 
-    def _analyze_geopolitical(self, news_items: List[Dict], themes: Dict) -> Dict:
+    def _analyze_geopolitical(self, news_items: List[Dict], hits: List[Dict], themes: Dict) -> Dict:
         """Analyze geopolitical factors"""
         key_regions = themes.get("key_regions", [])
-        geopolitical_keywords = ["war", "conflict", "sanction", "trade war", "tension", "crisis", "embargo"]
-
-        geo_items = []
-        for item in news_items:
-            text = (item.get("title", "") + " " + item.get("description", "")).lower()
-            if any(kw in text for kw in geopolitical_keywords):
-                geo_items.append(item)
+        geo_items = [item for item, item_hits in zip(news_items, hits) if item_hits["geopolitical"]]
 
         score = 0
         if len(geo_items) >= 3:
@@ -220,16 +221,16 @@ class NewsManager(TaskManager):
             "severity": "high" if len(geo_items) >= 3 else "medium" if geo_items else "low",
         }
 
-    def _identify_key_events(self, news_items: List[Dict]) -> List[Dict]:
+    def _identify_key_events(self, news_items: List[Dict], hits: List[Dict], themes: Dict) -> List[Dict]:
         """Identify key upcoming or recent events from news"""
         events = []
 
         # Extract events from news titles
-        event_keywords = ["announce", "report", "decision", "meeting", "data", "release", "forecast"]
-
-        for item in news_items[:10]:
+        matcher = self._get_matcher(themes)
+        for item, item_hits in zip(news_items[:10], hits):
             title = item.get("title", "")
-            if any(kw in title.lower() for kw in event_keywords):
+            # Only titles count; re-check the (short) title when the article matched at all
+            if item_hits["event"] and matcher.match(title)["event"]:
                 events.append({
                     "event": title[:80],
                     "source": item.get("source", "News"),
@@ -238,6 +239,23 @@ class NewsManager(TaskManager):
 
         return events[:5]
 
+    def _analyze_syndication(self, news_items: List[Dict]) -> Dict:
+        """How widely the collapsed stories were carried across outlets"""
+        breadth = [item.get("syndication", 1) for item in news_items]
+        if not breadth:
+            return {"stories": 0, "articles": 0, "mean_breadth": 0, "widely_carried": []}
+
+        widely_carried = sorted(news_items, key=lambda item: item.get("syndication", 1), reverse=True)
+        return {
+            "stories": len(breadth),
+            "articles": sum(breadth),
+            "mean_breadth": round(sum(breadth) / len(breadth), 2),
+            "widely_carried": [
+                {"title": item.get("title", "")[:100], "outlets": item.get("syndication", 1)}
+                for item in widely_carried[:3] if item.get("syndication", 1) > 1
+            ],
+        }
+
     def _generate_summary(self, score: float, policy: Dict, supply: Dict, news_count: int) -> str:
         """Generate news summary"""
         outlook = "neutral"
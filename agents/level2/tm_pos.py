@@ -13,7 +13,12 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from .base import TaskManager
+from core.crowding import latest_crowding, load_crowding
+from core.cta import latest_cta, position_score
 from core.data_fetch import DataFetcher
+from core.history import cot_arrays
+from core.positioning import LOOKBACKS, latest_positioning
+from core.params import POS_PARAMS
 
 
 class PositioningManager(TaskManager):
@@ -23,6 +28,7 @@ class PositioningManager(TaskManager):
     """
 
     MODULE_NAME = "tm_pos"
+    PARAMS = POS_PARAMS
 
     # COT categories
     COT_CATEGORIES = {
@@ -37,12 +43,24 @@ class PositioningManager(TaskManager):
         fetcher = DataFetcher(self.commodity, force_refresh=self.force_refresh)
         cot_data = fetcher.fetch_cot_data()
         price_data = fetcher.fetch_price_data()
+        # Full daily history: the CTA lookbacks (tunable) can exceed the 1-year price feed
+        price_history = fetcher.fetch_price_history()
+        # Five years of weekly reports for the 1/3/5-year percentiles
+        cot_history = fetcher.fetch_cot_history(years=5)
+        # Composite crowding history, rebuilt once per COT release / price bar
+        crowding = load_crowding(
+            self.commodity_key, self.params["cta_windows"], self.force_refresh,
+            cot_window=self.params["cot_window"],
+        )
 
         return {
             "commodity": self.commodity,
             "fetched_at": datetime.now().isoformat(),
             "cot_data": cot_data,
+            "cot_history": cot_history,
             "price_data": price_data,
+            "price_history": price_history,
+            "crowding": crowding,
             "sources": ["CFTC COT Reports", "CTA Positioning Estimates"],
         }
 
@@ -51,17 +69,24 @@ class PositioningManager(TaskManager):
         cot_data = data.get("cot_data", {})
         price_data = data.get("price_data", {})
 
+        # Rolling percentiles / z-scores for every trader category, plus the
+        # tuned cot_window percentile the spec and contrarian signals use
+        positioning = latest_positioning(
+            cot_arrays(data.get("cot_history", {})),
+            {**LOOKBACKS, "signal": self.params["cot_window"]},
+        )
+
         # Analyze COT positioning
-        cot_analysis = self._analyze_cot(cot_data)
+        cot_analysis = self._analyze_cot(cot_data, positioning)
 
         # Analyze spec positioning
-        spec_analysis = self._analyze_spec_positioning(cot_data)
+        spec_analysis = self._analyze_spec_positioning(cot_data, positioning)
 
         # Estimate CTA positioning based on price trends
-        cta_analysis = self._estimate_cta_positioning(price_data)
+        cta_analysis = self._estimate_cta_positioning(data.get("price_history") or {}, price_data)
 
-        # Analyze crowding
-        crowding_analysis = self._analyze_crowding(cot_data)
+        # Analyze crowding (composite OI / managed money / CTA / attention index)
+        crowding_analysis = self._analyze_crowding(data.get("crowding", {}))
 
         # Calculate contrarian signals
         contrarian = self._calculate_contrarian_signals(spec_analysis, crowding_analysis)
@@ -73,7 +98,7 @@ class PositioningManager(TaskManager):
             crowding_analysis.get("score", 0),
             contrarian.get("score", 0),
         ]
-        weights = [0.35, 0.25, 0.2, 0.2]
+        weights = self.params["pos_weights"]
         overall_score = sum(s * w for s, w in zip(scores, weights))
 
         return {
@@ -88,14 +113,20 @@ class PositioningManager(TaskManager):
             "data_available": cot_data.get("data_found", False),
         }
 
-    def _analyze_cot(self, cot_data: Dict) -> Dict:
+    def _analyze_cot(self, cot_data: Dict, positioning: Dict = None) -> Dict:
         """Analyze overall COT data"""
+        categories = (positioning or {}).get("categories", {})
+        category_stats = {
+            label: categories[key] for key, label in self.COT_CATEGORIES.items() if key in categories
+        }
+
         if not cot_data.get("data_found"):
             return {
                 "data_source": "CFTC Disaggregated Futures",
-                "report_date": "N/A",
-                "data_status": "Data not available for this commodity",
+                "report_date": (positioning or {}).get("report_date", "N/A"),
+                "data_status": "Data not available for this commodity" if not category_stats else "History only",
                 "categories_tracked": list(self.COT_CATEGORIES.values()),
+                "category_stats": category_stats,
             }
 
         managed_money = cot_data.get("managed_money", {})
@@ -111,12 +142,14 @@ class PositioningManager(TaskManager):
             "producer_net": producer.get("net"),
             "swap_dealer_net": swap.get("net"),
             "open_interest": cot_data.get("open_interest"),
-            "historical_weeks": cot_data.get("historical_count", 0),
+            "historical_weeks": (positioning or {}).get("weeks", cot_data.get("historical_count", 0)),
+            "category_stats": category_stats,
         }
 
-    def _analyze_spec_positioning(self, cot_data: Dict) -> Dict:
+    def _analyze_spec_positioning(self, cot_data: Dict, positioning: Dict = None) -> Dict:
         """Analyze speculative positioning (managed money)"""
-        if not cot_data.get("data_found"):
+        history = (positioning or {}).get("categories", {}).get("managed_money", {})
+        if not cot_data.get("data_found") and history.get("net") is None:
             return {
                 "category": "Managed Money",
                 "net_position": "N/A",
@@ -125,22 +158,27 @@ class PositioningManager(TaskManager):
             }
 
         managed_money = cot_data.get("managed_money", {})
-        net = managed_money.get("net", 0)
-        change = managed_money.get("change", 0)
-        percentile = managed_money.get("percentile_52w")
+        net = managed_money.get("net", history.get("net", 0))
+        change = managed_money.get("change", history.get("delta", 0))
+        window = self.params["cot_window"]
+        percentile = history.get("percentile_signal")
+        if percentile is None and window == 52:
+            # Snapshot percentile is 52-week, only a stand-in for the default window
+            percentile = managed_money.get("percentile_52w")
+        very_short, short, long, very_long = self.params["cot_cutoffs"]
 
         # Determine assessment based on percentile
         if percentile is not None:
-            if percentile >= 80:
+            if percentile >= very_long:
                 assessment = "Extremely long - contrarian bearish signal"
                 score = -0.8
-            elif percentile >= 60:
+            elif percentile >= long:
                 assessment = "Moderately long - some crowding risk"
                 score = -0.3
-            elif percentile <= 20:
+            elif percentile <= very_short:
                 assessment = "Extremely short - contrarian bullish signal"
                 score = 0.8
-            elif percentile <= 40:
+            elif percentile <= short:
                 assessment = "Moderately short - potential for covering rally"
                 score = 0.3
             else:
@@ -162,142 +200,126 @@ class PositioningManager(TaskManager):
             "category": "Managed Money",
             "net_position": net,
             "position_change": change,
-            "percentile_52w": percentile,
+            "percentile": percentile,
+            "percentile_window_weeks": window,
+            "percentile_1y": history.get("percentile_1y"),
+            "percentile_3y": history.get("percentile_3y"),
+            "percentile_5y": history.get("percentile_5y"),
+            "zscore_1y": history.get("zscore_1y"),
+            "zscore_3y": history.get("zscore_3y"),
             "long_contracts": managed_money.get("long"),
             "short_contracts": managed_money.get("short"),
             "assessment": assessment,
             "score": round(score, 1),
         }
 
-    def _estimate_cta_positioning(self, price_data: Dict) -> Dict:
-        """Estimate CTA/trend-follower positioning based on price trends"""
-        prices = price_data.get("prices", [])
+    def _estimate_cta_positioning(self, price_history: Dict, price_data: Dict) -> Dict:
+        """Estimate CTA/trend-follower positioning with the replication model"""
+        # Same full history the crowding index and backtest replicate on;
+        # the 1-year feed is only a fallback when the archive is unavailable
+        prices = price_history.get("prices") or price_data.get("prices", [])
+        closes = [p["close"] for p in prices if p.get("close")]
+        lookbacks = self.params["cta_windows"]
+        model = latest_cta(closes, lookbacks)
 
-        if len(prices) < 60:
+        if "error" in model:
             return {
-                "methodology": "Trend-following model estimate",
+                "methodology": "Trend-following replication model",
                 "estimated_position": "Unknown",
                 "confidence": "Low",
                 "score": 0,
+                "note": model["error"],
             }
 
-        closes = [p["close"] for p in prices if p.get("close")]
-
-        # Calculate moving averages
-        ma_20 = sum(closes[-20:]) / 20 if len(closes) >= 20 else None
-        ma_50 = sum(closes[-50:]) / 50 if len(closes) >= 50 else None
-        ma_200 = sum(closes[-200:]) / 200 if len(closes) >= 200 else None
-
-        latest = closes[-1]
-
-        # CTA positioning estimate based on MA alignment
-        bullish_signals = 0
-        bearish_signals = 0
-
-        if ma_20 and latest > ma_20:
-            bullish_signals += 1
-        elif ma_20:
-            bearish_signals += 1
-
-        if ma_50 and latest > ma_50:
-            bullish_signals += 1
-        elif ma_50:
-            bearish_signals += 1
-
-        if ma_200 and latest > ma_200:
-            bullish_signals += 1
-        elif ma_200:
-            bearish_signals += 1
-
-        if bullish_signals >= 2:
-            position = "Long"
-            score = 0.3  # Trend followers long = momentum continuation
-            confidence = "Medium" if bullish_signals == 2 else "High"
-        elif bearish_signals >= 2:
-            position = "Short"
-            score = -0.3  # Trend followers short = momentum continuation
-            confidence = "Medium" if bearish_signals == 2 else "High"
-        else:
-            position = "Mixed/Flat"
-            score = 0
-            confidence = "Low"
+        position, confidence, score = position_score(model["position_pct"])
+        flip = model["flip_price"]
 
         return {
-            "methodology": "Trend-following model estimate",
+            "methodology": "Trend-following replication model",
             "estimated_position": position,
             "confidence": confidence,
+            "position_pct": model["position_pct"],
+            "change_1w": model["change_1w"],
+            "change_1m": model["change_1m"],
+            "flip_price": flip,
+            "flip_distance_pct": model["flip_distance_pct"],
             "factors_considered": [
-                f"Price vs 20-day MA: {'Above' if ma_20 and latest > ma_20 else 'Below'}",
-                f"Price vs 50-day MA: {'Above' if ma_50 and latest > ma_50 else 'Below'}",
-                f"Price vs 200-day MA: {'Above' if ma_200 and latest > ma_200 else 'Below' if ma_200 else 'N/A'}",
+                f"{lb}-day signal: {model['signals'][f'{lb}d']:+.2f} (MA flips at {model['ma_flip_levels'][f'{lb}d']})"
+                for lb in lookbacks
             ],
-            "bullish_signals": bullish_signals,
-            "bearish_signals": bearish_signals,
-            "score": score,
+            "score": score,  # Trend followers' direction = momentum continuation
+            "interpretation": (
+                f"Model CTA position {model['position_pct']:+.0f}% of max"
+                + (f", flips at {flip} ({model['flip_distance_pct']:+.1f}%)" if flip else "")
+            ),
         }
 
-    def _analyze_crowding(self, cot_data: Dict) -> Dict:
-        """Analyze position crowding"""
-        if not cot_data.get("data_found"):
+    def _analyze_crowding(self, crowding: Dict) -> Dict:
+        """Analyze position crowding from the composite crowding index"""
+        snapshot = latest_crowding(crowding, self.params["crowding_cutoffs"])
+        if "error" in snapshot:
             return {
                 "crowding_level": "Unknown",
-                "risk_assessment": "Unable to assess without COT data",
+                "risk_assessment": "Unable to assess without crowding history",
                 "score": 0,
+                "note": snapshot["error"],
             }
 
-        managed_money = cot_data.get("managed_money", {})
-        percentile = managed_money.get("percentile_52w")
-        oi = cot_data.get("open_interest", 0)
-
-        if percentile is not None:
-            if percentile >= 85 or percentile <= 15:
-                crowding = "Extreme"
-                risk = "High reversal risk"
-                score = -0.5 if percentile >= 85 else 0.5
-            elif percentile >= 70 or percentile <= 30:
-                crowding = "Elevated"
-                risk = "Moderate reversal risk"
-                score = -0.2 if percentile >= 70 else 0.2
-            else:
-                crowding = "Normal"
-                risk = "Low reversal risk"
-                score = 0
+        index = snapshot["crowding_index"]
+        level = snapshot["level"]
+        if level.startswith("Extreme"):
+            risk = "High reversal risk"
+            score = -0.5 if snapshot["side"] == "long" else 0.5
+        elif level.startswith("Crowded"):
+            risk = "Moderate reversal risk"
+            score = -0.2 if snapshot["side"] == "long" else 0.2
         else:
-            crowding = "Unknown"
-            risk = "Unable to assess"
+            risk = "Low reversal risk"
             score = 0
 
+        context = f"{snapshot['extremity_percentile']:.0f}th percentile of its history" \
+            if snapshot["extremity_percentile"] is not None else "limited history"
         return {
-            "crowding_level": crowding,
-            "percentile": percentile,
-            "open_interest": oi,
+            "crowding_level": level,
+            "crowding_index": index,
+            "side": snapshot["side"],
+            "components": snapshot["components"],
+            "change_1w": snapshot["change_1w"],
+            "change_1m": snapshot["change_1m"],
+            "year_range": [snapshot["year_low"], snapshot["year_high"]],
+            "last_as_crowded": snapshot["last_as_crowded"],
             "risk_assessment": risk,
             "score": score,
-            "interpretation": f"Managed money positioning at {percentile}th percentile" if percentile else "Percentile data unavailable",
+            "interpretation": (
+                f"Crowding index {index:.0f} ({level.lower()}, 50 = neutral); "
+                f"extremity at the {context}"
+                + (f", last this crowded on {snapshot['last_as_crowded']}" if snapshot["last_as_crowded"] else "")
+            ),
         }
 
     def _calculate_contrarian_signals(self, spec: Dict, crowding: Dict) -> Dict:
         """Calculate contrarian trading signals"""
-        percentile = spec.get("percentile_52w")
+        percentile = spec.get("percentile")
+        strong_low, low, high, strong_high = self.params["contrarian_cutoffs"]
 
         signal_strength = "Weak"
         score = 0
         direction = "None"
 
         if percentile is not None:
-            if percentile >= 90:
+            if percentile >= strong_high:
                 signal_strength = "Strong"
                 direction = "Bearish (specs extremely long)"
                 score = -1.0
-            elif percentile >= 80:
+            elif percentile >= high:
                 signal_strength = "Moderate"
                 direction = "Bearish (specs very long)"
                 score = -0.5
-            elif percentile <= 10:
+            elif percentile <= strong_low:
                 signal_strength = "Strong"
                 direction = "Bullish (specs extremely short)"
                 score = 1.0
-            elif percentile <= 20:
+            elif percentile <= low:
                 signal_strength = "Moderate"
                 direction = "Bullish (specs very short)"
                 score = 0.5
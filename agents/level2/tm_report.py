@@ -4,9 +4,18 @@ Synthesizes all module outputs into final HTML report
 """
 
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any
+import sys
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.correlation import CorrelationService, find_duplicate_signals
+from core.score_history import COMPOSITE, ScoreHistory, get_score_history, persistence
+from core.synthesis import MODULES, format_score, interpret, score_uncertainty, synthesize_outputs
 
 
 class ReportManager:
@@ -17,6 +26,7 @@ class ReportManager:
     """
 
     MODULE_NAME = "tm_report"
+    TREND_DAYS = 180          # score history shown in the trend chart
 
     # Fixed template structure per blueprint
     REPORT_SECTIONS = [
@@ -62,53 +72,36 @@ class ReportManager:
         return outputs
 
     def calculate_weighted_score(self, outputs: Dict) -> Dict:
-        """Calculate weighted overall score"""
-        weights = {
-            "tm_fund": 1.5,   # Fundamentals weighted higher
-            "tm_news": 1.0,
-            "tm_views": 1.0,
-            "tm_tech": 1.2,
-            "tm_struct": 0.8,
-            "tm_pos": 1.0,
-        }
-
-        scores = []
-        weight_sum = 0
-
-        for module, weight in weights.items():
-            output = outputs.get(module, {})
-            score = output.get("score")
-            if score is not None:
-                scores.append(score * weight)
-                weight_sum += weight
-
-        weighted_score = sum(scores) / weight_sum if weight_sum > 0 else 0
-
-        return {
-            "weighted_score": round(weighted_score, 2),
-            "modules_included": len([s for s in scores if s is not None]),
-            "interpretation": self._interpret_score(weighted_score),
-        }
+        """Calculate weighted overall score (shared engine with the PM)"""
+        return synthesize_outputs(outputs)
 
     def _interpret_score(self, score: float) -> str:
         """Interpret overall score"""
-        if score <= -3:
-            return "Strongly Bearish"
-        elif score <= -1:
-            return "Bearish"
-        elif score < 1:
-            return "Neutral"
-        elif score < 3:
-            return "Bullish"
-        else:
-            return "Strongly Bullish"
+        return interpret(score)
+
+    def load_score_history(self, history: ScoreHistory) -> Dict:
+        """Composite and module score series over TREND_DAYS, with composite persistence"""
+        start = datetime.now() - timedelta(days=self.TREND_DAYS)
+        series = {}
+        for module in [COMPOSITE] + MODULES:
+            s = history.series(self.commodity_key, module, start=start)
+            if len(s["ts"]):
+                series[module] = {
+                    "ts": [str(t) for t in s["ts"]],
+                    "score": [None if np.isnan(v) else round(float(v), 2) for v in s["score"]],
+                }
+        composite = series.get(COMPOSITE, {}).get("score", [])
+        return {
+            "series": series,
+            "persistence": persistence([np.nan if v is None else v for v in composite]),
+        }
 
     def generate_html(self, outputs: Dict, synthesis: Dict) -> str:
         """
         Generate HTML report with FIXED TEMPLATE
         This template MUST NOT change between reruns (Hard Rule #5)
         """
-        weighted = synthesis.get("weighted_score", 0)
+        weighted = synthesis.get("weighted_score")
         interpretation = synthesis.get("interpretation", "N/A")
 
         # Build HTML with fixed structure
@@ -150,12 +143,12 @@ class ReportManager:
         .score-value {{
             font-size: 4em;
             font-weight: bold;
-            color: {self._get_score_color(weighted)};
+            color: {self._get_score_color(weighted or 0)};
         }}
         .score-label {{ color: #888; font-size: 1.2em; margin-top: 10px; }}
         .interpretation {{
             font-size: 1.5em;
-            color: {self._get_score_color(weighted)};
+            color: {self._get_score_color(weighted or 0)};
             margin-top: 15px;
         }}
 
@@ -286,7 +279,7 @@ class ReportManager:
     <div class="container">
         <!-- Score Banner -->
         <div class="score-banner">
-            <div class="score-value">{weighted:+.1f}</div>
+            <div class="score-value">{format_score(weighted)}</div>
             <div class="score-label">Weighted Overall Score (-5 to +5)</div>
             <div class="interpretation">{interpretation}</div>
         </div>
@@ -374,12 +367,13 @@ class ReportManager:
             if isinstance(output, dict) and output.get("summary"):
                 summaries.append(output["summary"])
 
-        weighted = synthesis.get("weighted_score", 0)
+        weighted = synthesis.get("weighted_score")
         interpretation = synthesis.get("interpretation", "N/A")
 
         return f'''
         <div class="summary-box">
-            <p><strong>Overall Assessment:</strong> {interpretation} (Score: {weighted:+.1f})</p>
+            <p><strong>Overall Assessment:</strong> {interpretation} (Score: {format_score(weighted)})</p>
+            {self._generate_uncertainty_line(synthesis.get("uncertainty", {}))}
         </div>
         <h3>Key Findings</h3>
         <ul>
@@ -389,6 +383,71 @@ class ReportManager:
         <div class="metrics-grid">
             {self._generate_score_cards(outputs)}
         </div>
+        {self._generate_score_trend(synthesis.get("history", {}))}
+        '''
+
+    def _generate_uncertainty_line(self, uncertainty: Dict) -> str:
+        """Monte Carlo range, bucket odds and the most weight-sensitive module"""
+        if not uncertainty or "error" in uncertainty:
+            return ""
+        low, high = uncertainty["range_90"]
+        odds = ", ".join(
+            f"{label} {p:.0%}"
+            for label, p in sorted(uncertainty["bucket_probabilities"].items(), key=lambda kv: -kv[1])
+            if p >= 0.01
+        )
+        line = (
+            f"<p><strong>Score Uncertainty:</strong> 90% range {format_score(low)} to {format_score(high)} | "
+            f"{odds} | call holds in {uncertainty['same_call_prob']:.0%} of draws</p>"
+        )
+        sensitivity = uncertainty.get("sensitivity", {})
+        if sensitivity:
+            module, s = max(sensitivity.items(), key=lambda kv: abs(kv[1]["per_10pct_weight"] or 0))
+            line += (
+                f"<p><strong>Most weight-sensitive:</strong> {module} "
+                f"({s['per_10pct_weight']:+.3f} per +10% weight; score without it {format_score(s['without'])})</p>"
+            )
+        return line
+
+    def _generate_score_trend(self, history: Dict) -> str:
+        """Score trend lines (composite bold, modules thin) from the score history store"""
+        series = history.get("series", {})
+        p = history.get("persistence", {})
+        if p.get("records"):
+            note = (f"Composite {p['direction']} for the last {p['run_length']} of {p['records']} runs, "
+                    f"{p['flips']} bullish/bearish flips in {self.TREND_DAYS} days")
+        else:
+            note = "No score history yet"
+
+        traces = [
+            {
+                "x": s["ts"],
+                "y": s["score"],
+                "type": "scatter",
+                "mode": "lines+markers",
+                "name": "Composite" if module == COMPOSITE else module,
+                "line": {"width": 3, "color": "#4ecdc4"} if module == COMPOSITE else {"width": 1},
+            }
+            for module, s in series.items()
+        ]
+
+        return f'''
+        <div class="chart-container">
+            <div class="chart-title">Score History ({self.TREND_DAYS} days)</div>
+            <div id="score-trend-chart"></div>
+            <p class="metric-label">{note}</p>
+        </div>
+        <script>
+            Plotly.newPlot('score-trend-chart', {json.dumps(traces)}, {{
+                paper_bgcolor: 'rgba(0,0,0,0)',
+                plot_bgcolor: 'rgba(0,0,0,0.2)',
+                font: {{color: '#e0e0e0'}},
+                xaxis: {{gridcolor: '#333'}},
+                yaxis: {{title: 'Score', range: [-5, 5], gridcolor: '#333'}},
+                legend: {{x: 0, y: 1.15, orientation: 'h'}},
+                margin: {{t: 30, b: 40, l: 60, r: 30}}
+            }}, {{responsive: true}});
+        </script>
         '''
 
     def _generate_score_cards(self, outputs: Dict) -> str:
@@ -586,8 +645,11 @@ class ReportManager:
                 return str(val)
 
         latest_close = fmt(indicators.get("latest_close"), prefix="$")
-        rsi_14 = fmt(indicators.get("rsi_14"), decimals=1)
-        ma_60 = fmt(indicators.get("ma_60"), prefix="$")
+        rsi = fmt(indicators.get("rsi"), decimals=1)
+        rsi_period = indicators.get("rsi_period", 14)
+        ma_trend = fmt(indicators.get("ma_trend"), prefix="$")
+        # Tuned windows travel with the output (short, trend, long)
+        window = (indicators.get("ma_windows") or [20, 60, 200])[1]
         pct_high = fmt(indicators.get("pct_from_52w_high"), suffix="%", decimals=1)
 
         # Get price data for chart
@@ -596,10 +658,10 @@ class ReportManager:
         highs = price_data.get("high", [])
         lows = price_data.get("low", [])
         closes = price_data.get("close", [])
-        ma60_line = price_data.get("ma60", [])
+        ma_line = price_data.get("ma_trend", [])
 
         # Determine trend signal strength
-        rsi_value = indicators.get("rsi_14")
+        rsi_value = indicators.get("rsi")
         rsi_signal = ""
         if rsi_value is not None:
             if rsi_value > 70:
@@ -613,8 +675,8 @@ class ReportManager:
 
         # Trend strength assessment
         trend_desc = trend.get("description", "N/A")
-        above_ma = trend.get("above_60ma", False)
-        ma_signal = '<span class="highlight">ABOVE 60MA</span> - Bullish trend confirmed' if above_ma else '<span class="warning">BELOW 60MA</span> - Bearish trend confirmed'
+        above_ma = trend.get("above_trend_ma", False)
+        ma_signal = f'<span class="highlight">ABOVE {window}MA</span> - Bullish trend confirmed' if above_ma else f'<span class="warning">BELOW {window}MA</span> - Bearish trend confirmed'
 
         return f'''
         <div class="summary-box">
@@ -623,7 +685,7 @@ class ReportManager:
 
         <!-- Interactive Candlestick Chart -->
         <div class="chart-container">
-            <div class="chart-title">Price Chart with 60-Day Moving Average</div>
+            <div class="chart-title">Price Chart with {window}-Day Moving Average</div>
             <div id="candlestick-chart"></div>
         </div>
 
@@ -642,10 +704,10 @@ class ReportManager:
 
             var trace2 = {{
                 x: {json.dumps(dates[-90:] if len(dates) > 90 else dates)},
-                y: {json.dumps(ma60_line[-90:] if len(ma60_line) > 90 else ma60_line)},
+                y: {json.dumps(ma_line[-90:] if len(ma_line) > 90 else ma_line)},
                 type: 'scatter',
                 mode: 'lines',
-                name: '60-Day MA',
+                name: '{window}-Day MA',
                 line: {{color: '#ffd93d', width: 2}}
             }};
 
@@ -680,12 +742,12 @@ class ReportManager:
                 <div class="metric-label">Latest Close</div>
             </div>
             <div class="metric-card">
-                <div class="metric-value">{rsi_14}</div>
-                <div class="metric-label">RSI (14)</div>
+                <div class="metric-value">{rsi}</div>
+                <div class="metric-label">RSI ({rsi_period})</div>
             </div>
             <div class="metric-card">
-                <div class="metric-value">{ma_60}</div>
-                <div class="metric-label">60-Day MA</div>
+                <div class="metric-value">{ma_trend}</div>
+                <div class="metric-label">{window}-Day MA</div>
             </div>
             <div class="metric-card">
                 <div class="metric-value">{pct_high}</div>
@@ -705,7 +767,7 @@ class ReportManager:
         <ul class="detail-list">
             <li><strong>Resistance:</strong> 52-week high at ${fmt(indicators.get("high_52w"), decimals=2).replace("$", "")}</li>
             <li><strong>Support:</strong> 52-week low at ${fmt(indicators.get("low_52w"), decimals=2).replace("$", "")}</li>
-            <li><strong>Moving Average:</strong> 60-day MA at {ma_60} acting as {"support" if above_ma else "resistance"}</li>
+            <li><strong>Moving Average:</strong> {window}-day MA at {ma_trend} acting as {"support" if above_ma else "resistance"}</li>
         </ul>
 
         <h3>Momentum Assessment</h3>
@@ -722,11 +784,14 @@ class ReportManager:
 
     def _generate_conclusion(self, outputs: Dict, synthesis: Dict) -> str:
         """Generate conclusion section"""
-        weighted = synthesis.get("weighted_score", 0)
+        weighted = synthesis.get("weighted_score")
         interpretation = synthesis.get("interpretation", "N/A")
 
         # Determine bias and risks
-        if weighted <= -2:
+        if weighted is None:
+            bias = "No stance - insufficient module coverage"
+            key_risks = "Rerun the failed modules before acting"
+        elif weighted <= -2:
             bias = "Bearish bias warranted"
             key_risks = "Potential for short squeeze if sentiment shifts"
         elif weighted >= 2:
@@ -738,7 +803,7 @@ class ReportManager:
 
         return f'''
         <div class="summary-box">
-            <p><strong>Final Assessment:</strong> {interpretation} ({weighted:+.1f})</p>
+            <p><strong>Final Assessment:</strong> {interpretation} ({format_score(weighted)})</p>
             <p><strong>Recommended Bias:</strong> {bias}</p>
         </div>
 
@@ -749,6 +814,9 @@ class ReportManager:
             <li><strong>Key Risk:</strong> {key_risks}</li>
         </ul>
 
+        <h3>Cross-Market Overlap</h3>
+        {self._generate_overlap_section()}
+
         <h3>Watch Points</h3>
         <ul>
             <li>Monitor COT positioning for extreme readings</li>
@@ -758,6 +826,35 @@ class ReportManager:
         </ul>
         '''
 
+    def _generate_overlap_section(self) -> str:
+        """List correlated markets where this commodity's signals duplicate another's"""
+        latest = CorrelationService().latest()
+        if latest is None or self.commodity_key not in latest["commodities"]:
+            return "<p>Correlation data not available (run <code>python run.py --correlations</code>)</p>"
+
+        duplicates = [
+            d for d in find_duplicate_signals(latest, self.project_root / "modules")
+            if self.commodity_key in d["pair"]
+        ]
+        if not duplicates:
+            return f"<p>No module signals duplicated in correlated markets ({latest['window']}-day window, as of {latest['as_of']}).</p>"
+
+        items = []
+        for d in duplicates:
+            other = d["pair"][1] if d["pair"][0] == self.commodity_key else d["pair"][0]
+            modules = ", ".join(m.replace("tm_", "").upper() for m in d["modules"])
+            items.append(
+                f"<li><strong>{other.replace('_', ' ').title()}</strong> "
+                f"(correlation {d['correlation']:+.2f}): same call from {modules}</li>"
+            )
+
+        return f'''
+        <ul class="detail-list">
+            {"".join(items)}
+        </ul>
+        <p><em>{latest['window']}-day return correlation as of {latest['as_of']}: these signals are one bet, not independent confirmation.</em></p>
+        '''
+
     def _count_debate_rounds(self, outputs: Dict) -> int:
         """Count total debate rounds across all modules"""
         total = 0
@@ -773,6 +870,13 @@ class ReportManager:
 
         # Calculate synthesis
         synthesis = self.calculate_weighted_score(outputs)
+        synthesis["uncertainty"] = score_uncertainty(outputs)
+
+        # Record the composite, then read the trends (this run included)
+        history = get_score_history()
+        history.record(self.commodity_key, COMPOSITE, synthesis["weighted_score"],
+                       interpretation=synthesis["interpretation"])
+        synthesis["history"] = self.load_score_history(history)
 
         # Generate HTML
         html = self.generate_html(outputs, synthesis)
@@ -9,10 +9,20 @@ from pathlib import Path
 from typing import Dict, List
 import sys
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from .base import TaskManager
+from core.anomaly import ANOMALY_Z, NOTABLE_Z, AnomalyMonitor, classify
+from core.crowding import latest_crowding, load_crowding
+from core.curve import CurveStore, latest_term_structure
 from core.data_fetch import DataFetcher
+from core.liquidity import latest_liquidity
+from core.history import cot_arrays
+from core.open_interest import latest_oi_snapshot
+from core.params import POS_PARAMS, load_params
+from core.volatility import latest_regime
 
 
 class StructureManager(TaskManager):
@@ -27,12 +37,42 @@ class StructureManager(TaskManager):
         """Fetch market structure data"""
         fetcher = DataFetcher(self.commodity, force_refresh=self.force_refresh)
         price_data = fetcher.fetch_price_data()
+        # Aggregate OI history comes from the COT Open_Interest column
+        cot_history = fetcher.fetch_cot_history(years=1)
+        # Volume / OI-change baselines persist across runs (shared with --watch)
+        anomaly = self._update_anomalies(fetcher, price_data.get("prices", []), cot_history)
+        # Curve history accumulates in the store across runs
+        curve = CurveStore().merge(self.commodity_key, fetcher.fetch_curve_data())
+        # Shared with TM-POS (same CTA lookbacks and COT window, so the same cached series)
+        pos_params = load_params(self.commodity_key, POS_PARAMS)
+        crowding = load_crowding(
+            self.commodity_key, pos_params["cta_windows"], self.force_refresh,
+            cot_window=pos_params["cot_window"],
+        )
 
         return {
             "commodity": self.commodity,
             "fetched_at": datetime.now().isoformat(),
             "price_data": price_data,
-            "sources": ["Yahoo Finance", "Exchange Data"],
+            "cot_history": cot_history,
+            "curve": curve,
+            "crowding": crowding,
+            "crowding_cutoffs": pos_params["crowding_cutoffs"],
+            "anomaly": anomaly,
+            "sources": ["Yahoo Finance", "Exchange Data", "CFTC COT Reports"],
+        }
+
+    def _update_anomalies(self, fetcher: DataFetcher, prices: List, cot_history: Dict) -> Dict:
+        """Feed new bars to the persisted AnomalyMonitor; returns its latest scored bars"""
+        monitor = AnomalyMonitor(self.commodity_key)
+        if monitor.needs_history(prices):
+            # First run (or a gap since the last one) seeds the baseline from full history
+            prices = fetcher.fetch_price_history().get("prices") or prices
+        events = monitor.update(prices, cot_history, live=True)
+        monitor.save()
+        return {
+            "recent": monitor.recent,
+            "live": [e for e in events if e["live"]],
         }
 
     def analyze(self, data: Dict) -> Dict:
@@ -47,27 +87,39 @@ class StructureManager(TaskManager):
                 "sources": data.get("sources", []),
             }
 
+        # Volume z-scores of the last week vs the persisted seasonal baseline
+        anomaly = data.get("anomaly", {})
+        volume_z = self._recent_volume_z(anomaly)
+
         # Analyze volume patterns
-        volume_analysis = self._analyze_volume(prices)
+        volume_analysis = self._analyze_volume(prices, volume_z)
 
-        # Analyze market attention (volume trends)
-        attention_analysis = self._analyze_attention(prices)
+        # Analyze market attention (volume / OI-change anomalies)
+        attention_analysis = self._analyze_attention(volume_z, anomaly)
 
         # Analyze liquidity
         liquidity_analysis = self._analyze_liquidity(prices)
 
-        # Calculate crowding (simplified - would use OI data)
-        crowding_analysis = self._analyze_crowding(prices)
+        # Composite crowding index, with the latest OI change, as context only
+        crowding_analysis = self._analyze_crowding(
+            data.get("crowding", {}), data.get("cot_history", {}), data.get("crowding_cutoffs"),
+        )
+
+        # Analyze the futures curve (roll yield, slope, curvature)
+        term_structure = self._analyze_term_structure(data.get("curve", {}))
+
+        # Volatility regime - volume surges are less informative in stressed markets
+        volatility = latest_regime(prices)
 
-        # Weighted score
+        # Weighted score (crowding is scored once, in TM-POS)
         scores = [
             volume_analysis.get("score", 0),
             attention_analysis.get("score", 0),
             liquidity_analysis.get("score", 0),
-            crowding_analysis.get("score", 0),
+            term_structure.get("score", 0),
         ]
-        weights = [0.3, 0.25, 0.25, 0.2]
-        overall_score = sum(s * w for s, w in zip(scores, weights))
+        weights = [0.25, 0.2, 0.2, 0.2]
+        overall_score = sum(s * w for s, w in zip(scores, weights)) * volatility["scaling"]
 
         return {
             "score": round(overall_score, 1),
@@ -76,112 +128,194 @@ class StructureManager(TaskManager):
             "attention_analysis": attention_analysis,
             "liquidity_analysis": liquidity_analysis,
             "crowding_analysis": crowding_analysis,
+            "term_structure_analysis": term_structure,
+            "volatility_analysis": volatility,
             "sources": data.get("sources", []),
         }
 
-    def _analyze_volume(self, prices: List) -> Dict:
-        """Analyze volume patterns"""
-        volumes = [p.get("volume", 0) for p in prices if p.get("volume")]
-
-        if not volumes or len(volumes) < 20:
-            return {"score": 0, "status": "Insufficient volume data"}
+    def _recent_volume_z(self, anomaly: Dict, days: int = 5) -> List[float]:
+        """Robust volume z of the last `days` bars (learned bars plus today's live bar)"""
+        events = anomaly.get("recent", {}).get("volume", []) + [
+            e for e in anomaly.get("live", []) if e["series"] == "volume"
+        ]
+        return [e["robust_z"] for e in events[-days:]]
 
-        # Calculate averages
-        avg_5d = sum(volumes[-5:]) / 5 if len(volumes) >= 5 else 0
-        avg_20d = sum(volumes[-20:]) / 20 if len(volumes) >= 20 else 0
+    def _analyze_volume(self, prices: List, volume_z: List[float]) -> Dict:
+        """Analyze volume level: mean robust z of the last week vs the seasonal baseline"""
+        if not volume_z:
+            return {"score": 0, "status": "Volume baseline still warming up"}
 
-        # Volume trend
-        volume_ratio = avg_5d / avg_20d if avg_20d > 0 else 1
+        # Sustained level (mean), not a single spike - spikes are scored as attention
+        mean_z = float(np.mean(volume_z))
 
         score = 0
         trend = "Normal"
 
-        if volume_ratio > 1.5:
+        if mean_z >= NOTABLE_Z:
             score = 0.5  # High volume - increased attention
             trend = "Elevated"
-        elif volume_ratio > 1.2:
+        elif mean_z >= 1:
             score = 0.25
             trend = "Above average"
-        elif volume_ratio < 0.7:
+        elif mean_z <= -1:
             score = -0.25
             trend = "Below average"
 
+        # 5-day vs 20-day average, as context only
+        volumes = [p.get("volume", 0) for p in prices if p.get("volume")]
+        avg_5d = sum(volumes[-5:]) / 5 if len(volumes) >= 5 else None
+        avg_20d = sum(volumes[-20:]) / 20 if len(volumes) >= 20 else None
+
         return {
             "avg_5d_volume": avg_5d,
             "avg_20d_volume": avg_20d,
-            "volume_ratio": round(volume_ratio, 2),
+            "volume_ratio": round(avg_5d / avg_20d, 2) if avg_5d and avg_20d else None,
+            "mean_zscore": round(mean_z, 2),
             "trend": trend,
             "score": score,
-            "interpretation": f"5-day volume {volume_ratio:.1%} of 20-day average",
+            "interpretation": f"Last {len(volume_z)} sessions average z {mean_z:+.2f} vs seasonal baseline",
         }
 
-    def _analyze_attention(self, prices: List) -> Dict:
-        """Analyze market attention metrics"""
-        # Use volume changes as proxy for attention
-        volumes = [p.get("volume", 0) for p in prices[-10:] if p.get("volume")]
-
-        if len(volumes) < 5:
+    def _analyze_attention(self, volume_z: List[float], anomaly: Dict) -> Dict:
+        """Analyze market attention: volume and OI-change z-scores vs a seasonal baseline"""
+        if not volume_z:
             return {"score": 0, "status": "Insufficient data"}
 
-        # Check for volume spikes
-        avg_vol = sum(volumes) / len(volumes)
-        max_vol = max(volumes)
-        spike_ratio = max_vol / avg_vol if avg_vol > 0 else 1
+        # Strongest volume surprise of the last week
+        volume_z = max(volume_z)
+        volume_status = classify(volume_z)
+
+        oi_events = anomaly.get("recent", {}).get("oi_change", [])
+        oi_z = oi_events[-1]["robust_z"] if oi_events else None
 
+        # Volume surges (not lulls) and OI moves either way draw attention
+        oi_surprise = abs(oi_z) if oi_z is not None else 0
         attention_level = "Normal"
         score = 0
-
-        if spike_ratio > 2:
-            attention_level = "High (volume spike detected)"
+        if volume_z >= ANOMALY_Z or oi_surprise >= ANOMALY_Z:
+            attention_level = "High (volume/OI anomaly detected)"
             score = 0.5
-        elif spike_ratio > 1.5:
+        elif volume_z >= NOTABLE_Z or oi_surprise >= NOTABLE_Z:
             attention_level = "Elevated"
             score = 0.25
 
         return {
             "attention_level": attention_level,
-            "volume_spike_ratio": round(spike_ratio, 2),
+            "volume_zscore": round(volume_z, 2),
+            "volume_status": volume_status,
+            "oi_change_zscore": oi_z,
             "score": score,
-            "interpretation": "Market attention based on volume patterns",
+            "interpretation": "Robust z-scores vs seasonality-adjusted median/MAD baseline",
         }
 
     def _analyze_liquidity(self, prices: List) -> Dict:
-        """Analyze market liquidity"""
-        # Use volume as proxy for liquidity
-        recent_volumes = [p.get("volume", 0) for p in prices[-20:] if p.get("volume")]
+        """Analyze market liquidity (Amihud, Roll, Corwin-Schultz, dollar volume)"""
+        liquidity = latest_liquidity(prices)
+        illiquidity = liquidity.get("illiquidity_percentile")
+        if "error" in liquidity or illiquidity is None:
+            return {"score": 0, "status": liquidity.get("error", "Not enough history for liquidity percentiles")}
+
+        # Thin markets make moves less reliable and exits costlier
+        assessment = "Normal"
+        score = 0
+        if illiquidity >= 80:
+            assessment = "Thin"
+            score = -0.5
+        elif illiquidity >= 65:
+            assessment = "Below normal"
+            score = -0.25
+        elif illiquidity <= 20:
+            assessment = "Deep"
+            score = 0.25
 
-        if not recent_volumes:
-            return {"score": 0, "status": "No volume data"}
+        return {
+            **liquidity,
+            "liquidity_assessment": assessment,
+            "score": score,
+            "note": f"Illiquidity at {illiquidity:.0f}th percentile of its history "
+                    f"(Roll spread {liquidity['roll_spread_pct']}%, CS spread {liquidity['cs_spread_pct']}%)",
+        }
 
-        avg_volume = sum(recent_volumes) / len(recent_volumes)
+    def _analyze_crowding(self, crowding: Dict, cot_history: Dict, cutoffs: List[float] = None) -> Dict:
+        """
+        Market crowding context from the composite index and the 5-day OI
+        change. Not scored here: TM-POS scores the same index (same cutoffs)
+        """
+        snapshot = latest_crowding(crowding, cutoffs)
+        if "error" in snapshot:
+            return {
+                "crowding_assessment": "Crowding history not available",
+                "crowding_index": "N/A",
+                "score": 0,
+                "note": snapshot["error"],
+            }
 
-        # Liquidity assessment (simplified)
-        liquidity = "Normal"
-        score = 0
+        index = snapshot["crowding_index"]
+        level = snapshot["level"]
 
-        if avg_volume > 0:
-            # Higher volume = better liquidity
-            liquidity = "Adequate"
-            score = 0
+        oi = latest_oi_snapshot(cot_arrays(cot_history))
+        if "error" in oi or oi.get("change_pct") is None:
+            change_note = "5-day OI change N/A"
+        elif oi["change_significant"]:
+            direction = "inflow" if oi["change_pct"] > 0 else "outflow"
+            change_note = f"Significant 5-day OI {direction} ({oi['change_pct']:+.1f}%, z={oi['change_zscore']:+.1f})"
+        else:
+            change_note = f"5-day OI change {oi['change_pct']:+.1f}% not significant"
 
         return {
-            "average_volume": avg_volume,
-            "liquidity_assessment": liquidity,
-            "score": score,
-            "note": "Liquidity appears adequate for normal trading",
+            "crowding_assessment": level,
+            "crowding_index": index,
+            "side": snapshot["side"],
+            "components": snapshot["components"],
+            "extremity_percentile": snapshot["extremity_percentile"],
+            "last_as_crowded": snapshot["last_as_crowded"],
+            "open_interest": oi,
+            "score": 0,
+            "scored_in": "tm_pos",
+            "note": f"Crowding index {index:.0f} (50 = neutral, OI at the "
+                    f"{snapshot['components']['oi_percentile'] or 0:.0f}th percentile). {change_note}",
         }
 
-    def _analyze_crowding(self, prices: List) -> Dict:
-        """Analyze market crowding (simplified)"""
-        # Full analysis would require open interest data from exchanges
-        # This provides the framework
+    def _analyze_term_structure(self, curve: Dict) -> Dict:
+        """Analyze carry and curve shape from the stored futures curve"""
+        ts = latest_term_structure(curve)
+        roll_yield = ts.get("roll_yield_pct")
+        if "error" in ts or roll_yield is None:
+            return {
+                "curve_available": False,
+                "score": 0,
+                "note": ts.get("error", "Not enough listed contracts for a 1M/3M roll yield"),
+            }
+
+        shape = "Backwardation" if roll_yield > 0 else "Contango"
+        percentile = ts.get("roll_yield_pct_percentile")
+
+        # Backwardation = tight prompt market and positive carry for longs
+        carry_score = 0.25 if roll_yield > 0 else -0.25
+        if percentile is not None and percentile >= 80:
+            carry_score = 0.5
+        elif percentile is not None and percentile <= 20:
+            carry_score = -0.5
+
+        # Prompt tightening relative to the back of the curve
+        slope_percentile = ts.get("slope_pct_percentile")
+        shape_score = 0
+        if slope_percentile is not None and slope_percentile <= 20:
+            shape_score = 0.25
+        elif slope_percentile is not None and slope_percentile >= 80:
+            shape_score = -0.25
 
         return {
-            "oi_available": False,
-            "crowding_assessment": "Requires exchange OI data",
-            "percentile": "N/A",
-            "score": 0,
-            "note": "Full crowding analysis requires COT/exchange OI data",
+            "curve_available": True,
+            "shape": shape,
+            "carry_score": carry_score,
+            "shape_score": shape_score,
+            "score": carry_score + shape_score,
+            **ts,
+            "interpretation": (
+                f"{shape}: annualized 1M/3M roll yield {roll_yield:+.1f}%"
+                + (f" ({percentile:.0f}th percentile)" if percentile is not None else "")
+            ),
         }
 
     def _generate_summary(self, score: float, volume: Dict, attention: Dict) -> str:
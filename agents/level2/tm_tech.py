@@ -12,44 +12,61 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from .base import TaskManager
+from core.cascade import market_cascades
 from core.data_fetch import DataFetcher, calculate_technical_indicators
+from core.history import cot_arrays, price_arrays
+from core.params import TECH_PARAMS
+from core.volatility import latest_regime
 
 
 class TechnicalManager(TaskManager):
     """
     Technical Analysis Task Manager
-    Scope: Trend (60MA), momentum, support/resistance, key triggers
+    Scope: Trend (trend/long MAs), momentum, support/resistance, key triggers
     """
 
     MODULE_NAME = "tm_tech"
+    PARAMS = TECH_PARAMS
 
     def fetch_data(self) -> Dict:
         """Fetch price data for technical analysis"""
         fetcher = DataFetcher(self.commodity, force_refresh=self.force_refresh)
         price_data = fetcher.fetch_price_data()
+        # Full daily history: the tuned MA windows can exceed the 1-year feed
+        price_history = fetcher.fetch_price_history()
+        # Recent COT weeks locate managed-money stop zones
+        cot_history = fetcher.fetch_cot_history(years=1)
+
+        sources = ["Yahoo Finance"]
+        if cot_history.get("records"):
+            sources.append("CFTC COT Reports")
 
         return {
             "commodity": self.commodity,
             "fetched_at": datetime.now().isoformat(),
             "price_data": price_data,
-            "sources": ["Yahoo Finance"],
+            "price_history": price_history,
+            "cot_history": cot_history,
+            "sources": sources,
         }
 
     def analyze(self, data: Dict) -> Dict:
         """Perform technical analysis"""
         price_data = data.get("price_data", {})
         prices = price_data.get("prices", [])
+        # Indicators on the full history (same series the backtest tuned on)
+        full_prices = self._full_prices(data.get("price_history") or {}, prices)
 
-        if not prices or len(prices) < 60:
+        if not prices or len(full_prices) < self.params["ma_trend"]:
             return {
                 "score": 0,
                 "summary": "Insufficient price data for technical analysis",
-                "error": "Need at least 60 days of price data",
+                "error": f"Need at least {self.params['ma_trend']} days of price data",
                 "sources": data.get("sources", []),
             }
 
         # Calculate technical indicators
-        indicators = calculate_technical_indicators(prices)
+        indicators = calculate_technical_indicators(full_prices, self.params)
 
         # Analyze trend
         trend_analysis = self._analyze_trend(indicators, prices)
@@ -60,8 +77,18 @@ class TechnicalManager(TaskManager):
         # Identify key levels
         key_levels = self._identify_key_levels(prices, indicators)
 
+        # Find clustered levels that could trigger one another
+        cascades = market_cascades(
+            price_arrays({"prices": full_prices}),
+            cot_arrays(data.get("cot_history", {})),
+            indicators.get("ma_windows"),
+        )
+
         # Identify triggers
-        triggers = self._identify_triggers(indicators, key_levels)
+        triggers = self._identify_triggers(indicators, key_levels, cascades)
+
+        # Volatility regime - scales how much the price signals mean
+        volatility = latest_regime(prices)
 
         # Calculate overall score
         scores = [
@@ -69,11 +96,11 @@ class TechnicalManager(TaskManager):
             momentum_analysis.get("score", 0),
             key_levels.get("score", 0),
         ]
-        weights = [0.4, 0.35, 0.25]
-        overall_score = sum(s * w for s, w in zip(scores, weights))
+        weights = self.params["tech_weights"]
+        overall_score = sum(s * w for s, w in zip(scores, weights)) * volatility["scaling"]
 
         # Prepare price data for candlestick chart
-        chart_data = self._prepare_chart_data(prices, indicators.get("ma_60"))
+        chart_data = self._prepare_chart_data(prices, self.params["ma_trend"])
 
         return {
             "score": round(overall_score, 1),
@@ -84,31 +111,42 @@ class TechnicalManager(TaskManager):
             "momentum_analysis": momentum_analysis,
             "key_levels": key_levels,
             "triggers": triggers,
+            "cascades": cascades,
+            "volatility": volatility,
             "price_data": chart_data,
             "sources": data.get("sources", []),
         }
 
+    def _full_prices(self, price_history: Dict, prices: List) -> List:
+        """Archive bars before the recent feed, then the feed (falls back to the feed)"""
+        if not prices:
+            return price_history.get("prices", [])
+        first = prices[0].get("date", "")
+        older = [p for p in price_history.get("prices", []) if p.get("date", "") < first]
+        return older + prices
+
     def _analyze_trend(self, indicators: Dict, prices: List) -> Dict:
         """Analyze price trend"""
         latest = indicators.get("latest_close", 0)
-        ma_60 = indicators.get("ma_60")
-        ma_200 = indicators.get("ma_200")
-        above_60ma = indicators.get("above_60ma")
+        ma_trend = indicators.get("ma_trend")
+        ma_long = indicators.get("ma_long")
+        above_trend_ma = indicators.get("above_trend_ma")
+        window = self.params["ma_trend"]
 
         # Determine trend score
         score = 0
         trend_description = "Neutral"
 
-        if above_60ma is True:
+        if above_trend_ma is True:
             score = 1
-            trend_description = "Bullish - Above 60MA"
-        elif above_60ma is False:
+            trend_description = f"Bullish - Above {window}MA"
+        elif above_trend_ma is False:
             score = -1
-            trend_description = "Bearish - Below 60MA"
+            trend_description = f"Bearish - Below {window}MA"
 
         # Check MA alignment
-        if ma_60 and ma_200:
-            if ma_60 > ma_200:
+        if ma_trend and ma_long:
+            if ma_trend > ma_long:
                 score += 0.5
                 trend_description += " (Golden cross territory)"
             else:
@@ -117,25 +155,26 @@ class TechnicalManager(TaskManager):
 
         return {
             "current_trend": indicators.get("trend", "neutral"),
-            "above_60ma": above_60ma,
-            "ma_60": ma_60,
-            "ma_200": ma_200,
+            "above_trend_ma": above_trend_ma,
+            "ma_trend": ma_trend,
+            "ma_long": ma_long,
+            "ma_windows": [window, self.params["ma_long"]],
             "score": score,
             "description": trend_description,
         }
 
     def _analyze_momentum(self, indicators: Dict) -> Dict:
         """Analyze momentum indicators"""
-        rsi = indicators.get("rsi_14")
+        rsi = indicators.get("rsi")
 
         score = 0
         momentum_state = "Neutral"
 
         if rsi:
-            if rsi >= 70:
+            if rsi >= self.params["rsi_overbought"]:
                 score = -1  # Overbought - bearish signal
                 momentum_state = "Overbought"
-            elif rsi <= 30:
+            elif rsi <= self.params["rsi_oversold"]:
                 score = 1  # Oversold - bullish signal
                 momentum_state = "Oversold"
             elif rsi >= 50:
@@ -146,7 +185,8 @@ class TechnicalManager(TaskManager):
                 momentum_state = "Bearish momentum"
 
         return {
-            "rsi_14": rsi,
+            "rsi": rsi,
+            "rsi_period": indicators.get("rsi_period"),
             "rsi_state": momentum_state,
             "score": score,
             "interpretation": f"RSI at {rsi:.1f} - {momentum_state}" if rsi else "RSI not available",
@@ -162,7 +202,8 @@ class TechnicalManager(TaskManager):
         latest = closes[-1]
         high_52w = indicators.get("high_52w", max(closes))
         low_52w = indicators.get("low_52w", min(closes))
-        ma_60 = indicators.get("ma_60")
+        ma_trend = indicators.get("ma_trend")
+        window = self.params["ma_trend"]
 
         # Define key levels
         levels = []
@@ -183,24 +224,25 @@ class TechnicalManager(TaskManager):
             "distance_pct": ((low_52w - latest) / latest) * 100,
         })
 
-        # 60MA as dynamic level
-        if ma_60:
-            level_type = "support" if latest > ma_60 else "resistance"
+        # Trend MA as dynamic level
+        if ma_trend:
+            level_type = "support" if latest > ma_trend else "resistance"
             levels.append({
-                "level": ma_60,
+                "level": ma_trend,
                 "type": level_type,
-                "description": f"60-day MA ({level_type})",
-                "distance_pct": ((ma_60 - latest) / latest) * 100,
+                "description": f"{window}-day MA ({level_type})",
+                "distance_pct": ((ma_trend - latest) / latest) * 100,
             })
 
         # Score based on position relative to levels
         pct_from_high = indicators.get("pct_from_52w_high", 0)
         pct_from_low = indicators.get("pct_from_52w_low", 0)
 
+        proximity = self.params["level_proximity_pct"]
         score = 0
-        if abs(pct_from_high) < 5:
+        if abs(pct_from_high) < proximity:
             score = -0.5  # Near resistance
-        elif abs(pct_from_low) < 5:
+        elif abs(pct_from_low) < proximity:
             score = 0.5  # Near support
 
         return {
@@ -209,14 +251,14 @@ class TechnicalManager(TaskManager):
             "score": score,
         }
 
-    def _prepare_chart_data(self, prices: List, ma_60: float) -> Dict:
-        """Prepare OHLC data for candlestick chart"""
+    def _prepare_chart_data(self, prices: List, window: int) -> Dict:
+        """Prepare OHLC data and the trend-MA line for the candlestick chart"""
         dates = []
         opens = []
         highs = []
         lows = []
         closes = []
-        ma60_line = []
+        ma_line = []
 
         for i, p in enumerate(prices):
             dates.append(p.get("date", ""))
@@ -226,11 +268,11 @@ class TechnicalManager(TaskManager):
             closes.append(p.get("close", 0))
 
             # Calculate rolling MA for each point if we have enough data
-            if i >= 59:
-                recent_closes = [prices[j].get("close", 0) for j in range(i - 59, i + 1)]
-                ma60_line.append(sum(recent_closes) / 60 if recent_closes else None)
+            if i >= window - 1:
+                recent_closes = [prices[j].get("close", 0) for j in range(i - window + 1, i + 1)]
+                ma_line.append(sum(recent_closes) / window)
             else:
-                ma60_line.append(None)
+                ma_line.append(None)
 
         return {
             "dates": dates,
@@ -238,14 +280,15 @@ class TechnicalManager(TaskManager):
             "high": highs,
             "low": lows,
             "close": closes,
-            "ma60": ma60_line,
+            "ma_trend": ma_line,
+            "ma_window": window,
         }
 
-    def _identify_triggers(self, indicators: Dict, key_levels: Dict) -> List[Dict]:
+    def _identify_triggers(self, indicators: Dict, key_levels: Dict, cascades: Dict = None) -> List[Dict]:
         """Identify potential technical triggers"""
         triggers = []
 
-        rsi = indicators.get("rsi_14")
+        rsi = indicators.get("rsi")
         if rsi:
             if rsi > 65:
                 triggers.append({
@@ -260,18 +303,29 @@ class TechnicalManager(TaskManager):
                     "probability": "medium",
                 })
 
-        ma_60 = indicators.get("ma_60")
+        ma_trend = indicators.get("ma_trend")
         latest = indicators.get("latest_close")
-        if ma_60 and latest:
-            distance = abs((latest - ma_60) / ma_60) * 100
+        if ma_trend and latest:
+            distance = abs((latest - ma_trend) / ma_trend) * 100
             if distance < 2:
-                direction = "watch" if latest > ma_60 else "watch"
                 triggers.append({
-                    "trigger": "Price near 60MA",
+                    "trigger": f"Price near {self.params['ma_trend']}MA",
                     "direction": "key level test",
                     "probability": "high",
                 })
 
+        # Chains of levels within an ATR of each other: a break through the
+        # first can run stops through the rest
+        for direction, label in (("up", "bullish"), ("down", "bearish")):
+            path = (cascades or {}).get(direction, {})
+            if path.get("count", 0) >= 2:
+                names = ", ".join(lvl["description"] for lvl in path["levels"])
+                triggers.append({
+                    "trigger": f"Level cascade {path['from']} -> {path['to']} ({path['span_pct']:+.1f}%): {names}",
+                    "direction": label,
+                    "probability": "high" if path["count"] >= 3 else "medium",
+                })
+
         return triggers
 
     def _generate_summary(self, score: float, trend: Dict, momentum: Dict) -> str:
@@ -302,6 +356,18 @@ class TechnicalManager(TaskManager):
                 "message": "Technical indicators required",
                 "severity": "high",
             },
+            {
+                "field": "trend_analysis.score",
+                "condition": "required",
+                "message": "Trend sub-score required",
+                "severity": "medium",
+            },
+            {
+                "field": "momentum_analysis.score",
+                "condition": "required",
+                "message": "Momentum sub-score required",
+                "severity": "medium",
+            },
         ]
 
     def get_validation_rules(self) -> List[Dict]:
@@ -313,4 +379,18 @@ class TechnicalManager(TaskManager):
                 "max": 5,
                 "severity": "high",
             },
+            {
+                "field": "trend_analysis.score",
+                "type": "range",
+                "min": -1.5,
+                "max": 1.5,
+                "severity": "medium",
+            },
+            {
+                "field": "momentum_analysis.score",
+                "type": "range",
+                "min": -1,
+                "max": 1,
+                "severity": "medium",
+            },
         ]
@@ -1,14 +1,20 @@
 """
 TM-VIEWS: Market Views Task Manager
 Analyzes market consensus, analyst forecasts, logic soundness
+Consensus built from stored news sentiment, COT crowding, CTA and momentum
 """
 
 import json
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from .base import TaskManager
+from core.params import POS_PARAMS, load_params
+from core.views import load_views
 
 
 class ViewsManager(TaskManager):
@@ -19,66 +25,148 @@ class ViewsManager(TaskManager):
 
     MODULE_NAME = "tm_views"
 
+    # Reads the news snapshots (TM-NEWS), price history (TM-POS) and crowding
+    # cache (TM-POS / TM-STRUCT) those modules store during their run
+    RUNS_AFTER = ("tm_news", "tm_pos", "tm_struct")
+
+    # What each consensus input says, for the bull/bear argument lists
+    TILT_DESCRIPTIONS = {
+        "news": "Headline tone",
+        "managed_money": "Managed-money positioning",
+        "cta": "Trend-follower (CTA) positioning",
+        "momentum": "3-month price momentum",
+    }
+
     def fetch_data(self) -> Dict:
-        """Gather market views and analyst opinions"""
-        # In production, this would aggregate from:
-        # - Bank research reports
-        # - Broker forecasts
-        # - News sentiment analysis
-        # - Social media sentiment
+        """Gather the market view from stored news, positioning and price aggregates"""
+        # Reads only what the other modules have stored (no fetching); runs
+        # after them (RUNS_AFTER) so today's snapshots are in place
+        lookbacks = load_params(self.commodity_key, POS_PARAMS)["cta_windows"]
+        views = load_views(self.commodity_key, lookbacks)
 
         return {
             "commodity": self.commodity,
             "fetched_at": datetime.now().isoformat(),
-            "analyst_forecasts": self._get_analyst_forecasts(),
-            "consensus_view": self._get_consensus_view(),
-            "contrarian_indicators": self._get_contrarian_indicators(),
+            "views": views,
+            "analyst_forecasts": self._get_analyst_forecasts(views),
+            "consensus_view": self._get_consensus_view(views),
+            "contrarian_indicators": self._get_contrarian_indicators(views),
             "sources": [
-                "Bank Research Reports",
-                "Broker Forecasts",
-                "Industry Commentary",
-                "Market Sentiment Surveys",
+                "News sentiment history (stored headlines)",
+                "CFTC COT / composite crowding index",
+                "CTA replication model",
+                "Price momentum",
             ],
         }
 
-    def _get_analyst_forecasts(self) -> Dict:
-        """Get analyst price forecasts"""
-        # Would normally aggregate from multiple sources
+    def _get_analyst_forecasts(self, views: Dict) -> Dict:
+        """Market-implied outlook: consensus direction, agreement and revisions"""
+        if "error" in views:
+            return {
+                "average_forecast": "Neutral",
+                "forecast_range": "Unknown",
+                "revision_trend": "Unknown",
+                "confidence": "Low",
+                "note": views["error"],
+            }
+
+        view = views["consensus"]
+        dispersion = view["dispersion"]
+        if dispersion is None:
+            forecast_range = "Single input"
+        elif dispersion < 0.3:
+            forecast_range = "Narrow - inputs agree"
+        elif dispersion < 0.6:
+            forecast_range = "Moderate dispersion"
+        else:
+            forecast_range = "Wide dispersion"
+
+        revision = view["revision"]
+        if revision is None:
+            revision_trend = "Insufficient history"
+        elif revision >= 0.15:
+            revision_trend = "Recent upgrades"
+        elif revision <= -0.15:
+            revision_trend = "Recent downgrades"
+        else:
+            revision_trend = "Stable"
+
+        if view["inputs"] >= 3 and dispersion is not None and dispersion < 0.4:
+            confidence = "High"
+        elif view["inputs"] >= 2:
+            confidence = "Medium"
+        else:
+            confidence = "Low"
+
+        return {
+            "average_forecast": view["label"],
+            "consensus_value": view["value"],
+            "forecast_range": forecast_range,
+            "revision_trend": revision_trend,
+            "revision": revision,
+            "confidence": confidence,
+        }
+
+    def _get_consensus_view(self, views: Dict) -> Dict:
+        """Consensus market view with the inputs behind each side"""
+        if "error" in views:
+            return {
+                "overall_sentiment": "Neutral",
+                "key_themes": [],
+                "bull_arguments": [],
+                "bear_arguments": [],
+            }
+
+        details = self._tilt_details(views)
+        bull_args = [f"{self.TILT_DESCRIPTIONS[name]}: {details[name]}" for name, t in views["tilts"].items() if t >= 0.1]
+        bear_args = [f"{self.TILT_DESCRIPTIONS[name]}: {details[name]}" for name, t in views["tilts"].items() if t <= -0.1]
+        themes = [f"'{term}' in {count} headlines" for term, count in views["news"].get("top_terms", [])]
+
         return {
-            "average_forecast": "Neutral to slightly bearish",
-            "forecast_range": "Wide dispersion",
-            "revision_trend": "Recent downgrades",
-            "confidence": "Medium",
+            "overall_sentiment": views["consensus"]["label"],
+            "key_themes": themes,
+            "bull_arguments": bull_args,
+            "bear_arguments": bear_args,
+            "tilts": views["tilts"],
         }
 
-    def _get_consensus_view(self) -> Dict:
-        """Get consensus market view"""
+    def _tilt_details(self, views: Dict) -> Dict[str, str]:
+        news, crowding, momentum = views["news"], views.get("crowding") or {}, views["momentum"]
         return {
-            "overall_sentiment": "Cautiously bearish",
-            "key_themes": [
-                "China demand uncertainty",
-                "Elevated global stocks",
-                "Cost support limited",
-            ],
-            "bull_arguments": [
-                "Green transition demand",
-                "Supply discipline improving",
-                "Low investor positioning",
-            ],
-            "bear_arguments": [
-                "China property weakness",
-                "Global manufacturing slowdown",
-                "High inventory levels",
-            ],
+            "news": f"net tone {news.get('tone')} over {news.get('articles', 0)} recent articles",
+            "managed_money": f"net long at the {crowding.get('mm_percentile')}th percentile",
+            "cta": f"model position {views.get('cta_position_pct')}% of max",
+            "momentum": f"{momentum.get('return_pct')}% (z {momentum.get('z_score')})",
         }
 
-    def _get_contrarian_indicators(self) -> Dict:
-        """Identify contrarian signals"""
+    def _get_contrarian_indicators(self, views: Dict) -> Dict:
+        """Identify contrarian signals: extreme headline tone or extreme crowding"""
+        if "error" in views:
+            return {
+                "sentiment_extreme": False,
+                "positioning_extreme": "Unknown",
+                "crowded_trade": "Unknown",
+                "consensus_side": "neutral",
+                "contrarian_signal": "None - no stored inputs",
+            }
+
+        news = views["news"]
+        crowding_level = (views.get("crowding") or {}).get("level", "Unknown")
+        value = views["consensus"]["value"] or 0
+        side = "bullish" if value >= 0.1 else "bearish" if value <= -0.1 else "neutral"
+        tone_extreme = bool(news.get("tone_extreme"))
+        positioning_extreme = crowding_level.startswith("Extreme")
+        extreme = (tone_extreme or positioning_extreme) and side != "neutral"
+
         return {
-            "sentiment_extreme": False,
-            "positioning_extreme": "Monitor COT data",
-            "crowded_trade": "Shorts may be building",
-            "contrarian_signal": "Weak - consensus not extreme",
+            "sentiment_extreme": extreme,
+            "tone_percentile": news.get("tone_percentile"),
+            "positioning_extreme": crowding_level,
+            "crowded_trade": crowding_level,
+            "consensus_side": side,
+            "contrarian_signal": (
+                f"Strong - {side} consensus at an extreme" if extreme else "Weak - consensus not extreme"
+            ),
         }
 
     def analyze(self, data: Dict) -> Dict:
@@ -151,33 +239,48 @@ class ViewsManager(TaskManager):
         elif bull_strength > bear_strength:
             logic_score = 0.5
 
+        if bull_strength and bear_strength:
+            assessment = "Market logic appears sound; both bull and bear cases have support in the data"
+            risk = "Inputs disagree; consensus may shift quickly"
+        elif bull_strength or bear_strength:
+            side = "bull" if bull_strength else "bear"
+            assessment = f"One-sided: every directional input supports the {side} case"
+            risk = f"Consensus may be overconfident in the {side} case"
+        else:
+            assessment = "No input has a clear directional tilt"
+            risk = "Low conviction either way"
+
         return {
             "bull_case_strength": bull_strength,
             "bear_case_strength": bear_strength,
-            "logic_sound": True,  # Both sides have valid arguments
+            "logic_sound": bool(bull_strength or bear_strength),
             "score": logic_score,
-            "assessment": "Market logic appears sound; both bull and bear cases have merit",
-            "risk": "Consensus may be overconfident in bear case",
+            "assessment": assessment,
+            "risk": risk,
         }
 
     def _assess_contrarian(self, contrarian: Dict) -> Dict:
         """Assess contrarian opportunities"""
         sentiment_extreme = contrarian.get("sentiment_extreme", False)
         crowded = contrarian.get("crowded_trade", "")
+        side = contrarian.get("consensus_side", "neutral")
 
         score = 0
         signal = "Weak"
+        rationale = "No extreme sentiment; limited contrarian opportunity"
 
         if sentiment_extreme:
-            score = 1 if "bearish" in str(crowded).lower() else -1
+            # Fade an extreme consensus
+            score = 1 if side == "bearish" else -1
             signal = "Strong contrarian"
+            rationale = f"{side.capitalize()} consensus at an extreme (crowding: {crowded}); reversal risk"
 
         return {
             "contrarian_signal": signal,
             "sentiment_at_extreme": sentiment_extreme,
             "crowded_trade_risk": crowded,
             "score": score,
-            "rationale": "No extreme sentiment; limited contrarian opportunity",
+            "rationale": rationale,
         }
 
     def _generate_summary(self, score: float, consensus: Dict, logic: Dict) -> str:
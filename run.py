@@ -7,10 +7,16 @@ Usage:
     python run.py aluminum
     python run.py --commodity aluminum
     python run.py --list   # Show available commodities
+    python run.py --backtest [commodity]   # Backtest module scoring rules
+    python run.py --correlations           # Refresh cross-commodity correlations
+    python run.py --sweep tech [commodity] [--sweep-mode random] [--apply]
+    python run.py --watch [commodity] [--interval 300]   # Live volume/OI anomaly watch
+    python run.py --batch [commodity]      # All modules for many commodities, one batch
 """
 
 import sys
 import json
+import time
 import argparse
 from datetime import datetime
 from pathlib import Path
@@ -32,7 +38,13 @@ from agents.level2.tm_tech import TechnicalManager
 from agents.level2.tm_struct import StructureManager
 from agents.level2.tm_pos import PositioningManager
 from agents.level2.tm_report import ReportManager
+from agents.level2.base import run_phases
 from agents.support.housekeeper import Housekeeper
+# Core modules are always imported as core.* (the path the Level 2 modules
+# use), never agents.core.*, so module-level caches and singletons such as
+# the event log writer exist once per process
+from core.eventlog import get_event_log, read_events, render_session, write_debate_views
+from core.synthesis import format_score
 
 
 # Available commodities
@@ -46,19 +58,18 @@ COMMODITIES = [
 ]
 
 
-def log_event(log_path: Path, agent: str, action: str, status: str, notes: str = ""):
-    """Append event to log.md"""
-    timestamp = datetime.now().strftime("%H:%M")
+def log_event(session: str, agent: str, action: str, status: str, notes: str = ""):
+    """Queue a pipeline event on the JSONL event log (rendered into log.md at session end)"""
+    get_event_log().emit("pipeline", session=session, agent=agent, action=action, status=status, notes=notes)
 
-    entry = f"\n### [{timestamp}] {action}\n"
-    entry += f"- **Agent:** {agent}\n"
-    entry += f"- **Action:** {action}\n"
-    entry += f"- **Status:** {status}\n"
-    if notes:
-        entry += f"- **Notes:** {notes}\n"
 
+def finish_session(log_path: Path, session: str, offset: int):
+    """Flush the event log and render this session's markdown views (log.md, debate logs)"""
+    events = get_event_log()
+    events.flush()
     with open(log_path, 'a') as f:
-        f.write(entry)
+        f.write(render_session(list(read_events(events.path, offset, session=session))))
+    write_debate_views(offset, events.path)
 
 
 def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = False):
@@ -83,10 +94,10 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
 
     log_path = PROJECT_ROOT / "log.md"
 
-    # Initialize session in log
-    date_str = datetime.now().strftime("%Y-%m-%d")
-    with open(log_path, 'a') as f:
-        f.write(f"\n## Session: {date_str}\n")
+    # Initialize session in the event log; this run's records start at `log_offset`
+    session = f"{commodity}:{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+    log_offset = get_event_log().flush()
+    get_event_log().emit("session_start", session=session, commodity=commodity)
 
     # =========================================
     # PHASE 1: UNDERSTAND & THINK
@@ -96,7 +107,7 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
     pm = ProjectManager(PROJECT_ROOT)
     plan = pm.design_plan(commodity)
 
-    log_event(log_path, "PM", "Design Plan", "Complete",
+    log_event(session, "PM", "Design Plan", "Complete",
               f"Commodity: {commodity}, Modules: {len(plan.modules)}")
 
     print(f"      Plan created: {len(plan.modules)} modules, parallel={plan.parallel_execution}")
@@ -111,7 +122,7 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
     sup_validation = sup.validate_plan(asdict(plan))
     sup.save_review(commodity, sup_validation)
 
-    log_event(log_path, "SUP", "Validate Plan", sup_validation.status,
+    log_event(session, "SUP", "Validate Plan", sup_validation.status,
               f"Issues: {len(sup_validation.issues)}")
 
     print(f"      SUP validation: {sup_validation.status}")
@@ -122,13 +133,14 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
     plan_approval = approval.verify_plan_against_blueprint(asdict(plan))
     approval.save_approval(commodity, plan_approval)
 
-    log_event(log_path, "APPROVAL", "Verify Plan", plan_approval.decision,
+    log_event(session, "APPROVAL", "Verify Plan", plan_approval.decision,
               f"Score: {plan_approval.final_score}")
 
     print(f"      APPROVAL decision: {plan_approval.decision}")
 
     if plan_approval.decision == "REJECTED":
         print("\n[!] Plan REJECTED by APPROVAL agent. Aborting.")
+        finish_session(log_path, session, log_offset)
         return None
 
     # =========================================
@@ -236,11 +248,12 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
 
     if user_input not in ['yes', 'y']:
         print("\n[!] User did not approve. Aborting execution.")
-        log_event(log_path, "USER", "Approval Gate", "REJECTED",
+        log_event(session, "USER", "Approval Gate", "REJECTED",
                   "User declined to proceed")
+        finish_session(log_path, session, log_offset)
         return None
 
-    log_event(log_path, "USER", "Approval Gate", "APPROVED",
+    log_event(session, "USER", "Approval Gate", "APPROVED",
               "User approved execution")
     print("\n    User APPROVED. Proceeding with execution...")
     print("=" * 60)
@@ -262,35 +275,38 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
 
     results = {}
 
-    if parallel:
-        # Run in parallel
-        with ThreadPoolExecutor(max_workers=6) as executor:
-            futures = {
-                executor.submit(tm.run): name
-                for name, tm in task_managers.items()
-            }
-
-            for future in as_completed(futures):
-                name = futures[future]
+    # Modules that read other modules' stored data (RUNS_AFTER) go in a later phase
+    for phase in run_phases(list(task_managers.values())):
+        if parallel:
+            # Run in parallel
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                futures = {
+                    executor.submit(tm.run): tm.MODULE_NAME
+                    for tm in phase
+                }
+
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                        results[name] = result
+                        print(f"      [{name}] Score: {result.score:+.1f}, Confidence: {result.confidence:.0%}")
+                        log_event(session, name.upper(), "Analysis Complete", "Complete",
+                                  f"Score: {result.score:+.1f}, Debate rounds: {result.debate_rounds}")
+                    except Exception as e:
+                        print(f"      [{name}] ERROR: {e}")
+                        results[name] = {"error": str(e)}
+        else:
+            # Run sequentially
+            for tm in phase:
+                name = tm.MODULE_NAME
                 try:
-                    result = future.result()
+                    result = tm.run()
                     results[name] = result
-                    print(f"      [{name}] Score: {result.score:+.1f}, Confidence: {result.confidence:.0%}")
-                    log_event(log_path, name.upper(), "Analysis Complete", "Complete",
-                              f"Score: {result.score:+.1f}, Debate rounds: {result.debate_rounds}")
+                    print(f"      [{name}] Score: {result.score:+.1f}")
                 except Exception as e:
                     print(f"      [{name}] ERROR: {e}")
                     results[name] = {"error": str(e)}
-    else:
-        # Run sequentially
-        for name, tm in task_managers.items():
-            try:
-                result = tm.run()
-                results[name] = result
-                print(f"      [{name}] Score: {result.score:+.1f}")
-            except Exception as e:
-                print(f"      [{name}] ERROR: {e}")
-                results[name] = {"error": str(e)}
 
     # =========================================
     # PHASE 5: SYNTHESIZE - Generate Report
@@ -300,11 +316,11 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
     report_manager = ReportManager(PROJECT_ROOT, commodity)
     report_result = report_manager.run()
 
-    log_event(log_path, "TM-REPORT", "Generate HTML", "Complete",
+    log_event(session, "TM-REPORT", "Generate HTML", "Complete",
               f"Output: {report_result.get('output_path')}")
 
     print(f"      Report generated: {report_result.get('output_path')}")
-    print(f"      Weighted score: {report_result['synthesis']['weighted_score']:+.1f}")
+    print(f"      Weighted score: {format_score(report_result['synthesis']['weighted_score'])}")
     print(f"      Interpretation: {report_result['synthesis']['interpretation']}")
 
     # =========================================
@@ -327,7 +343,7 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
     )
     approval.save_approval(commodity, final_approval)
 
-    log_event(log_path, "SUP+APPROVAL", "Final Review", final_approval.decision,
+    log_event(session, "SUP+APPROVAL", "Final Review", final_approval.decision,
               f"Ready for delivery: {final_approval.ready_for_delivery}")
 
     print(f"      Final approval: {final_approval.decision}")
@@ -343,6 +359,8 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
     # =========================================
     print("\n[9/9] CLEANUP: HOUSEKEEPER running...")
 
+    finish_session(log_path, session, log_offset)
+
     housekeeper = Housekeeper(PROJECT_ROOT)
     cleanup_result = housekeeper.run()
 
@@ -354,7 +372,7 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
     print(f"\n{'='*60}")
     print(f"  ANALYSIS COMPLETE: {commodity.upper()}")
     print(f"{'='*60}")
-    print(f"  Weighted Score: {report_result['synthesis']['weighted_score']:+.1f}")
+    print(f"  Weighted Score: {format_score(report_result['synthesis']['weighted_score'])}")
     print(f"  Interpretation: {report_result['synthesis']['interpretation']}")
     print(f"  Modules: {report_result['synthesis']['modules_included']}/6")
     print(f"  Report: {report_result.get('output_path')}")
@@ -363,6 +381,165 @@ def run_analysis(commodity: str, parallel: bool = True, force_refresh: bool = Fa
     return report_result
 
 
+def run_backtest_cli(commodities: list, force_refresh: bool = False):
+    """Backtest the TM-TECH / TM-POS scoring rules over full history"""
+    from core.history import load_universe
+    from core.backtest import run_backtest, save_backtest, format_backtest_table
+
+    print(f"\n{'='*60}")
+    print(f"  RULE BACKTEST: {', '.join(c.upper() for c in commodities)}")
+    print(f"{'='*60}\n")
+
+    universe = load_universe(commodities, force_refresh=force_refresh)
+    if not universe:
+        print("[!] No price history available. Aborting.")
+        return None
+
+    results = run_backtest(universe)
+    for line in format_backtest_table(results):
+        print(line)
+
+    output_path = save_backtest(results)
+    print(f"\n  Results: {output_path}\n")
+    return results
+
+
+def run_sweep_cli(commodities: list, family: str, mode: str, samples: int,
+                  apply: bool = False, force_refresh: bool = False):
+    """Tune TM-TECH / TM-POS thresholds per commodity against history"""
+    from core.history import load_universe
+    from core.sweep import run_sweep, save_sweep, apply_best
+
+    print(f"\n{'='*60}")
+    print(f"  PARAMETER SWEEP ({family.upper()}, {mode}): {', '.join(c.upper() for c in commodities)}")
+    print(f"{'='*60}\n")
+
+    universe = load_universe(commodities, force_refresh=force_refresh, with_cot=(family == "pos"))
+    if not universe:
+        print("[!] No price history available. Aborting.")
+        return None
+
+    rows = run_sweep(universe, family=family, mode=mode, samples=samples)
+    for commodity, ranked in rows.items():
+        best = ranked[0] if ranked else None
+        if best and best["objective"] is not None:
+            print(f"  [{commodity}] best objective {best['objective']:+.2f}, "
+                  f"hit rate {best['hit_rate']:.1%}: {json.dumps(best['params'])}")
+        else:
+            print(f"  [{commodity}] no parameter set had enough signals")
+
+    for path in save_sweep(rows, family):
+        print(f"  Table: {path}")
+
+    if apply:
+        for commodity, path in apply_best(rows, family).items():
+            print(f"  Applied best {family} params for {commodity}: {path}")
+    return rows
+
+
+def run_correlations_cli(commodities: list, force_refresh: bool = False):
+    """Update the cached cross-commodity correlation matrices"""
+    from core.history import load_universe
+    from core.correlation import CorrelationService, find_duplicate_signals
+
+    print(f"\n{'='*60}")
+    print(f"  CROSS-COMMODITY CORRELATION: {len(commodities)} commodities")
+    print(f"{'='*60}\n")
+
+    universe = load_universe(commodities, force_refresh=force_refresh, with_cot=False)
+    if len(universe) < 2:
+        print("[!] Need price history for at least two commodities. Aborting.")
+        return None
+
+    service = CorrelationService()
+    status = service.update(universe)
+    print(f"  Cache {status['status']}: {status['new_dates']} new dates ({status['dates']} total)")
+
+    latest = service.latest()
+    if latest:
+        for d in find_duplicate_signals(latest, PROJECT_ROOT / "modules"):
+            print(f"  Duplicate bet: {d['pair'][0]} / {d['pair'][1]} "
+                  f"(rho {d['correlation']:+.2f}) in {', '.join(d['modules'])}")
+    return status
+
+
+def run_batch_cli(commodities: list, force_refresh: bool = False):
+    """All Level 2 modules for many commodities in one batch, then a report per commodity"""
+    from agents.level2.base import run_batch
+
+    print(f"\n{'='*60}")
+    print(f"  BATCH ANALYSIS: {len(commodities)} commodities x 6 modules")
+    print(f"{'='*60}\n")
+
+    session = f"batch:{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+    log_offset = get_event_log().flush()
+    get_event_log().emit("session_start", session=session, commodity=",".join(commodities))
+
+    managers = [
+        cls(PROJECT_ROOT, commodity, force_refresh=force_refresh)
+        for commodity in commodities
+        for cls in (FundamentalsManager, NewsManager, ViewsManager,
+                    TechnicalManager, StructureManager, PositioningManager)
+    ]
+    start = time.time()
+    outputs = run_batch(managers)
+    print(f"  {len(managers)} modules analyzed and debated in {time.time() - start:.1f}s\n")
+
+    reports = {}
+    for commodity in commodities:
+        failed = [m for (c, m), out in outputs.items() if c == commodity and isinstance(out, dict)]
+        report_result = ReportManager(PROJECT_ROOT, commodity).run()
+        reports[commodity] = report_result
+        synthesis = report_result["synthesis"]
+        print(f"  [{commodity}] {format_score(synthesis['weighted_score'])} {synthesis['interpretation']}"
+              + (f" (failed: {', '.join(failed)})" if failed else ""))
+        log_event(session, "BATCH", f"Analysis Complete: {commodity}", "Complete",
+                  f"Score: {format_score(synthesis['weighted_score'])}, Output: {report_result.get('output_path')}")
+
+    finish_session(PROJECT_ROOT / "log.md", session, log_offset)
+    print()
+    return reports
+
+
+def run_watch_cli(commodities: list, interval: int = 300):
+    """Live volume / OI-change anomaly watch (Ctrl-C to stop)"""
+    from core.data_fetch import DataFetcher
+    from core.anomaly import AnomalyMonitor
+
+    print(f"\n{'='*60}")
+    print(f"  ANOMALY WATCH: {', '.join(c.upper() for c in commodities)} (every {interval}s)")
+    print(f"{'='*60}\n")
+
+    monitors = {c: AnomalyMonitor(c) for c in commodities}
+    try:
+        while True:
+            for commodity, monitor in monitors.items():
+                fetcher = DataFetcher(commodity, force_refresh=True)
+                # First run (or a gap since the last one) seeds the baseline from full history
+                price_data = fetcher.fetch_price_data()
+                seeded = not monitor.needs_history(price_data.get("prices", []))
+                if not seeded:
+                    price_data = fetcher.fetch_price_history()
+                # COT is weekly: the daily cache is fresh enough
+                cot_history = DataFetcher(commodity).fetch_cot_history(years=1)
+                if "error" in price_data:
+                    print(f"  [{commodity}] {price_data['error']}")
+                    continue
+
+                events = monitor.update(price_data.get("prices", []), cot_history, live=True)
+                monitor.save()
+                for event in events[-5:] if seeded else []:
+                    if event["status"] != "normal" or event["live"]:
+                        print(f"  [{commodity}] {event['date']} {event['series']}: "
+                              f"z={event['robust_z']:+.2f} ({event['status']}{', live bar' if event['live'] else ''})")
+                if not seeded:
+                    flagged = sum(1 for e in events if e["status"] == "anomaly")
+                    print(f"  [{commodity}] Baseline seeded from {len(events)} bars ({flagged} historical anomalies)")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n  Watch stopped.\n")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="CommodityTrading Multi-Agent Analysis System"
@@ -388,6 +565,55 @@ def main():
         help="Force fresh data fetch from internet (bypass cache)"
     )
 
+    parser.add_argument(
+        "--backtest",
+        action="store_true",
+        help="Backtest technical/positioning rules over full history (all commodities if none given)"
+    )
+    parser.add_argument(
+        "--correlations",
+        action="store_true",
+        help="Update rolling cross-commodity correlation/covariance matrices"
+    )
+    parser.add_argument(
+        "--sweep",
+        choices=["tech", "pos"],
+        help="Sweep technical or positioning thresholds against history (all commodities if none given)"
+    )
+    parser.add_argument(
+        "--sweep-mode",
+        choices=["grid", "random"],
+        default="grid",
+        help="Sweep the full grid or a random sample of it"
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=200,
+        help="Parameter sets to draw in random sweep mode"
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Save each commodity's best sweep parameters for the Task Managers"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Run all modules for many commodities in one batch, no approval gate (all commodities if none given)"
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Live volume/OI anomaly watch (all commodities if none given)"
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=300,
+        help="Seconds between polls in watch mode"
+    )
+
     args = parser.parse_args()
 
     if args.list:
@@ -397,6 +623,31 @@ def main():
         print()
         return
 
+    if args.backtest:
+        targets = [args.commodity.lower().replace(" ", "_")] if args.commodity else COMMODITIES
+        run_backtest_cli(targets, force_refresh=args.fresh)
+        return
+
+    if args.correlations:
+        run_correlations_cli(COMMODITIES, force_refresh=args.fresh)
+        return
+
+    if args.sweep:
+        targets = [args.commodity.lower().replace(" ", "_")] if args.commodity else COMMODITIES
+        run_sweep_cli(targets, args.sweep, args.sweep_mode, args.samples,
+                      apply=args.apply, force_refresh=args.fresh)
+        return
+
+    if args.batch:
+        targets = [args.commodity.lower().replace(" ", "_")] if args.commodity else COMMODITIES
+        run_batch_cli(targets, force_refresh=args.fresh)
+        return
+
+    if args.watch:
+        targets = [args.commodity.lower().replace(" ", "_")] if args.commodity else COMMODITIES
+        run_watch_cli(targets, interval=args.interval)
+        return
+
     if not args.commodity:
         parser.print_help()
         print("\nExample: python run.py aluminum")